@@ -1,5 +1,7 @@
-from typing import Dict, Any
-from .base import Agent
+import time
+from typing import Dict, Any, Optional
+from .base import Agent, RunContext
+from .history import AgentHistory
 from langchain_core.messages import HumanMessage, AIMessage
 
 
@@ -11,9 +13,14 @@ class ApproverAgent(Agent):
             name="Approver",
             description="Validates and approves workflow outputs"
         )
-        self.approval_history = []
+        # Bounded ring buffer shared with Agent.history
+        self.approval_history = self.history
 
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(
+        self,
+        input_data: Dict[str, Any],
+        context: Optional[RunContext] = None
+    ) -> Dict[str, Any]:
         """
         Validate and approve workflow results.
 
@@ -22,6 +29,7 @@ class ApproverAgent(Agent):
                 - result: The processing result to validate
                 - criteria: Validation criteria
                 - thresholds: Approval thresholds
+            context: Per-run context holding this run's agent state
 
         Returns:
             Dictionary containing:
@@ -29,8 +37,7 @@ class ApproverAgent(Agent):
                 - feedback: Validation feedback
                 - confidence: Confidence in the approval decision
         """
-        # Add approval request to history
-        self.approval_history.append(input_data)
+        started = time.perf_counter()
 
         # Update state with current approval task
         self.update_state({
@@ -39,7 +46,7 @@ class ApproverAgent(Agent):
                 "result": input_data.get("result"),
                 "criteria": input_data.get("criteria")
             }
-        })
+        }, context)
 
         # TODO: Implement actual validation logic
         # For now, return placeholder data
@@ -61,10 +68,12 @@ class ApproverAgent(Agent):
                     content=f"Validating result: {input_data.get('result')}"),
                 AIMessage(content=str(approval_result))
             ]
-        })
+        }, context)
+
+        self.approval_history.record(input_data, time.perf_counter() - started)
 
         return approval_result
 
-    def get_approval_history(self) -> list:
+    def get_approval_history(self) -> AgentHistory:
         """Get the history of approval requests."""
         return self.approval_history
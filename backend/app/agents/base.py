@@ -1,9 +1,11 @@
 """Base agent module defining the Agent interface and common functionality."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from .history import AgentHistory
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +26,32 @@ class AgentState:
             self.metadata = {}
 
 
+@dataclass
+class RunContext:
+    """Per-run execution context passed through Agent.process.
+
+    Holds one AgentState per agent name so a single agent instance can
+    serve many workflow runs concurrently without sharing mutable state.
+    """
+
+    workflow_id: str
+    states: Dict[str, AgentState] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def state_for(self, agent_name: str) -> AgentState:
+        """Get (creating if needed) the state of an agent for this run."""
+        if agent_name not in self.states:
+            self.states[agent_name] = AgentState()
+        return self.states[agent_name]
+
+
 class Agent(ABC):
     """Base class for all agents in the system."""
 
+    # Whether process() is a pure function of its input, so results can
+    # be memoized by the flow engine's step cache
+    cacheable = False
+
     def __init__(self, name: str, description: str):
         """Initialize the agent with a name and description.
 
@@ -37,46 +62,69 @@ class Agent(ABC):
         self.name = name
         self.description = description
         self._state = AgentState()
+        self.history = AgentHistory()
         logger.info(f"Initialized agent: {name}")
 
     @abstractmethod
-    async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(
+        self,
+        state: Dict[str, Any],
+        context: Optional[RunContext] = None
+    ) -> Dict[str, Any]:
         """Process the current state and return an updated state.
 
         This is the main method that must be implemented by all agents.
 
         Args:
             state: The current state dictionary
+            context: Per-run context; when omitted the agent's own
+                shared state is used
 
         Returns:
             The updated state dictionary
         """
         pass
 
-    def update_state(self, updates: Dict[str, Any]) -> None:
+    def _state_for(self, context: Optional[RunContext]) -> AgentState:
+        """Resolve the state to read or mutate for a run."""
+        if context is None:
+            return self._state
+        return context.state_for(self.name)
+
+    def update_state(
+        self,
+        updates: Dict[str, Any],
+        context: Optional[RunContext] = None
+    ) -> None:
         """Update the agent's state with the provided updates.
 
         Args:
             updates: Dictionary of state updates to apply
+            context: Per-run context whose state should be updated
         """
+        state = self._state_for(context)
+
         if "current_step" in updates:
-            self._state.current_step = updates["current_step"]
+            state.current_step = updates["current_step"]
 
         if "messages" in updates:
-            self._state.messages = updates["messages"]
+            state.messages = updates["messages"]
 
         if "metadata" in updates:
-            self._state.metadata.update(updates["metadata"])
+            state.metadata.update(updates["metadata"])
 
-        logger.debug(f"Updated state for {self.name}: {self._state}")
+        logger.debug(f"Updated state for {self.name}: {state}")
 
-    def get_state(self) -> AgentState:
+    def get_state(self, context: Optional[RunContext] = None) -> AgentState:
         """Get the current state of the agent.
 
+        Args:
+            context: Per-run context to read the state from
+
         Returns:
             The current agent state
         """
-        return self._state
+        return self._state_for(context)
 
     def reset(self) -> None:
         """Reset the agent state to its initial values."""
@@ -93,7 +141,21 @@ class Agent(ABC):
         return {
             "name": self.name,
             "description": self.description,
-            "current_state": self._state.current_step
+            "current_state": self._state.current_step,
+            "history": self.history.stats()
+        }
+
+    @property
+    def cache_identity(self) -> Dict[str, Any]:
+        """Settings that affect this agent's output, part of its cache key.
+
+        Subclasses backed by a model should add its name, prompt version
+        and sampling parameters.
+        """
+        return {
+            "class": self.__class__.__name__,
+            "name": self.name,
+            "description": self.description
         }
 
     def __repr__(self) -> str:
@@ -0,0 +1,90 @@
+"""Bounded, constant-memory history of agent requests."""
+
+import json
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+
+from app.config import config
+
+
+class AgentHistory:
+    """Ring buffer of the most recent agent inputs plus running statistics.
+
+    Only the last ``maxlen`` inputs are kept alive; counts, payload sizes
+    and latencies are aggregated over every recorded request.
+    """
+
+    def __init__(
+        self,
+        maxlen: Optional[int] = None,
+        track_stats: Optional[bool] = None
+    ):
+        self.maxlen = (
+            maxlen if maxlen is not None else config.agents.history_size)
+        self.track_stats = (
+            track_stats if track_stats is not None
+            else config.agents.history_stats)
+        self._entries = deque(maxlen=max(0, self.maxlen))
+        self.count = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(
+        self,
+        input_data: Dict[str, Any],
+        latency: Optional[float] = None
+    ) -> None:
+        """Record one request, evicting the oldest entry when full.
+
+        Args:
+            input_data: The input passed to the agent
+            latency: Time spent processing the request, in seconds
+        """
+        self._entries.append(input_data)
+        self.count += 1
+        if not self.track_stats:
+            return
+
+        size = len(json.dumps(input_data, default=str))
+        self.total_bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+        if latency is not None:
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregated statistics over every recorded request."""
+        stats = {
+            "count": self.count,
+            "retained": len(self._entries),
+            "capacity": self.maxlen
+        }
+        if self.track_stats:
+            count = self.count or 1
+            stats.update({
+                "total_bytes": self.total_bytes,
+                "avg_bytes": self.total_bytes / count,
+                "max_bytes": self.max_bytes,
+                "avg_latency": self.total_latency / count,
+                "max_latency": self.max_latency
+            })
+        return stats
+
+    def clear(self) -> None:
+        """Drop retained entries; statistics are kept."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._entries[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"AgentHistory(retained={len(self._entries)}, count={self.count})")
@@ -1,5 +1,7 @@
-from typing import Dict, Any
-from .base import Agent
+import time
+from typing import Dict, Any, Optional
+from .base import Agent, RunContext
+from .history import AgentHistory
 from langchain_core.messages import HumanMessage, AIMessage
 
 
@@ -11,9 +13,14 @@ class OptimizerAgent(Agent):
             name="Optimizer",
             description="Improves workflow performance through self-reflection"
         )
-        self.optimization_history = []
+        # Bounded ring buffer shared with Agent.history
+        self.optimization_history = self.history
 
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(
+        self,
+        input_data: Dict[str, Any],
+        context: Optional[RunContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze workflow performance and suggest optimizations.
 
@@ -22,6 +29,7 @@ class OptimizerAgent(Agent):
                 - workflow_results: Complete workflow execution data
                 - performance_metrics: Current performance metrics
                 - optimization_goals: Target improvements
+            context: Per-run context holding this run's agent state
 
         Returns:
             Dictionary containing:
@@ -29,8 +37,7 @@ class OptimizerAgent(Agent):
                 - impact_analysis: Expected improvements
                 - implementation_plan: Steps to implement changes
         """
-        # Add optimization request to history
-        self.optimization_history.append(input_data)
+        started = time.perf_counter()
 
         # Update state with current optimization task
         self.update_state({
@@ -39,7 +46,7 @@ class OptimizerAgent(Agent):
                 "workflow_results": input_data.get("workflow_results"),
                 "performance_metrics": input_data.get("performance_metrics")
             }
-        })
+        }, context)
 
         # TODO: Implement actual optimization logic
         # For now, return placeholder data
@@ -76,10 +83,13 @@ class OptimizerAgent(Agent):
                 HumanMessage(content="Analyzing workflow performance"),
                 AIMessage(content=str(optimization_result))
             ]
-        })
+        }, context)
+
+        self.optimization_history.record(
+            input_data, time.perf_counter() - started)
 
         return optimization_result
 
-    def get_optimization_history(self) -> list:
+    def get_optimization_history(self) -> AgentHistory:
         """Get the history of optimization analyses."""
         return self.optimization_history
@@ -1,19 +1,28 @@
-from typing import Dict, Any
-from .base import Agent
+import time
+from typing import Dict, Any, Optional
+from .base import Agent, RunContext
+from .history import AgentHistory
 from langchain_core.messages import HumanMessage, AIMessage
 
 
 class ProcessorAgent(Agent):
     """Agent responsible for executing workflow processing tasks."""
 
+    cacheable = True
+
     def __init__(self):
         super().__init__(
             name="Processor",
             description="Executes core workflow processing tasks"
         )
-        self.processing_history = []
+        # Bounded ring buffer shared with Agent.history
+        self.processing_history = self.history
 
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(
+        self,
+        input_data: Dict[str, Any],
+        context: Optional[RunContext] = None
+    ) -> Dict[str, Any]:
         """
         Process workflow tasks based on research and requirements.
 
@@ -22,6 +31,7 @@ class ProcessorAgent(Agent):
                 - task: The processing task to execute
                 - research_findings: Research data from ResearcherAgent
                 - parameters: Processing parameters
+            context: Per-run context holding this run's agent state
 
         Returns:
             Dictionary containing:
@@ -29,8 +39,7 @@ class ProcessorAgent(Agent):
                 - status: Task status
                 - metrics: Performance metrics
         """
-        # Add processing task to history
-        self.processing_history.append(input_data)
+        started = time.perf_counter()
 
         # Update state with current processing task
         self.update_state({
@@ -39,7 +48,7 @@ class ProcessorAgent(Agent):
                 "task": input_data.get("task"),
                 "parameters": input_data.get("parameters")
             }
-        })
+        }, context)
 
         # TODO: Implement actual processing logic
         # For now, return placeholder data
@@ -59,10 +68,13 @@ class ProcessorAgent(Agent):
                 HumanMessage(content=str(input_data.get("task"))),
                 AIMessage(content=str(result))
             ]
-        })
+        }, context)
+
+        self.processing_history.record(
+            input_data, time.perf_counter() - started)
 
         return result
 
-    def get_processing_history(self) -> list:
+    def get_processing_history(self) -> AgentHistory:
         """Get the history of processing tasks."""
         return self.processing_history
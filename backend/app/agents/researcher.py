@@ -1,19 +1,28 @@
-from typing import Dict, Any
-from .base import Agent
+import time
+from typing import Dict, Any, Optional
+from .base import Agent, RunContext
+from .history import AgentHistory
 from langchain_core.messages import HumanMessage, AIMessage
 
 
 class ResearcherAgent(Agent):
     """Agent responsible for gathering information and research."""
 
+    cacheable = True
+
     def __init__(self):
         super().__init__(
             name="Researcher",
             description="Gathers and analyzes information for workflow tasks"
         )
-        self.research_history = []
+        # Bounded ring buffer shared with Agent.history
+        self.research_history = self.history
 
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(
+        self,
+        input_data: Dict[str, Any],
+        context: Optional[RunContext] = None
+    ) -> Dict[str, Any]:
         """
         Process research requests and gather information.
 
@@ -22,6 +31,7 @@ class ResearcherAgent(Agent):
                 - query: The research question or topic
                 - context: Additional context for the research
                 - constraints: Any constraints on the research
+            context: Per-run context holding this run's agent state
 
         Returns:
             Dictionary containing:
@@ -29,8 +39,7 @@ class ResearcherAgent(Agent):
                 - sources: Sources of information
                 - confidence: Confidence score in the findings
         """
-        # Add research request to history
-        self.research_history.append(input_data)
+        started = time.perf_counter()
 
         # Update state with current research task
         self.update_state({
@@ -39,7 +48,7 @@ class ResearcherAgent(Agent):
                 "query": input_data.get("query"),
                 "context": input_data.get("context")
             }
-        })
+        }, context)
 
         # TODO: Implement actual research logic using RAG
         # For now, return placeholder data
@@ -56,10 +65,12 @@ class ResearcherAgent(Agent):
                 HumanMessage(content=str(input_data.get("query"))),
                 AIMessage(content=str(findings))
             ]
-        })
+        }, context)
+
+        self.research_history.record(input_data, time.perf_counter() - started)
 
         return findings
 
-    def get_research_history(self) -> list:
+    def get_research_history(self) -> AgentHistory:
         """Get the history of research requests."""
         return self.research_history
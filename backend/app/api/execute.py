@@ -1,28 +1,72 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+import asyncio
+import copy
+import json
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Any, List, Optional
 from pydantic import BaseModel
 
-from app.flow.engine import FlowEngine
+from app.api.idempotency import idempotent, request_fingerprint
+from app.config import config
+from app.flow.pool import engine_pool
+from app.flow.singleflight import execution_flights, execution_key
+from app.monitoring.metrics import EXECUTIONS_DEDUPLICATED
 
 router = APIRouter()
-flow_engine = FlowEngine()
 
 
 class ExecuteRequest(BaseModel):
     """Request model for workflow execution."""
     workflow_id: str
     input_data: Dict[str, Any]
+    template_id: Optional[str] = None
+
+
+async def _run_shared(request: ExecuteRequest, run) -> Dict[str, Any]:
+    """Run `run()`, or join an identical execution already in flight.
+
+    Joiners get a copy of the shared result under their own workflow_id,
+    with `deduplicated_from` naming the run that produced it.
+    """
+    key = execution_key(request.input_data, request.template_id)
+    if not config.workflow.dedupe_executions or key is None:
+        return await run()
+    result, leader = await execution_flights.do(key, request.workflow_id, run)
+    if leader is None:
+        return result
+    EXECUTIONS_DEDUPLICATED.inc()
+    shared = copy.deepcopy(result)
+    shared["workflow_id"] = request.workflow_id
+    shared["deduplicated_from"] = leader
+    return shared
 
 
 @router.post("/")
-async def execute_flow(request: ExecuteRequest):
+async def execute_flow(
+    request: ExecuteRequest,
+    idempotency_key: Optional[str] = Header(
+        None, description="Replays the stored response for a repeated request")
+):
     """Execute a flow with the given input data (integrated execute endpoint)."""
-    try:
-        result = await flow_engine.execute_workflow(
+    return await idempotent(
+        "POST /execute", idempotency_key, request_fingerprint(request),
+        lambda: _execute(request))
+
+
+async def _leased_run(request: ExecuteRequest) -> Dict[str, Any]:
+    """Run one flow on a leased engine."""
+    async with engine_pool.lease() as flow_engine:
+        return await flow_engine.execute_workflow(
             workflow_id=request.workflow_id,
-            input_data=request.input_data
+            input_data=request.input_data,
+            template_id=request.template_id
         )
-        return result
+
+
+async def _execute(request: ExecuteRequest) -> Dict[str, Any]:
+    """Run one flow, sharing identical in-flight runs."""
+    try:
+        return await _run_shared(request, lambda: _leased_run(request))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -30,6 +74,62 @@ async def execute_flow(request: ExecuteRequest):
         )
 
 
+async def _run_batch(
+    items: List[ExecuteRequest],
+    concurrency: int
+) -> AsyncIterator[str]:
+    """Run items concurrently, yielding NDJSON lines as they finish."""
+    results: asyncio.Queue = asyncio.Queue()
+    indexes = iter(range(len(items)))
+
+    async def worker():
+        for index in indexes:
+            item = items[index]
+            try:
+                result = await _run_shared(
+                    item, lambda item=item: _leased_run(item))
+            except Exception as e:
+                result = {"status": "error", "error": str(e), "history": []}
+            await results.put(
+                {"index": index, "workflow_id": item.workflow_id, **result})
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(min(concurrency, len(items)))
+    ]
+    try:
+        for _ in range(len(items)):
+            yield json.dumps(await results.get(), default=str) + "\n"
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+@router.post("/batch")
+async def execute_batch(
+    items: List[ExecuteRequest],
+    concurrency: Optional[int] = Query(
+        None, ge=1, description="Max flows in flight (capped by config)")
+):
+    """Execute many flows in one request.
+
+    Results stream back as NDJSON, one line per item in completion order,
+    each carrying the item's `index`, `workflow_id` and `status`.
+    """
+    if len(items) > config.workflow.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {config.workflow.batch_max_items} items"
+        )
+    limit = min(concurrency or config.workflow.batch_concurrency,
+                config.workflow.batch_concurrency)
+    return StreamingResponse(
+        _run_batch(items, limit),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.post("/test")
 async def test_flow():
     """Test flow execution with sample data."""
@@ -44,4 +144,4 @@ async def test_flow():
             }
         }
     }
-    return await execute_flow(ExecuteRequest(**test_data))
+    return await _execute(ExecuteRequest(**test_data))
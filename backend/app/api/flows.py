@@ -1,70 +1,136 @@
 """Flow management API for FluxoX."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from app.database import get_db
+from app.database.results import result_store
+from app.flow.templates import FLOW_TEMPLATES
 from app.schemas.workflow import WorkflowList, WorkflowDetail
+import base64
 import json
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
 
 router = APIRouter()
 
+# Columns returned by list endpoints; `result` blobs stay out of listings
+SUMMARY_COLUMNS = (
+    "id, name, description, status, current_step, progress, "
+    "created_at, updated_at"
+)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: str, flow_id: str) -> str:
+    """Opaque cursor for the (created_at, id) keyset position."""
+    raw = json.dumps([created_at, flow_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor; raises 400 on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, flow_id = json.loads(raw)
+        return str(created_at), str(flow_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _sql_timestamp(value: datetime) -> str:
+    """Format like SQLite's datetime('now') (UTC) for range comparisons."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def fetch_flow_page(
+    db,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> Tuple[list, Optional[str]]:
+    """Fetch one page of flows, newest first, and the cursor for the next.
+
+    Keyset pagination on (created_at, id) so every page is an index range
+    scan (idx_workflows_created / idx_workflows_status_created) no matter
+    how deep it is.
+    """
+    clauses, values = [], []
+    if status:
+        clauses.append("status = ?")
+        values.append(status)
+    if created_after:
+        clauses.append("created_at >= ?")
+        values.append(_sql_timestamp(created_after))
+    if created_before:
+        clauses.append("created_at < ?")
+        values.append(_sql_timestamp(created_before))
+    if cursor:
+        clauses.append("(created_at, id) < (?, ?)")
+        values.extend(decode_cursor(cursor))
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = await db.fetch_all(
+        f"""
+        SELECT {SUMMARY_COLUMNS} FROM workflows
+        {where}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+        """,
+        (*values, limit + 1)
+    )
+    if len(rows) <= limit:
+        return list(rows), None
+    last = rows[limit - 1]
+    return list(rows[:limit]), encode_cursor(last["created_at"], last["id"])
+
 
 @router.get("/", response_model=List[WorkflowList])
-async def list_flows():
-    """List all flows."""
+async def list_flows(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor from the previous page"),
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+):
+    """List flows, newest first; follow X-Next-Cursor for the next page."""
     async with get_db() as db:
-        workflows = await db.fetch_all("SELECT * FROM workflows")
-        return [
-            {
-                "id": w["id"],
-                "name": w["name"],
-                "description": w["description"],
-                "status": w["status"],
-                "created_at": w["created_at"],
-                "updated_at": w["updated_at"]
-            }
-            for w in workflows
-        ]
+        workflows, next_cursor = await fetch_flow_page(
+            db, limit, cursor, status, created_after, created_before)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [dict(w) for w in workflows]
 
 
 @router.get("/templates", response_model=List[Dict[str, Any]])
 async def list_flow_templates():
-    """List available flow templates."""
-    return [
-        {
-            "id": "data-analysis",
-            "name": "Data Analysis Flow",
-            "description": "Analyze data sets and generate insights",
-            "steps": [
-                {"name": "Research", "agent": "Researcher", "description": "Gather relevant data"},
-                {"name": "Process", "agent": "Processor", "description": "Process and analyze data"},
-                {"name": "Approve", "agent": "Approver", "description": "Validate analysis results"},
-                {"name": "Optimize", "agent": "Optimizer", "description": "Suggest improvements"}
-            ]
-        },
-        {
-            "id": "content-generation",
-            "name": "Content Generation Flow",
-            "description": "Generate and optimize content based on requirements",
-            "steps": [
-                {"name": "Research", "agent": "Researcher", "description": "Research topic and gather information"},
-                {"name": "Process", "agent": "Processor", "description": "Generate initial content draft"},
-                {"name": "Approve", "agent": "Approver", "description": "Review and approve content"},
-                {"name": "Optimize", "agent": "Optimizer", "description": "Optimize content for engagement"}
-            ]
-        },
-        {
-            "id": "customer-support",
-            "name": "Customer Support Flow",
-            "description": "Handle customer inquiries and support tickets",
-            "steps": [
-                {"name": "Research", "agent": "Researcher", "description": "Research customer history and issue"},
-                {"name": "Process", "agent": "Processor", "description": "Generate response or solution"},
-                {"name": "Approve", "agent": "Approver", "description": "Review and approve response"},
-                {"name": "Optimize", "agent": "Optimizer", "description": "Suggest improvements to process"}
-            ]
-        }
-    ]
+    """List available flow templates and their step graphs."""
+    return FLOW_TEMPLATES
+
+
+async def load_flow_result(
+    workflow
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Decode a flow's result, or point at the streaming endpoint when it
+    was spilled to a file. Returns (result, result_url)."""
+    stored = await result_store.info(workflow["id"])
+    if stored is not None:
+        if stored["path"]:
+            return None, f"/flows/{workflow['id']}/result"
+        return await result_store.load(workflow["id"]), None
+    # Rows written before results moved to workflow_results
+    if workflow["result"]:
+        try:
+            return json.loads(workflow["result"]), None
+        except json.JSONDecodeError:
+            return {"data": workflow["result"]}, None
+    return None, None
 
 
 @router.get("/{flow_id}", response_model=WorkflowDetail)
@@ -72,29 +138,37 @@ async def get_flow(flow_id: str):
     """Get a flow by ID."""
     async with get_db() as db:
         workflow = await db.fetch_one(
-            "SELECT * FROM workflows WHERE id = ?",
+            f"SELECT {SUMMARY_COLUMNS}, error, result "
+            "FROM workflows WHERE id = ?",
             (flow_id,)
         )
         if not workflow:
             raise HTTPException(status_code=404, detail="Flow not found")
-        result = None
-        if workflow.get("result"):
-            try:
-                result = json.loads(workflow["result"])
-            except json.JSONDecodeError:
-                result = {"data": workflow["result"]}
+        result, result_url = await load_flow_result(workflow)
         return {
             "id": workflow["id"],
             "name": workflow["name"],
             "description": workflow["description"],
             "status": workflow["status"],
             "result": result,
-            "error": workflow.get("error"),
+            "result_url": result_url,
+            "error": workflow["error"],
+            "current_step": workflow["current_step"],
+            "progress": workflow["progress"],
             "created_at": workflow["created_at"],
             "updated_at": workflow["updated_at"]
         }
 
 
+@router.get("/{flow_id}/result")
+async def stream_flow_result(flow_id: str):
+    """Stream a flow's result JSON without loading it whole."""
+    chunks = await result_store.stream(flow_id)
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="Flow result not found")
+    return StreamingResponse(chunks, media_type="application/json")
+
+
 @router.delete("/{flow_id}", status_code=204)
 async def delete_flow(flow_id: str):
     """Delete a flow by ID."""
@@ -105,6 +179,7 @@ async def delete_flow(flow_id: str):
         )
         if not workflow:
             raise HTTPException(status_code=404, detail="Flow not found")
+        await result_store.delete(flow_id)
         await db.execute(
             "DELETE FROM workflows WHERE id = ?",
             (flow_id,)
@@ -0,0 +1,120 @@
+"""Idempotency-Key handling for FluxoX's POST endpoints."""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from app.config import config
+from app.database.idempotency import idempotency_store
+
+MAX_KEY_LENGTH = 255
+# Response headers worth replaying
+REPLAYED_HEADERS = ("location", "x-next-cursor")
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Digest of the request, so a reused key with a new request is caught."""
+    canonical = json.dumps(
+        jsonable_encoder(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _as_response(result: Any, status_code: int) -> JSONResponse:
+    if isinstance(result, Response):
+        return result
+    return JSONResponse(
+        status_code=status_code, content=jsonable_encoder(result))
+
+
+async def idempotent(
+    scope: str,
+    key: Optional[str],
+    fingerprint: str,
+    call: Callable[[], Awaitable[Any]],
+    status_code: int = 200
+) -> Any:
+    """
+    Run `call` at most once per Idempotency-Key.
+
+    Without a key the call simply runs. With one, a completed earlier
+    request is replayed from storage (marked `Idempotent-Replayed: true`),
+    an in-flight one is waited for, and a key reused with a different
+    request is rejected with 422. The claim is renewed while the call
+    runs. Failures (exceptions, error statuses and error flow results)
+    release the key instead of being stored, so a retry runs again.
+    """
+    if key is None:
+        return await call()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+    deadline = time.monotonic() + config.api.idempotency_wait_seconds
+    while True:
+        owner, record = await idempotency_store.claim(scope, key, fingerprint)
+        if owner is not None:
+            break
+        if record is not None:
+            if record["fingerprint"] != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail=("Idempotency-Key was already used for a "
+                            "different request"))
+            if record["state"] == "completed":
+                return Response(
+                    content=record["body"],
+                    status_code=record["status_code"],
+                    headers={
+                        **record["headers"], "Idempotent-Replayed": "true"},
+                    media_type="application/json")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPException(
+                status_code=409,
+                detail=("A request with this Idempotency-Key is still "
+                        "in progress"),
+                headers={"Retry-After": "1"})
+        await idempotency_store.wait(scope, key, remaining)
+
+    # Keep the claim alive however long the call runs
+    heartbeat = asyncio.ensure_future(_renew(scope, key, owner))
+    try:
+        result = await call()
+    except BaseException:
+        await idempotency_store.release(scope, key, owner)
+        raise
+    finally:
+        heartbeat.cancel()
+    response = _as_response(result, status_code)
+    if _failed(result, response):
+        # Errors are not replayed; a retry with the key runs again
+        await idempotency_store.release(scope, key, owner)
+        return response
+    headers: Dict[str, str] = {
+        name: value for name, value in response.headers.items()
+        if name in REPLAYED_HEADERS}
+    await idempotency_store.complete(
+        scope, key, owner, response.status_code, headers,
+        response.body.decode())
+    return response
+
+
+def _failed(result: Any, response: Response) -> bool:
+    """Whether the call failed: an error status or an error flow result."""
+    if response.status_code >= 400:
+        return True
+    return isinstance(result, dict) and result.get("status") == "error"
+
+
+async def _renew(scope: str, key: str, owner: str) -> None:
+    """Extend a claim every third of its lock period until cancelled."""
+    while True:
+        await asyncio.sleep(idempotency_store.lock_seconds / 3)
+        await idempotency_store.renew(scope, key, owner)
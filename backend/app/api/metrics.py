@@ -1,11 +1,16 @@
 """API endpoints for system metrics and real-time execution stats."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from app.database import get_db
-import psutil
-from datetime import datetime
+from app.database.counters import workflow_counts
+from app.config import config
+from app.database.queue import job_queue
+from app.flow.jobs import job_pool
+from app.monitoring.metrics import AGENT_LATENCY, QUEUE_DEPTH, REGISTRY
+from app.monitoring.system import system_sampler
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -16,25 +21,14 @@ async def get_metrics():
     """Get system metrics and workflow statistics."""
     try:
         async with get_db() as db:
-            # Get workflow execution metrics
-            total_executions = await db.fetch_val(
-                "SELECT COUNT(*) FROM workflows"
-            ) or 0
+            # Trigger-maintained counters: one small read, no table scans
+            counts = await workflow_counts(db)
+            total_executions = sum(counts.values())
+            completed = counts.get("completed", 0)
+            failed = counts.get("error", 0)
 
-            # Get completed workflows
-            completed = await db.fetch_val(
-                "SELECT COUNT(*) FROM workflows WHERE status = 'completed'"
-            ) or 0
-
-            # Get failed workflows
-            failed = await db.fetch_val(
-                "SELECT COUNT(*) FROM workflows WHERE status = 'error'"
-            ) or 0
-
-            # Get system metrics
-            memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            disk = psutil.disk_usage('/')
+            # Cached snapshot from the background sampler (never blocks)
+            system = system_sampler.latest()
 
             return {
                 "workflow_metrics": {
@@ -44,10 +38,11 @@ async def get_metrics():
                     "success_rate": (completed / total_executions * 100) if total_executions > 0 else 0
                 },
                 "system_metrics": {
-                    "memory_usage_percent": memory.percent,
-                    "cpu_usage_percent": cpu_percent,
-                    "disk_usage_percent": disk.percent,
-                    "timestamp": datetime.now().isoformat()
+                    "memory_usage_percent": system["memory_percent"],
+                    "cpu_usage_percent": system["cpu_percent"],
+                    "disk_usage_percent": system["disk_percent"],
+                    "process_rss_bytes": system["process_rss_bytes"],
+                    "timestamp": system["timestamp"]
                 }
             }
     except Exception as e:
@@ -58,28 +53,48 @@ async def get_metrics():
         )
 
 
-@router.get("/agents")
-async def get_agent_metrics() -> Dict[str, Any]:
-    """Get agent-specific performance metrics."""
+@router.get("/system")
+async def get_system_metrics(
+    window: Optional[float] = Query(
+        None, gt=0,
+        description="Only snapshots from the last `window` seconds")
+) -> Dict[str, Any]:
+    """Latest system snapshot and the sampler's recent history."""
     return {
-        "researcher": {
-            "accuracy": 0.92,
-            "average_response_time": "0.8s",
-            "queries_processed": 150
-        },
-        "processor": {
-            "throughput": "45 tasks/min",
-            "error_rate": 0.03,
-            "tasks_completed": 280
-        },
-        "approver": {
-            "approval_rate": 0.85,
-            "average_confidence": 0.91,
-            "reviews_completed": 200
-        },
-        "optimizer": {
-            "improvement_rate": 0.25,
-            "suggestions_implemented": 45,
-            "average_optimization": "20%"
-        }
+        "interval_seconds": system_sampler.interval,
+        "latest": system_sampler.latest(),
+        "history": system_sampler.history(window)
     }
+
+
+@router.get("/agents")
+async def get_agent_metrics() -> Dict[str, Any]:
+    """Per-agent process() latency and error counts (this process)."""
+    agents: Dict[str, Any] = {}
+    for agent, outcome in AGENT_LATENCY.label_sets():
+        stats = AGENT_LATENCY.snapshot(agent, outcome)
+        entry = agents.setdefault(agent, {"calls": 0, "errors": 0})
+        entry["calls"] += stats["count"]
+        if outcome == "error":
+            entry["errors"] += stats["count"]
+        else:
+            entry.update({
+                "mean_seconds": round(stats["mean"], 6),
+                "p50_seconds": stats["p50"],
+                "p95_seconds": stats["p95"]
+            })
+    for entry in agents.values():
+        entry["error_rate"] = (
+            entry["errors"] / entry["calls"] if entry["calls"] else 0.0)
+    return agents
+
+
+@router.get("/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    """All metrics in Prometheus text exposition format."""
+    QUEUE_DEPTH.set(job_pool.depth, "memory")
+    if config.queue.backend == "durable":
+        QUEUE_DEPTH.set(await job_queue.depth(), "durable")
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8")
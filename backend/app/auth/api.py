@@ -6,7 +6,8 @@ from app.auth.jwt import (
     authenticate_user,
     create_access_token,
     get_current_active_user,
-    fake_users_db,
+    run_password_check,
+    users_db,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 import sys
@@ -34,8 +35,8 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = authenticate_user(
-        fake_users_db, form_data.username, form_data.password)
+    user = await run_password_check(
+        authenticate_user, users_db, form_data.username, form_data.password)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
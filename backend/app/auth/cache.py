@@ -0,0 +1,81 @@
+"""
+Verified-token cache for FluxoX authentication.
+
+Maps a SHA-256 digest of an access token to the user it resolved to,
+until the token's `exp` but for at most `max_age` seconds. A hit skips
+the HMAC check, claim parsing and user lookup. Entries for a user are
+dropped as soon as the user changes in this process (e.g. is disabled);
+`max_age` bounds how long other worker processes, which share the user
+store but not this cache, keep serving the old user.
+"""
+
+# Author: theyashdhiman04
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+def _digest(token: str) -> bytes:
+    # Raw tokens are bearer credentials; keep only a digest in memory
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """Bounded LRU of token digest -> (user, expires_at)."""
+
+    def __init__(self, max_size: int = 10_000, max_age: float = 30.0):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries: "OrderedDict[bytes, Tuple[Any, float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[bytes]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[Any]:
+        """The cached user for `token`, or None if absent or expired."""
+        key = _digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if time.time() >= expires_at:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return user
+
+    def put(
+        self,
+        token: str,
+        user: Any,
+        expires_at: Optional[float] = None
+    ) -> None:
+        key = _digest(token)
+        stale_at = time.time() + self.max_age
+        if expires_at is not None:
+            stale_at = min(expires_at, stale_at)
+        self._entries[key] = (user, stale_at)
+        self._entries.move_to_end(key)
+        self._by_user.setdefault(user.username, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, username: str) -> None:
+        """Forget every cached token of `username`."""
+        for key in self._by_user.pop(username, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def _remove(self, key: bytes) -> None:
+        user, _ = self._entries.pop(key)
+        keys = self._by_user.get(user.username)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user.username]
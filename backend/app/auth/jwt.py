@@ -1,6 +1,8 @@
 """JWT authentication module for FluxoX."""
 
 from app.config import config
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 import sys
@@ -12,6 +14,9 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 
+from app.auth.cache import TokenCache
+from app.auth.users import UserStore
+
 # Add the parent directory to sys.path to ensure imports work correctly
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
@@ -21,6 +26,8 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 SECRET_KEY = config.secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+TOKEN_CACHE_SIZE = 10_000  # Verified tokens kept in memory
+TOKEN_CACHE_SECONDS = 30.0  # Longest a cached token skips the user store
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -38,6 +45,7 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     """Token data model."""
     username: Optional[str] = None
+    expires_at: Optional[float] = None  # Token `exp` as a Unix timestamp
 
 
 class User(BaseModel):
@@ -53,23 +61,17 @@ class UserInDB(User):
     hashed_password: str
 
 
-# Mock user database - replace with actual database in production
-fake_users_db = {
-    "admin": {
-        "username": "admin",
-        "full_name": "Administrator",
-        "email": "admin@fluxox.app",
-        "hashed_password": pwd_context.hash("adminpassword"),
-        "disabled": False,
-    },
-    "testuser": {
-        "username": "testuser",
-        "full_name": "Test User",
-        "email": "test@fluxox.app",
-        "hashed_password": pwd_context.hash("testpassword"),
-        "disabled": False,
-    }
-}
+# Persistent user store (precomputed hashes; nothing is hashed at import)
+users_db = UserStore(config.database.url)
+fake_users_db = users_db  # Former name, kept for existing imports
+
+# bcrypt is deliberately slow; verify off the event loop on a few threads
+password_executor = ThreadPoolExecutor(
+    max_workers=config.auth.password_workers, thread_name_prefix="bcrypt")
+_logins_in_flight = 0
+
+# Resolved users of recently verified tokens
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_SECONDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -82,6 +84,12 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def set_user_disabled(username: str, disabled: bool = True) -> None:
+    """Enable or disable a user, dropping any cached tokens of theirs."""
+    users_db.set_disabled(username, disabled)
+    token_cache.invalidate_user(username)
+
+
 def get_user(db, username: str) -> Optional[UserInDB]:
     """Get a user from the database."""
     if username in db:
@@ -100,6 +108,28 @@ def authenticate_user(fake_db, username: str, password: str) -> Optional[UserInD
     return user
 
 
+async def run_password_check(func, *args):
+    """
+    Run a bcrypt-bound call such as authenticate_user on the password pool.
+
+    Logins beyond `max_concurrent_logins` are refused with a 503 rather
+    than queued, so a login storm cannot pile up behind bcrypt.
+    """
+    global _logins_in_flight
+    if _logins_in_flight >= config.auth.max_concurrent_logins:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _logins_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            password_executor, func, *args)
+    finally:
+        _logins_in_flight -= 1
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -128,6 +158,10 @@ def verify_token(token: str) -> TokenData:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cached = token_cache.get(token)
+    if cached is not None:
+        return TokenData(username=cached.username)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -140,25 +174,39 @@ def verify_token(token: str) -> TokenData:
             if datetime.utcnow() > expiration:
                 raise expired_exception
 
-        token_data = TokenData(username=username)
-        return token_data
+        token_data = TokenData(
+            username=username, expires_at=payload.get("exp"))
     except JWTError as e:
         # Check if it's an expired token error
         if "Signature has expired" in str(e):
             raise expired_exception
         raise credentials_exception
 
+    user = get_user(users_db, username)
+    if user is not None and token_data.expires_at is not None:
+        token_cache.put(token, user, token_data.expires_at)
+    return token_data
+
 
 def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """Get the current user from a JWT token."""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
     token_data = verify_token(token)
-    user = get_user(fake_users_db, token_data.username)
+    user = token_cache.get(token)  # Filled by verify_token
+    if user is not None:
+        return user
+    user = get_user(users_db, token_data.username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if token_data.expires_at is not None:
+        token_cache.put(token, user, token_data.expires_at)
     return user
 
 
@@ -0,0 +1,128 @@
+"""
+Persistent user store for FluxoX authentication.
+
+Users live in a `users` table in the application database, so accounts
+and their `disabled` flag survive restarts and are shared by every
+worker. Password hashes are stored, never computed at import: the
+built-in accounts below ship with precomputed bcrypt hashes and are
+only inserted when the table is first created.
+
+The store is a read-only Mapping of username -> user dict, which is the
+shape `get_user` and `authenticate_user` already expect.
+"""
+
+# Author: theyashdhiman04
+
+import sqlite3
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+# Seeded once into an empty table (passwords: "adminpassword", "testpassword")
+DEFAULT_USERS = [
+    {
+        "username": "admin",
+        "full_name": "Administrator",
+        "email": "admin@fluxox.app",
+        "hashed_password": (
+            "$2b$12$kxKbjGCqDlqCxXZ5ZWQf3e8Jh.PA/6z.e44rQlllbdyreYk0JLEx2"),
+        "disabled": False,
+    },
+    {
+        "username": "testuser",
+        "full_name": "Test User",
+        "email": "test@fluxox.app",
+        "hashed_password": (
+            "$2b$12$YopIe6v3FH2MLrXgqp9cYevoLpxEROxfufSeYWBrDsv/bx0YgDIl2"),
+        "disabled": False,
+    },
+]
+
+COLUMNS = "username, full_name, email, hashed_password, disabled"
+
+
+class UserStore(Mapping):
+    """Users table behind a Mapping interface; connects on first use."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Lookups run from FastAPI's threadpool, hence the lock
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS users (
+                        username TEXT PRIMARY KEY,
+                        full_name TEXT,
+                        email TEXT,
+                        hashed_password TEXT NOT NULL,
+                        disabled INTEGER NOT NULL DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                seeded = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+                if seeded[0] == 0:
+                    conn.executemany(
+                        f"INSERT INTO users ({COLUMNS}) VALUES "
+                        "(:username, :full_name, :email, :hashed_password, "
+                        ":disabled)",
+                        DEFAULT_USERS)
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def __getitem__(self, username: str) -> Dict[str, Any]:
+        rows = self._query(
+            f"SELECT {COLUMNS} FROM users WHERE username = ?", (username,))
+        if not rows:
+            raise KeyError(username)
+        user = dict(rows[0])
+        user["disabled"] = bool(user["disabled"])
+        return user
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._query("SELECT username FROM users")
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM users")[0][0]
+
+    def add(
+        self,
+        username: str,
+        hashed_password: str,
+        email: Optional[str] = None,
+        full_name: Optional[str] = None
+    ) -> None:
+        """Create a user from an already computed password hash."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    f"INSERT INTO users ({COLUMNS}) VALUES (?, ?, ?, ?, 0)",
+                    (username, full_name, email, hashed_password))
+
+    def set_disabled(self, username: str, disabled: bool = True) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE users SET disabled = ? WHERE username = ?",
+                    (int(disabled), username))
+        if cursor.rowcount == 0:
+            raise KeyError(username)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
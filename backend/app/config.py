@@ -24,9 +24,35 @@ ENV = os.getenv("ENVIRONMENT", "development").lower()
 
 class DatabaseConfig(BaseModel):
     """Database configuration settings."""
-    url: str = Field(default="workflows.db")
+    # SQLite file shared by API and workers
+    url: str = Field(default="fluxox.db")
     echo: bool = Field(default=False)
     connect_args: Dict[str, Any] = Field(default_factory=dict)
+    # Long-lived connections opened at startup
+    pool_size: int = Field(default=4)
+    # Re-check connections idle this long
+    health_check_seconds: float = Field(default=30.0)
+    # Write-ahead logging: readers don't block the writer
+    wal: bool = Field(default=True)
+    # Batch writes through a single writer
+    group_commit: bool = Field(default=True)
+    # Max statements per group commit
+    writer_batch_size: int = Field(default=512)
+    # Spill directory for large results
+    results_dir: str = Field(default="results")
+    # Larger results go to files
+    result_spill_bytes: int = Field(default=1024 * 1024)
+    # zlib level (zstd uses its default)
+    result_compression_level: int = Field(default=6)
+    pragmas: Dict[str, Any] = Field(default_factory=lambda: {
+        "busy_timeout": 5000,
+        # Reader connections; NORMAL skips the commit fsync in WAL mode (the
+        # database stays consistent, but the last commits can be lost on
+        # power failure). The group-commit writer always uses FULL.
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -16000,  # KiB
+    })
 
     model_config = {"extra": "allow"}
 
@@ -38,6 +64,10 @@ class APIConfig(BaseModel):
     reload: bool = Field(default=True)
     debug: bool = Field(default=True)
     workers: int = Field(default=1)
+    # How long responses are replayed
+    idempotency_ttl_seconds: float = Field(default=86400.0)
+    # Wait on an in-flight duplicate
+    idempotency_wait_seconds: float = Field(default=60.0)
 
     model_config = {"extra": "allow"}
 
@@ -58,6 +88,16 @@ class RateLimitConfig(BaseModel):
     enabled: bool = Field(default=False)
     per_minute: int = Field(default=60)  # Requests per minute
     window_size: int = Field(default=60)  # Window size in seconds
+    # Tracked IPs before LRU eviction
+    max_clients: int = Field(default=100_000)
+    # Authenticated users; None = per_minute
+    user_per_minute: Optional[int] = Field(default=None)
+    # Path prefix -> requests per window
+    route_limits: Dict[str, int] = Field(default_factory=dict)
+    # "memory" (per process) or "sqlite" (shared)
+    backend: str = Field(default="memory")
+    # Bucket file for the sqlite backend
+    path: str = Field(default="ratelimit.db")
 
     model_config = {"extra": "allow"}
 
@@ -65,8 +105,85 @@ class RateLimitConfig(BaseModel):
 class WorkflowConfig(BaseModel):
     """Workflow execution configuration settings."""
     use_mock: bool = Field(default=True)
-    timeout_seconds: float = Field(default=30.0)
+    timeout_seconds: float = Field(default=30.0)  # Whole-workflow deadline
+    # Retries per step after the first attempt
     max_retries: int = Field(default=3)
+    step_timeout_seconds: Optional[float] = Field(default=10.0)  # Per attempt
+    # Base of jittered backoff
+    retry_backoff_seconds: float = Field(default=0.1)
+    retry_backoff_max_seconds: float = Field(default=2.0)
+    # None disables hedging
+    hedge_after_seconds: Optional[float] = Field(default=None)
+    # Pre-built engines shared by runs
+    engine_pool_size: int = Field(default=4)
+    max_concurrent_runs: int = Field(default=256)  # Runs in flight per process
+    batch_concurrency: int = Field(default=16)  # Max flows in flight per batch
+    batch_max_items: int = Field(default=5000)
+    # Background workers for async submissions
+    job_workers: int = Field(default=4)
+    job_queue_size: int = Field(default=1000)
+    # Write run/step rows for metrics
+    record_executions: bool = Field(default=True)
+    # Batch window for execution rows
+    record_flush_seconds: float = Field(default=0.5)
+    # Runs buffered before records are shed
+    record_buffer_size: int = Field(default=10000)
+    # Share identical in-flight /execute runs
+    dedupe_executions: bool = Field(default=True)
+    # Memoize results of cacheable agents
+    step_cache: bool = Field(default=True)
+    step_cache_size: int = Field(default=1024)  # In-memory entries (LRU)
+    step_cache_ttl_seconds: float = Field(default=3600.0)
+    # Also keep entries in the step_cache table
+    step_cache_persist: bool = Field(default=False)
+    # Approval rounds per run before it fails
+    max_iterations: int = Field(default=3)
+    # Agent invocations per run; None: unlimited
+    max_agent_calls: Optional[int] = Field(default=None)
+
+    model_config = {"extra": "allow"}
+
+
+class QueueConfig(BaseModel):
+    """Background job queue configuration settings."""
+    # "memory" (in-process) or "durable" (jobs table)
+    backend: str = Field(default="memory")
+    # Lease length before a job is re-claimable
+    lease_seconds: float = Field(default=30.0)
+    # How often workers extend leases
+    heartbeat_seconds: float = Field(default=10.0)
+    max_attempts: int = Field(default=3)
+    # Idle worker polling interval
+    poll_interval_seconds: float = Field(default=0.5)
+    busy_timeout_seconds: float = Field(default=5.0)  # SQLite lock wait
+
+    model_config = {"extra": "allow"}
+
+
+class MonitoringConfig(BaseModel):
+    """Runtime monitoring configuration settings."""
+    # System metrics sampling period
+    sample_interval_seconds: float = Field(default=5.0)
+    # Snapshots kept (10 min at 5s)
+    sample_history_size: int = Field(default=120)
+
+    model_config = {"extra": "allow"}
+
+
+class AuthConfig(BaseModel):
+    """Authentication configuration settings."""
+    # Threads running bcrypt verification
+    password_workers: int = Field(default=2)
+    # In-flight logins before 503s
+    max_concurrent_logins: int = Field(default=16)
+
+    model_config = {"extra": "allow"}
+
+
+class AgentConfig(BaseModel):
+    """Agent configuration settings."""
+    history_size: int = Field(default=100)  # Recent inputs kept per agent
+    history_stats: bool = Field(default=True)  # Aggregate counts/sizes/latency
 
     model_config = {"extra": "allow"}
 
@@ -90,6 +207,10 @@ class AppConfig(BaseModel):
     cors: CORSConfig = Field(default_factory=CORSConfig)
     rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
     workflow: WorkflowConfig = Field(default_factory=WorkflowConfig)
+    queue: QueueConfig = Field(default_factory=QueueConfig)
+    agents: AgentConfig = Field(default_factory=AgentConfig)
+    monitoring: MonitoringConfig = Field(default_factory=MonitoringConfig)
+    auth: AuthConfig = Field(default_factory=AuthConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     secret_key: str = Field(default="supersecretkey")  # Change in production!
 
@@ -108,6 +229,10 @@ def load_config() -> AppConfig:
     cors_updates = {}
     rate_limit_updates = {}
     workflow_updates = {}
+    queue_updates = {}
+    agent_updates = {}
+    monitoring_updates = {}
+    auth_updates = {}
     logging_updates = {}
     app_updates = {}
 
@@ -115,12 +240,35 @@ def load_config() -> AppConfig:
     if os.getenv("DATABASE_URL"):
         db_updates["url"] = os.getenv("DATABASE_URL")
 
+    if os.getenv("DB_POOL_SIZE"):
+        db_updates["pool_size"] = int(os.getenv("DB_POOL_SIZE"))
+
+    if os.getenv("DB_WAL"):
+        db_updates["wal"] = os.getenv("DB_WAL").lower() == "true"
+
+    if os.getenv("DB_GROUP_COMMIT"):
+        db_updates["group_commit"] = os.getenv(
+            "DB_GROUP_COMMIT").lower() == "true"
+
+    if os.getenv("RESULTS_DIR"):
+        db_updates["results_dir"] = os.getenv("RESULTS_DIR")
+
+    if os.getenv("RESULT_SPILL_BYTES"):
+        db_updates["result_spill_bytes"] = int(os.getenv("RESULT_SPILL_BYTES"))
+
     if os.getenv("API_HOST"):
         api_updates["host"] = os.getenv("API_HOST")
 
     if os.getenv("API_PORT"):
         api_updates["port"] = int(os.getenv("API_PORT"))
 
+    if os.getenv("API_WORKERS"):
+        api_updates["workers"] = int(os.getenv("API_WORKERS"))
+
+    if os.getenv("IDEMPOTENCY_TTL"):
+        api_updates["idempotency_ttl_seconds"] = float(
+            os.getenv("IDEMPOTENCY_TTL"))
+
     if os.getenv("API_RELOAD"):
         api_updates["reload"] = os.getenv("API_RELOAD").lower() == "true"
 
@@ -141,16 +289,133 @@ def load_config() -> AppConfig:
         rate_limit_updates["per_minute"] = int(
             os.getenv("RATE_LIMIT_PER_MINUTE"))
 
+    if os.getenv("RATE_LIMIT_MAX_CLIENTS"):
+        rate_limit_updates["max_clients"] = int(
+            os.getenv("RATE_LIMIT_MAX_CLIENTS"))
+
+    if os.getenv("RATE_LIMIT_USER_PER_MINUTE"):
+        rate_limit_updates["user_per_minute"] = int(
+            os.getenv("RATE_LIMIT_USER_PER_MINUTE"))
+
+    if os.getenv("RATE_LIMIT_ROUTES"):
+        # "/execute=10,/auth/token=5"
+        rate_limit_updates["route_limits"] = {
+            prefix.strip(): int(calls)
+            for prefix, _, calls in (
+                item.partition("=")
+                for item in os.getenv("RATE_LIMIT_ROUTES").split(",")
+                if item.strip())
+        }
+
+    if os.getenv("RATE_LIMIT_BACKEND"):
+        rate_limit_updates["backend"] = os.getenv("RATE_LIMIT_BACKEND").lower()
+    elif api_updates.get("workers", 1) > 1:
+        # Per-process buckets would multiply the limit by the worker count
+        rate_limit_updates["backend"] = "sqlite"
+
+    if os.getenv("RATE_LIMIT_PATH"):
+        rate_limit_updates["path"] = os.getenv("RATE_LIMIT_PATH")
+
     if os.getenv("USE_MOCK_WORKFLOW"):
         workflow_updates["use_mock"] = os.getenv(
             "USE_MOCK_WORKFLOW").lower() == "true"
 
+    if os.getenv("WORKFLOW_TIMEOUT"):
+        workflow_updates["timeout_seconds"] = float(
+            os.getenv("WORKFLOW_TIMEOUT"))
+
+    if os.getenv("WORKFLOW_MAX_RETRIES"):
+        workflow_updates["max_retries"] = int(
+            os.getenv("WORKFLOW_MAX_RETRIES"))
+
+    if os.getenv("WORKFLOW_STEP_TIMEOUT"):
+        workflow_updates["step_timeout_seconds"] = float(
+            os.getenv("WORKFLOW_STEP_TIMEOUT"))
+
+    if os.getenv("WORKFLOW_HEDGE_AFTER"):
+        workflow_updates["hedge_after_seconds"] = float(
+            os.getenv("WORKFLOW_HEDGE_AFTER"))
+
+    if os.getenv("WORKFLOW_MAX_ITERATIONS"):
+        workflow_updates["max_iterations"] = int(
+            os.getenv("WORKFLOW_MAX_ITERATIONS"))
+
+    if os.getenv("WORKFLOW_MAX_AGENT_CALLS"):
+        workflow_updates["max_agent_calls"] = int(
+            os.getenv("WORKFLOW_MAX_AGENT_CALLS"))
+
+    if os.getenv("BATCH_CONCURRENCY"):
+        workflow_updates["batch_concurrency"] = int(
+            os.getenv("BATCH_CONCURRENCY"))
+
+    if os.getenv("JOB_WORKERS"):
+        workflow_updates["job_workers"] = int(os.getenv("JOB_WORKERS"))
+
+    if os.getenv("ENGINE_POOL_SIZE"):
+        workflow_updates["engine_pool_size"] = int(
+            os.getenv("ENGINE_POOL_SIZE"))
+
+    if os.getenv("MAX_CONCURRENT_RUNS"):
+        workflow_updates["max_concurrent_runs"] = int(
+            os.getenv("MAX_CONCURRENT_RUNS"))
+
+    if os.getenv("DEDUPE_EXECUTIONS"):
+        workflow_updates["dedupe_executions"] = os.getenv(
+            "DEDUPE_EXECUTIONS").lower() == "true"
+
+    if os.getenv("STEP_CACHE"):
+        workflow_updates["step_cache"] = os.getenv(
+            "STEP_CACHE").lower() == "true"
+
+    if os.getenv("STEP_CACHE_SIZE"):
+        workflow_updates["step_cache_size"] = int(os.getenv("STEP_CACHE_SIZE"))
+
+    if os.getenv("STEP_CACHE_TTL"):
+        workflow_updates["step_cache_ttl_seconds"] = float(
+            os.getenv("STEP_CACHE_TTL"))
+
+    if os.getenv("STEP_CACHE_PERSIST"):
+        workflow_updates["step_cache_persist"] = os.getenv(
+            "STEP_CACHE_PERSIST").lower() == "true"
+
+    if os.getenv("JOB_BACKEND"):
+        queue_updates["backend"] = os.getenv("JOB_BACKEND").lower()
+
+    if os.getenv("JOB_LEASE_SECONDS"):
+        queue_updates["lease_seconds"] = float(os.getenv("JOB_LEASE_SECONDS"))
+
+    if os.getenv("JOB_MAX_ATTEMPTS"):
+        queue_updates["max_attempts"] = int(os.getenv("JOB_MAX_ATTEMPTS"))
+
+    if os.getenv("RECORD_EXECUTIONS"):
+        workflow_updates["record_executions"] = os.getenv(
+            "RECORD_EXECUTIONS").lower() == "true"
+
+    if os.getenv("SYSTEM_SAMPLE_INTERVAL"):
+        monitoring_updates["sample_interval_seconds"] = float(
+            os.getenv("SYSTEM_SAMPLE_INTERVAL"))
+
+    if os.getenv("AGENT_HISTORY_SIZE"):
+        agent_updates["history_size"] = int(os.getenv("AGENT_HISTORY_SIZE"))
+
+    if os.getenv("AGENT_HISTORY_STATS"):
+        agent_updates["history_stats"] = os.getenv(
+            "AGENT_HISTORY_STATS").lower() == "true"
+
     if os.getenv("LOG_LEVEL"):
         logging_updates["level"] = os.getenv("LOG_LEVEL")
 
     if os.getenv("LOG_FILE"):
         logging_updates["file"] = os.getenv("LOG_FILE")
 
+    if os.getenv("AUTH_PASSWORD_WORKERS"):
+        auth_updates["password_workers"] = int(
+            os.getenv("AUTH_PASSWORD_WORKERS"))
+
+    if os.getenv("AUTH_MAX_CONCURRENT_LOGINS"):
+        auth_updates["max_concurrent_logins"] = int(
+            os.getenv("AUTH_MAX_CONCURRENT_LOGINS"))
+
     if os.getenv("SECRET_KEY"):
         app_updates["secret_key"] = os.getenv("SECRET_KEY")
 
@@ -171,6 +436,19 @@ def load_config() -> AppConfig:
     if workflow_updates:
         config.workflow = config.workflow.model_copy(update=workflow_updates)
 
+    if queue_updates:
+        config.queue = config.queue.model_copy(update=queue_updates)
+
+    if agent_updates:
+        config.agents = config.agents.model_copy(update=agent_updates)
+
+    if monitoring_updates:
+        config.monitoring = config.monitoring.model_copy(
+            update=monitoring_updates)
+
+    if auth_updates:
+        config.auth = config.auth.model_copy(update=auth_updates)
+
     if logging_updates:
         config.logging = config.logging.model_copy(update=logging_updates)
 
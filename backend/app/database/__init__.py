@@ -1,47 +1,168 @@
 """Database module for FluxoX flow persistence."""
 
 import aiosqlite
+import functools
 import os
+import time
 from typing import Optional, AsyncGenerator, Any
 from contextlib import asynccontextmanager
 
-DATABASE_URL = "fluxox.db"
+from app.config import config
+from app.database.counters import install_counters
+from app.database.pool import ConnectionPool
+from app.database.writer import GroupCommitWriter
+from app.monitoring.metrics import DB_LATENCY
+
+DATABASE_URL = config.database.url
+
+
+def _timed(method):
+    """Record a Database method's latency in fluxox_db_query_seconds."""
+    operation = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            DB_LATENCY.observe(time.perf_counter() - started, operation)
+    return wrapper
 
 
 class Database:
     """Database class for workflow persistence."""
 
+    def __init__(self):
+        self.pool: Optional[ConnectionPool] = None
+        self.writer: Optional[GroupCommitWriter] = None
+
+    async def connect(self) -> None:
+        """Open the connection pool and writer (from the app lifespan)."""
+        if self.pool is None:
+            self.pool = ConnectionPool(DATABASE_URL)
+            await self.pool.start()
+        if self.writer is None and config.database.group_commit:
+            self.writer = GroupCommitWriter(DATABASE_URL)
+            await self.writer.start()
+
+    async def close(self) -> None:
+        """Flush pending writes and close the writer and pool."""
+        if self.writer is not None:
+            await self.writer.close()
+            self.writer = None
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Lease a pooled connection, or open a one-off connection when
+        the pool is not running (scripts, tests without the lifespan)."""
+        if self.pool is not None:
+            async with self.pool.acquire() as conn:
+                yield conn
+        else:
+            async with aiosqlite.connect(DATABASE_URL) as conn:
+                conn.row_factory = aiosqlite.Row
+                yield conn
+
+    @_timed
     async def fetch_all(self, query: str, values: tuple = None) -> list:
         """Execute a query and return all results (optimized batch fetch)."""
-        async with aiosqlite.connect(DATABASE_URL) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.connection() as db:
             async with db.execute(query, values or ()) as cursor:
                 return await cursor.fetchall()
 
+    @_timed
     async def fetch_one(self, query: str, values: tuple = None) -> Optional[dict]:
         """Execute a query and return one result."""
-        async with aiosqlite.connect(DATABASE_URL) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.connection() as db:
             async with db.execute(query, values or ()) as cursor:
                 return await cursor.fetchone()
 
+    @_timed
     async def fetch_val(self, query: str, values: tuple = None) -> Optional[Any]:
         """Execute a query and return a single value."""
-        async with aiosqlite.connect(DATABASE_URL) as db:
+        async with self.connection() as db:
             async with db.execute(query, values or ()) as cursor:
                 result = await cursor.fetchone()
                 return result[0] if result else None
 
-    async def execute(self, query: str, values: tuple = None) -> None:
-        """Execute a query without returning results."""
-        async with aiosqlite.connect(DATABASE_URL) as db:
-            await db.execute(query, values or ())
-            await db.commit()
+    @_timed
+    async def execute(
+        self,
+        query: str,
+        values: tuple = None,
+        wait: bool = True
+    ) -> None:
+        """Execute a query without returning results.
+
+        With the group-commit writer running the write is queued and,
+        unless wait=False, awaited until its batch has been committed.
+        """
+        if self.writer is not None:
+            await self.writer.submit(query, values or (), wait=wait)
+            return
+        async with self.connection() as db:
+            try:
+                await db.execute(query, values or ())
+                await db.commit()
+            except Exception:
+                # Don't leave a pooled connection holding an open transaction
+                await db.rollback()
+                raise
+
+    @_timed
+    async def execute_many(
+        self,
+        query: str,
+        rows: list,
+        wait: bool = True
+    ) -> None:
+        """Execute a statement once per row of values, in one commit."""
+        if self.writer is not None:
+            await self.writer.submit(query, list(rows), wait=wait)
+            return
+        async with self.connection() as db:
+            try:
+                await db.executemany(query, rows)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def ping(self) -> bool:
+        """Whether the database answers a trivial query."""
+        try:
+            async with self.connection() as db:
+                async with db.execute("SELECT 1") as cursor:
+                    return (await cursor.fetchone()) is not None
+        except Exception:
+            return False
+
+
+async def _add_missing_columns(
+    db: aiosqlite.Connection,
+    table: str,
+    columns: dict
+) -> None:
+    """Add columns introduced after a table was first created."""
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        existing = {row[1] for row in await cursor.fetchall()}
+    for name, definition in columns.items():
+        if name not in existing:
+            await db.execute(
+                f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
 
 
 async def init_db():
     """Initialize the database with required tables."""
     async with aiosqlite.connect(DATABASE_URL) as db:
+        if config.database.wal:
+            # Persistent per database file; readers no longer block writers
+            await db.execute("PRAGMA journal_mode = WAL")
+
         # Create workflows table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS workflows (
@@ -51,12 +172,41 @@ async def init_db():
                 status TEXT NOT NULL,
                 result TEXT,
                 error TEXT,
+                current_step TEXT,
+                progress REAL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        await _add_missing_columns(db, "workflows", {
+            "current_step": "TEXT",
+            "progress": "REAL DEFAULT 0"
+        })
+        # Keyset pagination for GET /flows, optionally filtered by status
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_workflows_created
+            ON workflows (created_at, id)
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_workflows_status_created
+            ON workflows (status, created_at, id)
+        """)
+
+        # Create workflow_results table (compressed results, see results.py)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_results (
+                workflow_id TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                data BLOB,
+                path TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (workflow_id) REFERENCES workflows(id)
+            )
+        """)
 
-        # Create workflow_executions table
+        # Create workflow_executions table (one row per engine run)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS workflow_executions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -67,19 +217,115 @@ async def init_db():
                 FOREIGN KEY (workflow_id) REFERENCES workflows(id)
             )
         """)
+        await _add_missing_columns(db, "workflow_executions", {
+            "run_id": "TEXT",
+            "template_id": "TEXT",
+            "step_count": "INTEGER",
+            "input_bytes": "INTEGER",
+            "output_bytes": "INTEGER",
+            "error": "TEXT"
+        })
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_workflow_executions_workflow
+            ON workflow_executions (workflow_id)
+        """)
 
-        await db.commit()
+        # Create agent_executions table (one row per step of a run)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS agent_executions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                workflow_id TEXT NOT NULL,
+                step TEXT NOT NULL,
+                agent_type TEXT,
+                status TEXT NOT NULL,
+                execution_time REAL,
+                attempts INTEGER,
+                retries INTEGER,
+                input_bytes INTEGER,
+                output_bytes INTEGER,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_agent_executions_agent
+            ON agent_executions (agent_type, created_at)
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_agent_executions_run
+            ON agent_executions (run_id)
+        """)
 
+        # Create jobs table (durable work queue, see app/database/queue.py)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                workflow_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (workflow_id) REFERENCES workflows(id)
+            )
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_available
+            ON jobs (status, available_at, id)
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_lease
+            ON jobs (status, lease_expires_at)
+        """)
+
+        # Create step_cache table (persistent tier of app/flow/cache.py)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS step_cache (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL,
+                result TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+        # Create idempotency_keys table (see idempotency.py)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                state TEXT NOT NULL,
+                status_code INTEGER,
+                headers TEXT,
+                body TEXT,
+                expires_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (scope, key)
+            ) WITHOUT ROWID
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires
+            ON idempotency_keys (expires_at)
+        """)
+
+        # Metrics counters maintained by triggers (see counters.py)
+        await install_counters(db)
+
+        await db.commit()
 
-@asynccontextmanager
-async def get_db() -> AsyncGenerator[Database, None]:
-    """Get a database instance as an async context manager."""
-    db = Database()
-    try:
-        yield db
-    finally:
-        # No explicit cleanup needed as each operation manages its own connection
-        pass
 
 # Create a global database instance
 db = Database()
+
+
+@asynccontextmanager
+async def get_db() -> AsyncGenerator[Database, None]:
+    """Get the shared database instance as an async context manager."""
+    # Connections are leased per operation from the shared pool
+    yield db
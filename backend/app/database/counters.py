@@ -0,0 +1,137 @@
+"""
+Incrementally maintained metrics counters for FluxoX.
+
+Triggers keep `workflow_counters` (workflows per status) and
+`execution_totals` (recorded runs and their summed execution time) up to
+date in the same transaction as every insert, status change and delete,
+so /metrics reads a handful of rows instead of scanning the tables. The
+counters live in the database file, so they survive restarts; they are
+rebuilt from the tables once, when the triggers are first installed.
+"""
+
+# Author: theyashdhiman04
+
+from typing import Any, Dict
+
+import aiosqlite
+
+TRIGGER_NAMES = (
+    "trg_workflows_count_insert", "trg_workflows_count_update",
+    "trg_workflows_count_delete",
+    "trg_executions_total_insert", "trg_executions_total_delete"
+)
+
+COUNTER_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_workflows_count_insert
+    AFTER INSERT ON workflows
+    BEGIN
+        INSERT INTO workflow_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_workflows_count_update
+    AFTER UPDATE OF status ON workflows
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE workflow_counters SET count = count - 1
+        WHERE status = OLD.status;
+        INSERT INTO workflow_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_workflows_count_delete
+    AFTER DELETE ON workflows
+    BEGIN
+        UPDATE workflow_counters SET count = count - 1
+        WHERE status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_executions_total_insert
+    AFTER INSERT ON workflow_executions
+    BEGIN
+        UPDATE execution_totals
+        SET runs = runs + 1,
+            total_time = total_time + COALESCE(NEW.execution_time, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_executions_total_delete
+    AFTER DELETE ON workflow_executions
+    BEGIN
+        UPDATE execution_totals
+        SET runs = runs - 1,
+            total_time = total_time - COALESCE(OLD.execution_time, 0)
+        WHERE id = 1;
+    END
+    """
+]
+
+
+async def install_counters(db: aiosqlite.Connection) -> None:
+    """Create the counter tables and triggers (called from init_db)."""
+    placeholders = ", ".join("?" * len(TRIGGER_NAMES))
+    async with db.execute(
+        f"""
+        SELECT COUNT(*) FROM sqlite_master
+        WHERE type = 'trigger' AND name IN ({placeholders})
+        """,
+        TRIGGER_NAMES
+    ) as cursor:
+        installed = (await cursor.fetchone())[0] == len(TRIGGER_NAMES)
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS workflow_counters (
+            status TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS execution_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            runs INTEGER NOT NULL DEFAULT 0,
+            total_time REAL NOT NULL DEFAULT 0
+        )
+    """)
+    await db.execute("INSERT OR IGNORE INTO execution_totals (id) VALUES (1)")
+    for trigger in COUNTER_TRIGGERS:
+        await db.execute(trigger)
+
+    if not installed:
+        # Existing rows predate the triggers; count them once
+        await db.execute("DELETE FROM workflow_counters")
+        await db.execute("""
+            INSERT INTO workflow_counters (status, count)
+            SELECT status, COUNT(*) FROM workflows GROUP BY status
+        """)
+        await db.execute("""
+            UPDATE execution_totals
+            SET runs = (SELECT COUNT(*) FROM workflow_executions),
+                total_time = (
+                    SELECT COALESCE(SUM(execution_time), 0)
+                    FROM workflow_executions
+                )
+            WHERE id = 1
+        """)
+
+
+async def workflow_counts(db) -> Dict[str, int]:
+    """Workflows per status, read from the counters table."""
+    rows = await db.fetch_all(
+        "SELECT status, count FROM workflow_counters WHERE count > 0")
+    return {row["status"]: row["count"] for row in rows}
+
+
+async def execution_totals(db) -> Dict[str, Any]:
+    """Recorded run count and average execution time."""
+    row = await db.fetch_one(
+        "SELECT runs, total_time FROM execution_totals WHERE id = 1")
+    runs = row["runs"] if row else 0
+    return {
+        "runs": runs,
+        "avg_execution_time": (row["total_time"] / runs) if runs else 0.0
+    }
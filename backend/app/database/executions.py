@@ -0,0 +1,132 @@
+"""
+Execution recording for FluxoX.
+
+The engine reports every run (and each of its steps) here. Records are
+buffered in memory and written in batches to `workflow_executions` and
+`agent_executions` by a background flush task started with the app (or
+worker), so recording never waits on SQLite from the request path.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.config import config
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+INSERT_RUN = """
+    INSERT INTO workflow_executions
+    (run_id, workflow_id, template_id, status, execution_time, step_count,
+     input_bytes, output_bytes, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_STEP = """
+    INSERT INTO agent_executions
+    (run_id, workflow_id, step, agent_type, status, execution_time, attempts,
+     retries, input_bytes, output_bytes, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class ExecutionRecorder:
+    """Buffers run and step records and inserts them in batches."""
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        max_buffer: Optional[int] = None
+    ):
+        workflow = config.workflow
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else workflow.record_flush_seconds
+        )
+        self.max_buffer = (
+            max_buffer if max_buffer is not None
+            else workflow.record_buffer_size
+        )
+        self.dropped = 0
+        self._runs: List[tuple] = []
+        self._steps: List[tuple] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        workflow_id: str,
+        template_id: Optional[str],
+        status: str,
+        execution_time: float,
+        history: List[Dict[str, Any]],
+        input_bytes: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> str:
+        """Buffer one run and its step entries; returns the run id."""
+        run_id = uuid.uuid4().hex
+        if len(self._runs) >= self.max_buffer:
+            # The database is not keeping up; shed records, not memory
+            self.dropped += 1
+            return run_id
+
+        steps = [entry for entry in history if "agent" in entry]
+        output_bytes = sum(entry.get("output_bytes") or 0 for entry in steps)
+        self._runs.append((
+            run_id, workflow_id, template_id, status, execution_time,
+            len(steps), input_bytes, output_bytes, error
+        ))
+        self._steps.extend(
+            (
+                run_id, workflow_id, entry["step"], entry["agent"],
+                entry["status"], entry.get("duration"), entry.get("attempts"),
+                entry.get("retries"), entry.get("input_bytes"),
+                entry.get("output_bytes"), entry.get("error")
+            )
+            for entry in steps
+        )
+        return run_id
+
+    @property
+    def started(self) -> bool:
+        """Whether the periodic flush task is running."""
+        return self._flusher is not None
+
+    async def start(self) -> None:
+        """Start flushing buffered records every flush_interval seconds."""
+        if not self.started:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Shielded so shutdown never drops a batch mid-write
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """Write everything buffered so far."""
+        runs, self._runs = self._runs, []
+        steps, self._steps = self._steps, []
+        try:
+            if runs:
+                await db.execute_many(INSERT_RUN, runs)
+            if steps:
+                await db.execute_many(INSERT_STEP, steps)
+        except Exception as e:
+            logger.error(
+                f"Failed to record {len(runs)} execution(s): {str(e)}")
+
+    async def close(self) -> None:
+        """Stop the flush task and write what is left."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+
+# Shared recorder used by FlowEngine; started and closed by the app lifespan.
+execution_recorder = ExecutionRecorder()
@@ -0,0 +1,166 @@
+"""
+Idempotency-key storage for FluxoX.
+
+One row per (scope, key) in `idempotency_keys`. A request claims its key
+by inserting an `in_progress` row tagged with a random owner token;
+whoever's token ends up in the row owns the execution, in this or any
+other worker process. The owner stores the final response and the row
+then answers replays until it expires. An in-progress row expires after
+`lock_seconds` unless its owner renews it, so a crashed owner cannot
+block its key forever; completing, releasing and renewing all require
+the owner's token, so a stale owner can never touch a newer claim.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from app.config import config
+from app.database import db
+
+# Whole-table sweep of expired rows every this many claims
+SWEEP_EVERY = 1000
+
+
+class IdempotencyStore:
+    """Claims, completes and replays idempotency keys."""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        lock_seconds: Optional[float] = None,
+        poll_interval: float = 0.1
+    ):
+        api = config.api
+        self.ttl = ttl if ttl is not None else api.idempotency_ttl_seconds
+        self.lock_seconds = (
+            lock_seconds if lock_seconds is not None
+            else api.idempotency_wait_seconds)
+        self.poll_interval = poll_interval
+        # Wakes waiters in this process without waiting for the next poll;
+        # key -> [event, number of waiters], dropped with its last waiter
+        self._events: Dict[Tuple[str, str], list] = {}
+        self._claims = 0
+
+    async def claim(
+        self, scope: str, key: str, fingerprint: str
+    ) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Try to take ownership of a key.
+
+        Returns (owner, row): owner is this claim's token, or None if
+        another request holds the key; row is the current record (None if
+        it vanished between the insert and the read, e.g. a release).
+        A live row is answered by a read alone, so waiters polling an
+        in-flight key cost no commits.
+        """
+        now = time.time()
+        record = await self._read(scope, key)
+        if record is not None and record["expires_at"] > now:
+            return None, record
+
+        owner = uuid.uuid4().hex
+        self._claims += 1
+        if self._claims % SWEEP_EVERY == 0:
+            await db.execute(
+                "DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+        else:
+            await db.execute(
+                "DELETE FROM idempotency_keys "
+                "WHERE scope = ? AND key = ? AND expires_at <= ?",
+                (scope, key, now))
+        await db.execute(
+            """
+            INSERT OR IGNORE INTO idempotency_keys
+            (scope, key, fingerprint, owner, state, expires_at, created_at)
+            VALUES (?, ?, ?, ?, 'in_progress', ?, ?)
+            """,
+            (scope, key, fingerprint, owner, now + self.lock_seconds, now)
+        )
+        record = await self._read(scope, key)
+        if record is None:
+            return None, None
+        return (owner if record["owner"] == owner else None), record
+
+    async def _read(self, scope: str, key: str) -> Optional[dict]:
+        row = await db.fetch_one(
+            """
+            SELECT fingerprint, owner, state, status_code, headers, body,
+                   expires_at
+            FROM idempotency_keys WHERE scope = ? AND key = ?
+            """,
+            (scope, key)
+        )
+        if row is None:
+            return None
+        record = dict(row)
+        if record["headers"]:
+            record["headers"] = json.loads(record["headers"])
+        return record
+
+    async def renew(self, scope: str, key: str, owner: str) -> None:
+        """Extend a claim that is still running."""
+        await db.execute(
+            """
+            UPDATE idempotency_keys SET expires_at = ?
+            WHERE scope = ? AND key = ? AND owner = ? AND state = 'in_progress'
+            """,
+            (time.time() + self.lock_seconds, scope, key, owner))
+
+    async def complete(
+        self,
+        scope: str,
+        key: str,
+        owner: str,
+        status_code: int,
+        headers: Dict[str, str],
+        body: str
+    ) -> None:
+        """Store the response that replays of this key will receive."""
+        await db.execute(
+            """
+            UPDATE idempotency_keys
+            SET state = 'completed', status_code = ?, headers = ?, body = ?,
+                expires_at = ?
+            WHERE scope = ? AND key = ? AND owner = ?
+            """,
+            (status_code, json.dumps(headers), body, time.time() + self.ttl,
+             scope, key, owner)
+        )
+        self._notify(scope, key)
+
+    async def release(self, scope: str, key: str, owner: str) -> None:
+        """Drop a claim whose request failed, so a retry can run it again."""
+        await db.execute(
+            """
+            DELETE FROM idempotency_keys
+            WHERE scope = ? AND key = ? AND owner = ? AND state = 'in_progress'
+            """,
+            (scope, key, owner))
+        self._notify(scope, key)
+
+    async def wait(self, scope: str, key: str, timeout: float) -> None:
+        """Sleep until the key changes here, or one poll interval elapses."""
+        entry = self._events.setdefault((scope, key), [asyncio.Event(), 0])
+        entry[1] += 1
+        try:
+            await asyncio.wait_for(
+                entry[0].wait(), min(timeout, self.poll_interval))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            entry[1] -= 1
+            if not entry[1] and self._events.get((scope, key)) is entry:
+                del self._events[(scope, key)]
+
+    def _notify(self, scope: str, key: str) -> None:
+        entry = self._events.pop((scope, key), None)
+        if entry is not None:
+            entry[0].set()
+
+
+idempotency_store = IdempotencyStore()
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -32,28 +34,45 @@ class WorkflowExecution(Base):
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
+    # Written by the execution recorder (app/database/executions.py)
+    run_id = Column(String, nullable=True, index=True)
+    template_id = Column(String, nullable=True)
+    step_count = Column(Integer, nullable=True)
+    input_bytes = Column(Integer, nullable=True)
+    output_bytes = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
 
     workflow = relationship("Workflow", back_populates="executions")
     agent_executions = relationship(
-        "AgentExecution", back_populates="workflow_execution")
+        "AgentExecution",
+        primaryjoin=(
+            "WorkflowExecution.run_id == foreign(AgentExecution.run_id)"),
+        back_populates="workflow_execution", viewonly=True)
 
 
+# One row per step of a recorded run (see app/database/executions.py)
 class AgentExecution(Base):
     __tablename__ = "agent_executions"
 
     id = Column(Integer, primary_key=True, index=True)
-    workflow_execution_id = Column(
-        Integer, ForeignKey("workflow_executions.id"))
+    run_id = Column(String, nullable=False, index=True)
+    workflow_id = Column(String, nullable=False)
+    step = Column(String, nullable=False)
     agent_type = Column(String)
-    input_data = Column(JSON)
-    output_data = Column(JSON, nullable=True)
-    started_at = Column(DateTime, default=datetime.utcnow)
-    completed_at = Column(DateTime, nullable=True)
-    # Store execution metrics for self-improvement
-    metrics = Column(JSON, nullable=True)
+    status = Column(String, nullable=False)
+    execution_time = Column(Float, nullable=True)  # Seconds
+    attempts = Column(Integer, nullable=True)
+    retries = Column(Integer, nullable=True)
+    input_bytes = Column(Integer, nullable=True)
+    output_bytes = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
     workflow_execution = relationship(
-        "WorkflowExecution", back_populates="agent_executions")
+        "WorkflowExecution",
+        primaryjoin=(
+            "foreign(AgentExecution.run_id) == WorkflowExecution.run_id"),
+        back_populates="agent_executions", viewonly=True)
 
 
 class Agent(Base):
@@ -0,0 +1,121 @@
+"""
+SQLite connection pool for FluxoX.
+
+Keeps a fixed set of long-lived aiosqlite connections (each with its own
+worker thread) configured once with the DatabaseConfig pragmas, instead
+of opening a connection per query. Connections that sat idle are checked
+with a cheap query before being handed out and reopened if broken.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiosqlite
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Fixed-size pool of aiosqlite connections leased per query."""
+
+    def __init__(
+        self,
+        path: str,
+        size: Optional[int] = None,
+        pragmas: Optional[Dict[str, object]] = None,
+        health_check_after: Optional[float] = None
+    ):
+        self.path = path
+        self.size = size if size is not None else config.database.pool_size
+        self.pragmas = (
+            pragmas if pragmas is not None else config.database.pragmas)
+        self.health_check_after = (
+            health_check_after if health_check_after is not None
+            else config.database.health_check_seconds
+        )
+        self._connections: List[aiosqlite.Connection] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the connections have been opened."""
+        return self._idle is not None
+
+    async def _open(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.path)
+        conn.row_factory = aiosqlite.Row
+        for name, value in self.pragmas.items():
+            await conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    async def start(self) -> None:
+        """Open every connection up front."""
+        if self.started:
+            return
+        self._connections = [
+            await self._open() for _ in range(max(1, self.size))]
+        self._idle = asyncio.Queue()
+        for conn in self._connections:
+            self._idle.put_nowait((conn, time.monotonic()))
+        logger.info(
+            f"Database pool started with {len(self._connections)} "
+            "connection(s)")
+
+    async def close(self) -> None:
+        """Close all connections; the pool can be started again afterwards."""
+        connections = self._connections
+        self._connections, self._idle = [], None
+        for conn in connections:
+            try:
+                await conn.close()
+            except (sqlite3.Error, ValueError):
+                pass
+        logger.info("Database pool closed")
+
+    async def _healthy(self, conn: aiosqlite.Connection) -> bool:
+        try:
+            async with conn.execute("SELECT 1") as cursor:
+                await cursor.fetchone()
+            return True
+        except (sqlite3.Error, ValueError):
+            return False
+
+    async def _replace(
+        self,
+        conn: aiosqlite.Connection
+    ) -> aiosqlite.Connection:
+        logger.warning("Replacing broken database connection")
+        try:
+            await conn.close()
+        except (sqlite3.Error, ValueError):
+            pass
+        fresh = await self._open()
+        self._connections = [
+            fresh if c is conn else c for c in self._connections]
+        return fresh
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Lease a connection for one query, waiting if all are busy."""
+        idle = self._idle
+        conn, idle_since = await idle.get()
+        try:
+            if time.monotonic() - idle_since > self.health_check_after:
+                if not await self._healthy(conn):
+                    conn = await self._replace(conn)
+            yield conn
+        except (sqlite3.ProgrammingError, ValueError):
+            # Possibly a closed connection: hand back a fresh one if so
+            if not await self._healthy(conn):
+                conn = await self._replace(conn)
+            raise
+        finally:
+            idle.put_nowait((conn, time.monotonic()))
@@ -0,0 +1,263 @@
+"""
+Durable workflow job queue on SQLite.
+
+Jobs live in the ``jobs`` table next to ``workflows`` so several worker
+processes sharing the database can claim them. A claim is an atomic
+UPDATE that leases one job to a worker until ``lease_expires_at``; the
+worker extends the lease with heartbeats, and jobs whose lease expired
+(e.g. the worker crashed) are claimed again by other workers.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import aiosqlite
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+LEASE_EXPIRED = "Lease expired after final attempt"
+
+
+@dataclass
+class LeasedJob:
+    """A job currently leased by a worker."""
+
+    id: int
+    workflow_id: str
+    input_data: Dict[str, Any]
+    template_id: Optional[str]
+    attempts: int
+    max_attempts: int
+
+    @property
+    def final_attempt(self) -> bool:
+        """Whether a failure of this attempt fails the job for good."""
+        return self.attempts >= self.max_attempts
+
+
+class JobQueue:
+    """Enqueue, claim, heartbeat and settle jobs in the ``jobs`` table."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or config.database.url
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._connecting = asyncio.Lock()
+        # Worker loops share the connection; keep their writes out of
+        # each other's transactions
+        self._writing = asyncio.Lock()
+
+    async def connect(self) -> None:
+        """Open the queue's connection; called lazily on first use."""
+        async with self._connecting:
+            if self._conn is None:
+                conn = await aiosqlite.connect(
+                    self.db_path, isolation_level=None)
+                busy_ms = int(config.queue.busy_timeout_seconds * 1000)
+                await conn.execute(f"PRAGMA busy_timeout = {busy_ms}")
+                self._conn = conn
+
+    async def close(self) -> None:
+        """Close the queue's connection."""
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    async def _write(self, query: str, values: tuple) -> aiosqlite.Cursor:
+        """Run one autocommitted write statement."""
+        if self._conn is None:
+            await self.connect()
+        async with self._writing:
+            return await self._conn.execute(query, values)
+
+    async def _write_returning(self, query: str, values: tuple) -> list:
+        """Run one autocommitted write and fetch its RETURNING rows."""
+        if self._conn is None:
+            await self.connect()
+        async with self._writing:
+            return list(await self._conn.execute_fetchall(query, values))
+
+    async def _fail_expired(self, now: float) -> None:
+        """Fail jobs whose lease expired on their final attempt, and their
+        workflows with them, in one transaction."""
+        if self._conn is None:
+            await self.connect()
+        async with self._writing:
+            await self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = await self._conn.execute_fetchall(
+                    """
+                    UPDATE jobs
+                    SET status = 'failed', last_error = ?,
+                        lease_owner = NULL, updated_at = datetime('now')
+                    WHERE status = 'leased' AND lease_expires_at < ?
+                      AND attempts >= max_attempts
+                    RETURNING workflow_id
+                    """,
+                    (LEASE_EXPIRED, now)
+                )
+                await self._conn.executemany(
+                    """
+                    UPDATE workflows
+                    SET status = 'error', error = ?,
+                        updated_at = datetime('now')
+                    WHERE id = ? AND status IN ('pending', 'running')
+                    """,
+                    [(LEASE_EXPIRED, row[0]) for row in rows]
+                )
+                await self._conn.execute("COMMIT")
+            except BaseException:
+                await self._conn.execute("ROLLBACK")
+                raise
+
+    async def enqueue(
+        self,
+        workflow_id: str,
+        input_data: Dict[str, Any],
+        template_id: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> int:
+        """Add a job for an existing workflow row and return its id."""
+        cursor = await self._write(
+            """
+            INSERT INTO jobs (workflow_id, payload, max_attempts, available_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                workflow_id,
+                json.dumps(
+                    {"input_data": input_data, "template_id": template_id}),
+                max_attempts or config.queue.max_attempts,
+                time.time()
+            )
+        )
+        return cursor.lastrowid
+
+    async def claim(
+        self,
+        owner: str,
+        lease_seconds: Optional[float] = None
+    ) -> Optional[LeasedJob]:
+        """Atomically lease the oldest available job to ``owner``.
+
+        Available means queued and due, or leased with an expired lease.
+        Jobs that expired after their last allowed attempt are failed,
+        and so are their workflows.
+        """
+        now = time.time()
+        lease = lease_seconds or config.queue.lease_seconds
+        await self._fail_expired(now)
+        rows = await self._write_returning(
+            """
+            UPDATE jobs
+            SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                attempts = attempts + 1, updated_at = datetime('now')
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE (status = 'queued' AND available_at <= ?)
+                   OR (status = 'leased' AND lease_expires_at < ?)
+                ORDER BY id
+                LIMIT 1
+            )
+            RETURNING id, workflow_id, payload, attempts, max_attempts
+            """,
+            (owner, now + lease, now, now)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        payload = json.loads(row[2])
+        return LeasedJob(
+            id=row[0],
+            workflow_id=row[1],
+            input_data=payload["input_data"],
+            template_id=payload.get("template_id"),
+            attempts=row[3],
+            max_attempts=row[4]
+        )
+
+    async def heartbeat(
+        self,
+        job_id: int,
+        owner: str,
+        lease_seconds: Optional[float] = None
+    ) -> bool:
+        """Extend a lease; False means the lease was lost to another worker."""
+        lease = lease_seconds or config.queue.lease_seconds
+        cursor = await self._write(
+            """
+            UPDATE jobs SET lease_expires_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (time.time() + lease, job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    async def complete(self, job_id: int, owner: str) -> bool:
+        """Mark a leased job done."""
+        cursor = await self._write(
+            """
+            UPDATE jobs
+            SET status = 'done', lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = datetime('now')
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    async def fail(
+        self,
+        job_id: int,
+        owner: str,
+        error: str,
+        retry_delay: float = 0,
+        retry: bool = True
+    ) -> bool:
+        """Requeue a leased job after ``retry_delay``, or fail it for good
+        once it has used all its attempts (at once if ``retry`` is False)."""
+        cursor = await self._write(
+            """
+            UPDATE jobs
+            SET status = CASE WHEN ? OR attempts >= max_attempts
+                              THEN 'failed' ELSE 'queued' END,
+                available_at = ?, last_error = ?, lease_owner = NULL,
+                lease_expires_at = NULL, updated_at = datetime('now')
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (not retry, time.time() + retry_delay, error, job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    async def release(self, job_id: int, owner: str) -> bool:
+        """Hand a leased job back without counting the attempt (shutdown)."""
+        cursor = await self._write(
+            """
+            UPDATE jobs
+            SET status = 'queued', attempts = MAX(attempts - 1, 0),
+                lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = datetime('now')
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    async def depth(self) -> int:
+        """Number of jobs waiting to be claimed."""
+        if self._conn is None:
+            await self.connect()
+        async with self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else 0
+
+
+# Shared queue used by the API when JOB_BACKEND=durable.
+job_queue = JobQueue()
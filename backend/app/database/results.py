@@ -0,0 +1,193 @@
+"""
+Workflow result storage for FluxoX.
+
+Results live in the `workflow_results` table instead of inline on the
+`workflows` row, compressed with zstd when the `zstandard` package is
+installed and zlib otherwise. Results larger than `result_spill_bytes`
+are written to content-addressed files under `results_dir` and streamed
+back through mmap without being loaded whole. Nothing is decoded until
+a single flow's result is requested. Encoding, compression and file
+writes run in a worker thread, off the event loop.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import zlib
+from typing import Any, Iterator, Optional, Tuple
+
+from app.config import config
+from app.database import db
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _compress(raw: bytes) -> tuple:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(raw)
+    return "zlib", zlib.compress(raw, config.database.result_compression_level)
+
+
+def _encode(result: Any) -> Tuple[bytes, str, bytes]:
+    """(raw JSON, codec, compressed bytes) of a result."""
+    raw = json.dumps(result).encode()
+    return (raw, *_compress(raw))
+
+
+def _decompressor(codec: str):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(
+                "Result is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if codec == "zlib":
+        return zlib.decompressobj()
+    raise ValueError(f"Unknown result codec: {codec}")
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    decompressor = _decompressor(codec)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+class ResultStore:
+    """Saves, loads and streams compressed workflow results."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        spill_bytes: Optional[int] = None
+    ):
+        database = config.database
+        self.directory = directory or database.results_dir
+        self.spill_bytes = (
+            spill_bytes if spill_bytes is not None
+            else database.result_spill_bytes
+        )
+        # Spill files are shared by content; guards "is it still referenced?"
+        # checks against saves that are about to reference the same file
+        self._files = asyncio.Lock()
+
+    def _write_file(self, digest: str, codec: str, data: bytes) -> str:
+        path = os.path.join(self.directory, digest[:2], f"{digest}.{codec}")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)  # Atomic: readers never see a partial file
+        return path
+
+    async def save(self, workflow_id: str, result: Any) -> None:
+        """Store (or replace) a workflow's result; None clears it."""
+        if result is None:
+            await self.delete(workflow_id)
+            return
+        raw, codec, data = await asyncio.to_thread(_encode, result)
+        if len(raw) <= self.spill_bytes:
+            await self._insert(workflow_id, codec, len(raw), data, None)
+            return
+        # Content-addressed, so identical large results share one file
+        digest = await asyncio.to_thread(
+            lambda: hashlib.sha256(raw).hexdigest())
+        async with self._files:
+            path = await asyncio.to_thread(
+                self._write_file, digest, codec, data)
+            await self._insert(workflow_id, codec, len(raw), None, path)
+
+    async def _insert(
+        self,
+        workflow_id: str,
+        codec: str,
+        size: int,
+        data: Optional[bytes],
+        path: Optional[str]
+    ) -> None:
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO workflow_results
+            (workflow_id, codec, size, stored_size, data, path)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (workflow_id, codec, size,
+             len(data) if data else os.path.getsize(path), data, path)
+        )
+
+    async def info(self, workflow_id: str):
+        """Result metadata (codec, sizes, spill path) without the payload."""
+        return await db.fetch_one(
+            """
+            SELECT codec, size, stored_size, path FROM workflow_results
+            WHERE workflow_id = ?
+            """,
+            (workflow_id,)
+        )
+
+    async def load(self, workflow_id: str) -> Optional[Any]:
+        """Decode an inline result; spilled results must be streamed."""
+        row = await db.fetch_one(
+            """
+            SELECT codec, data, path FROM workflow_results
+            WHERE workflow_id = ?
+            """,
+            (workflow_id,)
+        )
+        if row is None or row["path"]:
+            return None
+        return json.loads(_decompress(row["codec"], row["data"]))
+
+    async def stream(self, workflow_id: str) -> Optional[Iterator[bytes]]:
+        """Iterator over the result's JSON bytes, or None if there is none."""
+        row = await db.fetch_one(
+            """
+            SELECT codec, data, path FROM workflow_results
+            WHERE workflow_id = ?
+            """,
+            (workflow_id,)
+        )
+        if row is None:
+            return None
+        if row["path"]:
+            return _stream_file(row["path"], row["codec"])
+        return iter([_decompress(row["codec"], row["data"])])
+
+    async def delete(self, workflow_id: str) -> None:
+        """Drop a result, removing its file once nothing references it."""
+        row = await self.info(workflow_id)
+        await db.execute(
+            "DELETE FROM workflow_results WHERE workflow_id = ?",
+            (workflow_id,))
+        if row is not None and row["path"]:
+            async with self._files:
+                shared = await db.fetch_val(
+                    "SELECT COUNT(*) FROM workflow_results WHERE path = ?",
+                    (row["path"],))
+                if not shared and os.path.exists(row["path"]):
+                    os.remove(row["path"])
+
+
+def _stream_file(path: str, codec: str) -> Iterator[bytes]:
+    """Decompress a spilled result chunk by chunk from a memory map."""
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        decompressor = _decompressor(codec)
+        for offset in range(0, len(mapped), CHUNK_SIZE):
+            chunk = decompressor.decompress(mapped[offset:offset + CHUNK_SIZE])
+            if chunk:
+                yield chunk
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+# Shared store used by the job runner and the flow endpoints.
+result_store = ResultStore()
@@ -0,0 +1,163 @@
+"""
+Group-commit writer for FluxoX.
+
+All writes from `Database.execute` are queued to one writer coroutine
+that owns a dedicated SQLite connection. It drains whatever is queued
+(up to `writer_batch_size` statements) into a single transaction, so
+concurrent status updates share one commit and one fsync instead of
+contending for SQLite's write lock. Each statement runs under its own
+savepoint, so a failing statement only fails its own caller. The writer
+connection runs with `synchronous = FULL`, so a write reported as
+committed has been fsynced; batching keeps that to one fsync per commit.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# Overrides of DatabaseConfig.pragmas: fsync every (group) commit
+WRITER_PRAGMAS = {"synchronous": "FULL"}
+
+# (query, values, future); a list of value tuples runs as executemany
+Write = Tuple[str, Union[tuple, List[tuple]], Optional[asyncio.Future]]
+
+
+class GroupCommitWriter:
+    """Single writer batching queued statements into group commits."""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: Optional[int] = None,
+        pragmas: Optional[Dict[str, object]] = None
+    ):
+        self.path = path
+        database = config.database
+        self.batch_size = (
+            batch_size if batch_size is not None
+            else database.writer_batch_size)
+        self.pragmas = {
+            **(pragmas if pragmas is not None else database.pragmas),
+            **WRITER_PRAGMAS}
+        self.commits = 0
+        self.statements = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the writer task is running."""
+        return self._task is not None
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            self._conn.execute(f"PRAGMA {name} = {value}")
+
+    async def start(self) -> None:
+        """Open the writer connection and start the writer task."""
+        if self.started:
+            return
+        # One thread owns the connection; every batch runs on it
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="db-writer")
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._open)
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Database writer started")
+
+    async def close(self) -> None:
+        """Flush queued writes, then stop the writer."""
+        if not self.started:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._task = self._queue = self._conn = self._executor = None
+        logger.info(
+            f"Database writer closed ({self.statements} writes "
+            f"in {self.commits} commits)")
+
+    async def submit(
+        self,
+        query: str,
+        values: Union[tuple, List[tuple]] = (),
+        wait: bool = True
+    ) -> None:
+        """Queue a write (a list of rows for executemany); with wait=True
+        return once it has been committed."""
+        future = asyncio.get_running_loop().create_future() if wait else None
+        self._queue.put_nowait((query, values, future))
+        if future is not None:
+            await future
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far has been committed."""
+        if self.started:
+            await self._queue.join()
+
+    def _commit(self, batch: List[Write]) -> List[Optional[Exception]]:
+        """Run a batch in one transaction (on the writer thread)."""
+        conn = self._conn
+        errors: List[Optional[Exception]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for query, values, _ in batch:
+                conn.execute("SAVEPOINT write")
+                try:
+                    if isinstance(values, list):
+                        conn.executemany(query, values)
+                    else:
+                        conn.execute(query, values)
+                    errors.append(None)
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO write")
+                    errors.append(e)
+                conn.execute("RELEASE write")
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return [e] * len(batch)
+        return errors
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                errors = await loop.run_in_executor(
+                    self._executor, self._commit, batch)
+            except Exception as e:
+                errors = [e] * len(batch)
+            self.commits += 1
+            self.statements += len(batch)
+            for (query, _, future), error in zip(batch, errors):
+                if future is None:
+                    if error is not None:
+                        logger.error(
+                            f"Unawaited write failed: {error} "
+                            f"({query.split()[0]})")
+                elif not future.done():
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+                self._queue.task_done()
@@ -0,0 +1,57 @@
+"""
+Per-run budgets for FluxoX flows.
+
+A run may use at most `max_iterations` approval rounds (a rejected step
+is sent back for revision until the approver agrees or the rounds run
+out), at most `max_agent_calls` agent invocations (every attempt counts;
+step-cache hits are free) and at most `max_seconds` of wall-clock time.
+Exceeding a budget ends the run early with an error result.
+"""
+
+# Author: theyashdhiman04
+
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import config
+
+
+class BudgetExceededError(Exception):
+    """Raised when a run exhausts one of its budgets."""
+
+    def __init__(self, budget: str, limit: float, used: float):
+        super().__init__(f"Workflow exceeded its {budget} budget of {limit}")
+        self.budget = budget
+        self.limit = limit
+        self.used = used
+
+
+@dataclass
+class FlowBudget:
+    """Limits for a single flow run."""
+
+    max_iterations: int = 3  # Approval rounds, including the first
+    max_agent_calls: Optional[int] = None  # None: unlimited
+    max_seconds: Optional[float] = None  # None: WorkflowConfig.timeout_seconds
+
+    @classmethod
+    def from_config(cls) -> "FlowBudget":
+        """Build the budget from WorkflowConfig."""
+        workflow = config.workflow
+        return cls(
+            max_iterations=workflow.max_iterations,
+            max_agent_calls=workflow.max_agent_calls
+        )
+
+    @property
+    def seconds(self) -> float:
+        """Wall-clock limit of the run."""
+        if self.max_seconds is not None:
+            return self.max_seconds
+        return config.workflow.timeout_seconds
+
+    def charge_call(self, calls: int) -> None:
+        """Check the agent-call budget before call number `calls` runs."""
+        if self.max_agent_calls is not None and calls > self.max_agent_calls:
+            raise BudgetExceededError(
+                "agent call", self.max_agent_calls, calls)
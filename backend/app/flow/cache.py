@@ -0,0 +1,138 @@
+"""
+Step-result memoization for FluxoX flows.
+
+Agents that are pure functions of their input (`Agent.cacheable`) have
+their step results cached under a content address: the SHA-256 of the
+canonical JSON of the agent's identity (class, name, description and
+any model settings it reports) and the step input. Identical steps
+across runs and workflows then reuse the earlier result instead of
+calling the agent again.
+
+The first tier is an in-process LRU with a TTL. Optionally, entries are
+also written to the `step_cache` table so they survive restarts and are
+shared with worker processes; the table is consulted on memory misses.
+Results are stored as JSON text, so every hit hands out a fresh copy.
+"""
+
+# Author: theyashdhiman04
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import config
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+
+def step_key(agent, payload: Dict[str, Any]) -> Optional[str]:
+    """Content address of an agent call, or None if the input is not JSON."""
+    try:
+        canonical = json.dumps(
+            {"agent": agent.cache_identity, "input": payload},
+            sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class StepCache:
+    """In-memory LRU + TTL cache of step results, optionally in SQLite too."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        persist: Optional[bool] = None,
+        enabled: Optional[bool] = None
+    ):
+        workflow = config.workflow
+        self.max_entries = (
+            max_entries if max_entries is not None
+            else workflow.step_cache_size
+        )
+        self.ttl = ttl if ttl is not None else workflow.step_cache_ttl_seconds
+        self.persist = (
+            persist if persist is not None else workflow.step_cache_persist)
+        self.enabled = enabled if enabled is not None else workflow.step_cache
+        # key -> (expires_at, result JSON); least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.time():
+            del self._entries[key]
+            entry = None
+        if entry is None and self.persist:
+            row = await db.fetch_one(
+                "SELECT expires_at, result FROM step_cache "
+                "WHERE key = ? AND expires_at > ?",
+                (key, time.time()))
+            if row is not None:
+                entry = (row["expires_at"], row["result"])
+                self._remember(key, entry)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return json.loads(entry[1])
+
+    async def put(self, key: str, result: Any) -> None:
+        try:
+            encoded = json.dumps(result)
+        except (TypeError, ValueError):
+            return  # Not JSON-safe; leave it uncached
+        entry = (time.time() + self.ttl, encoded)
+        self._remember(key, entry)
+        if self.persist:
+            # Best effort and off the step's critical path
+            await db.execute(
+                "INSERT OR REPLACE INTO step_cache (key, expires_at, result) "
+                "VALUES (?, ?, ?)",
+                (key, entry[0], entry[1]), wait=False)
+
+    async def call(
+        self,
+        agent,
+        payload: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Return (result, "hit" | "miss"), running `compute` on a miss.
+
+        The status is None when the agent or input is not cacheable.
+        """
+        key = None
+        if self.enabled and agent.cacheable:
+            key = step_key(agent, payload)
+        if key is None:
+            return await compute(), None
+        cached = await self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, "hit"
+        self.misses += 1
+        result = await compute()
+        await self.put(key, result)
+        return result, "miss"
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Shared by every engine in the process
+step_cache = StepCache()
@@ -8,16 +8,31 @@ mock or LangGraph-backed runs.
 # Author: theyashdhiman04
 
 from typing import Dict, Any, List, Optional
-from langgraph.graph import StateGraph, Graph
 from pydantic import BaseModel
+import asyncio
+import json
 import logging
+import time
 from datetime import datetime
 
+from app.agents.base import RunContext
 from app.agents.researcher import ResearcherAgent
 from app.agents.processor import ProcessorAgent
 from app.agents.approver import ApproverAgent
 from app.agents.optimizer import OptimizerAgent
 from app.config import config
+from app.database.executions import execution_recorder
+from app.flow.budget import BudgetExceededError, FlowBudget
+from app.flow.cache import step_cache
+from app.flow.graph import build_graph, run_graph
+from app.monitoring.metrics import (
+    AGENT_LATENCY, WORKFLOW_DURATION, WORKFLOWS_TOTAL
+)
+from app.flow.retry import StepPolicy, StepTimeoutError
+from app.flow.scheduler import DagScheduler, FlowStep, StepCallback
+from app.flow.templates import (
+    DEFAULT_TEMPLATE_ID, get_template, step_input, steps_from_template
+)
 
 logging.basicConfig(
     level=getattr(logging, config.logging.level),
@@ -25,6 +40,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Failures a retry would only repeat (unknown template, bad input, budgets)
+PERMANENT_ERRORS = (BudgetExceededError, ValueError)
+
+
+def _json_size(value: Any) -> Optional[int]:
+    """Serialized size of a payload in bytes, for execution records."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return None
+
 
 class FlowState(BaseModel):
     """State for a single flow run."""
@@ -36,115 +62,213 @@ class FlowState(BaseModel):
 
 
 class FlowEngine:
-    """Runs the agent pipeline (research → process → approve → optimize)."""
+    """Runs agent step graphs (by default research → process → approve →
+    optimize).
+
+    Each run gets its own RunContext, so one engine (and its agents) can
+    execute many workflows concurrently.
+    """
 
     def __init__(self, use_mock: Optional[bool] = None):
         self.researcher = ResearcherAgent()
         self.processor = ProcessorAgent()
         self.approver = ApproverAgent()
         self.optimizer = OptimizerAgent()
-        self.graph = self._build_graph()
+        self.agents = {
+            "researcher": self.researcher,
+            "processor": self.processor,
+            "approver": self.approver,
+            "optimizer": self.optimizer
+        }
+        self.policy = StepPolicy.from_config()
+        self.budget = FlowBudget.from_config()
         self.use_mock = use_mock if use_mock is not None else config.workflow.use_mock
+        # Compiled graphs per template; None for templates LangGraph can't
+        # express
+        self.graph = self._build_graph()
+        self._graphs = {DEFAULT_TEMPLATE_ID: self.graph}
+        # Detected once here rather than on every run
+        self.native_graph = callable(getattr(self.graph, "astream", None))
 
         if self.use_mock:
             logger.warning(
                 f"Using mock flow execution in {config.environment} environment.")
-        else:
+        elif self.native_graph:
             logger.info(
                 f"Using LangGraph flow execution in {config.environment} environment.")
+        else:
+            logger.warning(
+                "Installed LangGraph has no async streaming API; "
+                "running flows on the in-process scheduler.")
+
+    def _build_graph(self, template_id: Optional[str] = None):
+        """Compile a template's step graph for LangGraph (None if
+        unsupported)."""
+        return build_graph(steps_from_template(template_id))
+
+    def _graph_for(self, template_id: Optional[str]):
+        key = template_id or DEFAULT_TEMPLATE_ID
+        if key not in self._graphs:
+            self._graphs[key] = self._build_graph(key)
+        return self._graphs[key]
+
+    def _scheduler(
+        self,
+        input_data: Dict[str, Any],
+        context: RunContext,
+        on_step: Optional[StepCallback],
+        budget: FlowBudget
+    ) -> DagScheduler:
+        """Step executor for one run, shared by both backends.
+
+        Steps run under the engine's StepPolicy (timeouts, retries,
+        hedging), the step cache and the run's agent-call budget. Each
+        finished step's entry records its ``iteration`` (how many times
+        the step has completed in this run) and is passed to ``on_step``.
+        """
+        started = time.perf_counter()
+        # Per-step fields merged into history
+        extras: Dict[str, Dict[str, Any]] = {}
+        runs: Dict[str, int] = {}
+        calls = 0
+        measure = config.workflow.record_executions
+
+        async def run_step(
+            step: FlowStep, completed: Dict[str, Any]
+        ) -> Dict[str, Any]:
+            agent = self.agents[step.agent]
+            payload = step_input(
+                step, input_data, completed, time.perf_counter() - started)
+
+            async def invoke() -> Dict[str, Any]:
+                nonlocal calls
+                calls += 1
+                budget.charge_call(calls)
+                called = time.perf_counter()
+                try:
+                    result = await agent.process(payload, context)
+                except Exception:
+                    AGENT_LATENCY.observe(
+                        time.perf_counter() - called, step.agent, "error")
+                    raise
+                AGENT_LATENCY.observe(
+                    time.perf_counter() - called, step.agent, "ok")
+                return result
+
+            result, cache = await step_cache.call(agent, payload, invoke)
+            fields = extras.setdefault(step.name, {})
+            if cache is not None:
+                fields["cache"] = cache
+            if measure:
+                fields["input_bytes"], fields["output_bytes"] = (
+                    _json_size(payload), _json_size(result))
+            return result
 
-    def _build_graph(self) -> Graph:
-        """Build the agent graph."""
-        flow = StateGraph(FlowState)
-        flow.add_node("research", self.researcher.process)
-        flow.add_node("process", self.processor.process)
-        flow.add_node("approve", self.approver.process)
-        flow.add_node("optimize", self.optimizer.process)
-        flow.add_edge("research", "process")
-        flow.add_edge("process", "approve")
-
-        def approval_router(state: Dict) -> str:
-            return "optimize" if state.get("approved", False) else "process"
-
-        flow.add_conditional_edges(
-            "approve",
-            approval_router,
-            {"optimize": "optimize", "process": "process"}
+        async def step_done(entry: Dict[str, Any]) -> None:
+            entry.update(extras.pop(entry["step"], {}))
+            name = entry["step"]
+            runs[name] = entry["iteration"] = runs.get(name, 0) + 1
+            if on_step is not None:
+                await on_step(entry)
+
+        return DagScheduler(run_step, self.policy, step_done)
+
+    async def _run_langgraph(
+        self,
+        graph,
+        workflow_id: str,
+        input_data: Dict[str, Any],
+        template_id: Optional[str],
+        history: List[Dict[str, Any]],
+        deadline: float,
+        on_step: Optional[StepCallback],
+        budget: FlowBudget
+    ) -> FlowState:
+        """Run the compiled graph with its async streaming API.
+
+        Raises BudgetExceededError if the approval rounds ran out.
+        """
+        steps = {step.name: step for step in steps_from_template(template_id)}
+        scheduler = self._scheduler(
+            input_data, RunContext(workflow_id=workflow_id), on_step, budget)
+
+        async def execute(step: FlowStep, completed: Dict[str, Any]) -> Any:
+            return await scheduler.execute_step(
+                step, completed, history, deadline)
+
+        results, current = await run_graph(
+            graph, list(steps.values()), execute, budget)
+
+        return FlowState(
+            workflow_id=workflow_id,
+            current_step=current,
+            data={step.output_key or name: results[name]
+                  for name, step in steps.items() if name in results},
+            history=history
         )
-        flow.set_entry_point("research")
-        flow.set_finish_point("optimize")
-        return flow.compile()
 
-    async def _run_langgraph(self, workflow_id: str, input_data: Dict[str, Any]) -> FlowState:
-        """Execute using LangGraph."""
-        try:
-            initial = FlowState(workflow_id=workflow_id, data=input_data)
-            if hasattr(self.graph, 'arun'):
-                return await self.graph.arun(initial)
-            raise RuntimeError("LangGraph version does not support 'arun' method")
-        except Exception as e:
-            logger.error(f"LangGraph execution failed: {str(e)}")
-            raise
-
-    async def _run_mock(self, workflow_id: str, input_data: Dict[str, Any]) -> FlowState:
-        """Simulate full pipeline without LangGraph."""
-        logger.info(f"Using mock flow execution for {workflow_id}")
-        ts = datetime.now().isoformat()
-
-        research_results = await self.researcher.process(input_data)
-        process_input = {
-            "task": "Process research findings",
-            "research_findings": research_results,
-            "parameters": input_data.get("constraints", {})
-        }
-        process_results = await self.processor.process(process_input)
-        approval_input = {
-            "result": process_results,
-            "criteria": {"quality_threshold": 0.8}
-        }
-        approval_results = await self.approver.process(approval_input)
-        optimization_input = {
-            "workflow_results": {
-                "research": research_results,
-                "process": process_results,
-                "approval": approval_results
-            },
-            "performance_metrics": {"execution_time": 1.5, "success_rate": 1.0}
-        }
-        optimization_results = await self.optimizer.process(optimization_input)
+    async def _run_mock(
+        self,
+        workflow_id: str,
+        input_data: Dict[str, Any],
+        template_id: Optional[str] = None,
+        history: Optional[List[Dict[str, Any]]] = None,
+        deadline: Optional[float] = None,
+        on_step: Optional[StepCallback] = None,
+        budget: Optional[FlowBudget] = None
+    ) -> FlowState:
+        """Run the template's step graph on the in-process DAG scheduler.
 
-        mock_data = {
-            "research_results": research_results,
-            "processed_data": process_results,
-            "approval": approval_results,
-            "optimization": optimization_results
-        }
+        Entries of finished steps are appended to ``history``.
+        """
+        logger.debug(f"Running {workflow_id} on the in-process scheduler")
+        steps = steps_from_template(template_id)
+        scheduler = self._scheduler(
+            input_data, RunContext(workflow_id=workflow_id), on_step,
+            budget or self.budget)
+        results, history = await scheduler.run(steps, history, deadline)
 
         return FlowState(
             workflow_id=workflow_id,
-            current_step="optimize",
-            data=mock_data,
-            history=[
-                {"step": "research", "timestamp": ts},
-                {"step": "process", "timestamp": ts},
-                {"step": "approve", "timestamp": ts},
-                {"step": "optimize", "timestamp": ts}
-            ]
+            current_step=history[-1]["step"] if history else "start",
+            data={step.output_key or step.name: results[step.name]
+                  for step in steps},
+            history=history
         )
 
-    async def execute_workflow(self, workflow_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Run the flow for the given workflow id and input."""
-        initial_state = FlowState(workflow_id=workflow_id, data=input_data)
-        try:
-            if self.use_mock:
-                final_state = await self._run_mock(workflow_id, input_data)
-            else:
-                try:
-                    final_state = await self._run_langgraph(workflow_id, input_data)
-                except Exception as e:
-                    logger.warning(f"LangGraph failed, falling back to mock: {str(e)}")
-                    final_state = await self._run_mock(workflow_id, input_data)
+    async def execute_workflow(
+        self,
+        workflow_id: str,
+        input_data: Dict[str, Any],
+        template_id: Optional[str] = None,
+        on_step: Optional[StepCallback] = None,
+        budget: Optional[FlowBudget] = None
+    ) -> Dict[str, Any]:
+        """Run the flow for the given workflow id and input.
 
+        Args:
+            workflow_id: Id of the workflow run
+            input_data: Input passed to the entry steps
+            template_id: Flow template whose step graph to run (the default
+                research → process → approve → optimize pipeline if omitted)
+            on_step: Coroutine awaited with each step's history entry as
+                the step finishes
+            budget: Iteration, agent-call and wall-clock limits of this
+                run (the engine's budget from config if omitted)
+        """
+        history: List[Dict[str, Any]] = []
+        budget = budget or self.budget
+        timeout = budget.seconds
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        try:
+            final_state = await asyncio.wait_for(
+                self._run(workflow_id, input_data, template_id,
+                          history, deadline, on_step, budget),
+                timeout
+            )
+            self._record(workflow_id, input_data, template_id, "completed",
+                         started, final_state.history)
             return {
                 "workflow_id": workflow_id,
                 "status": "completed",
@@ -152,10 +276,78 @@ class FlowEngine:
                 "history": final_state.history
             }
         except Exception as e:
-            logger.error(f"Error executing flow: {str(e)}")
+            error = str(e)
+            if (isinstance(e, TimeoutError)
+                    and not isinstance(e, StepTimeoutError)):
+                error = f"Workflow exceeded its {timeout}s deadline"
+                history.append({
+                    "step": "workflow",
+                    "status": "timeout",
+                    "timeout": timeout,
+                    "timestamp": datetime.now().isoformat()
+                })
+            elif isinstance(e, BudgetExceededError):
+                history.append({
+                    "step": "workflow",
+                    "status": "budget_exceeded",
+                    "budget": e.budget,
+                    "limit": e.limit,
+                    "used": e.used,
+                    "timestamp": datetime.now().isoformat()
+                })
+            logger.error(f"Error executing flow: {error}")
+            self._record(workflow_id, input_data, template_id, "error",
+                         started, history, error)
             return {
                 "workflow_id": workflow_id,
                 "status": "error",
-                "error": str(e),
-                "history": initial_state.history
+                "error": error,
+                "history": history,
+                "retryable": not isinstance(e, PERMANENT_ERRORS)
             }
+
+    def _record(
+        self,
+        workflow_id: str,
+        input_data: Dict[str, Any],
+        template_id: Optional[str],
+        status: str,
+        started: float,
+        history: List[Dict[str, Any]],
+        error: Optional[str] = None
+    ) -> None:
+        """Update run metrics and hand the run to the execution recorder
+        (buffered, non-blocking)."""
+        elapsed = time.perf_counter() - started
+        template = template_id or DEFAULT_TEMPLATE_ID
+        if get_template(template) is None:
+            template = "unknown"  # Keep label cardinality bounded
+        WORKFLOWS_TOTAL.inc(template, status)
+        WORKFLOW_DURATION.observe(elapsed, template, status)
+        if config.workflow.record_executions:
+            execution_recorder.record(
+                workflow_id, template_id, status, elapsed,
+                history, _json_size(input_data), error)
+
+    async def _run(
+        self,
+        workflow_id: str,
+        input_data: Dict[str, Any],
+        template_id: Optional[str],
+        history: List[Dict[str, Any]],
+        deadline: float,
+        on_step: Optional[StepCallback],
+        budget: FlowBudget
+    ) -> FlowState:
+        """Run on LangGraph when enabled and the template maps onto a graph,
+        otherwise on the in-process scheduler."""
+        graph = None
+        if not self.use_mock and self.native_graph:
+            graph = self._graph_for(template_id)
+        if graph is None:
+            return await self._run_mock(
+                workflow_id, input_data, template_id, history, deadline,
+                on_step, budget)
+        return await self._run_langgraph(
+            graph, workflow_id, input_data, template_id, history, deadline,
+            on_step, budget)
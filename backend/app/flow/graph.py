@@ -0,0 +1,160 @@
+"""
+LangGraph backend for FluxoX flows.
+
+Compiles a template's step graph into a LangGraph state graph whose
+nodes run steps through the engine's step executor (so timeouts,
+retries, the step cache and history entries behave exactly as on the
+in-process scheduler). Approver steps become conditional edges: an
+approval continues to the approver's dependent, a rejection routes back
+to the step it reviewed, which reruns with the latest results, until
+the run's approval rounds (`max_iterations`) are used up.
+
+State is updated only through reducers: `results` merges each node's
+output by step name (a rerun replaces the earlier result), `iterations`
+counts approval rounds, `approved` holds the latest decision and
+`review` the feedback a revised step receives.
+
+Templates whose steps fan in (a step with several dependencies) have no
+LangGraph equivalent without join nodes; `build_graph` returns None for
+them and the engine runs them on the DAG scheduler instead.
+"""
+
+# Author: theyashdhiman04
+
+import operator
+from typing import (
+    Annotated, Any, Awaitable, Callable, Dict, List, Optional, Tuple,
+    TypedDict
+)
+
+from langgraph.graph import END, StateGraph
+
+from app.flow.budget import BudgetExceededError, FlowBudget
+from app.flow.scheduler import FlowStep
+from app.flow.templates import REVIEW_KEY
+
+# Called by each node with (step, results so far); supplied per run
+StepExecutor = Callable[[FlowStep, Dict[str, Any]], Awaitable[Any]]
+
+
+def _merge(
+    current: Optional[Dict[str, Any]],
+    update: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {**(current or {}), **(update or {})}
+
+
+class GraphState(TypedDict):
+    """Channels of a flow run in LangGraph."""
+    execute: StepExecutor
+    results: Annotated[Dict[str, Any], _merge]
+    approved: bool
+    review: Any  # Feedback of the latest rejection, None once approved
+    iterations: Annotated[int, operator.add]
+    max_iterations: int  # Approval rounds allowed
+
+
+def supports(steps: List[FlowStep]) -> bool:
+    """Whether the steps map onto a LangGraph graph (see module docstring)."""
+    roots = [step for step in steps if not step.depends_on]
+    if len(roots) != 1 or any(len(step.depends_on) > 1 for step in steps):
+        return False
+    for step in steps:
+        dependents = [s for s in steps if step.name in s.depends_on]
+        if step.agent == "approver" and len(dependents) > 1:
+            return False
+    return True
+
+
+def _node(step: FlowStep):
+    async def node(state: GraphState) -> Dict[str, Any]:
+        completed = dict(state["results"])
+        if state.get("review") is not None:
+            completed[REVIEW_KEY] = state["review"]
+        result = await state["execute"](step, completed)
+        update: Dict[str, Any] = {"results": {step.name: result}}
+        if step.agent == "approver":
+            decision = result if isinstance(result, dict) else {}
+            approved = bool(decision.get("approved"))
+            update["approved"] = approved
+            update["review"] = (
+                None if approved else decision.get("feedback") or "rejected")
+            update["iterations"] = 1
+        return update
+    return node
+
+
+def approval_router(state: GraphState) -> str:
+    """Continue after an approval; send rejected work back for revision
+    while approval rounds remain, otherwise stop."""
+    if state.get("approved"):
+        return "continue"
+    if state["iterations"] >= state["max_iterations"]:
+        return "exhausted"
+    return "revise"
+
+
+def build_graph(steps: List[FlowStep]):
+    """Compile the steps into a LangGraph graph, or None if unsupported."""
+    if not supports(steps):
+        return None
+    flow = StateGraph(GraphState)
+    for step in steps:
+        flow.add_node(step.name, _node(step))
+
+    for step in steps:
+        dependents = [s.name for s in steps if step.name in s.depends_on]
+        if step.agent == "approver" and step.depends_on:
+            flow.add_conditional_edges(
+                step.name,
+                approval_router,
+                {"continue": dependents[0] if dependents else END,
+                 "revise": step.depends_on[0],
+                 "exhausted": END}
+            )
+        elif dependents:
+            for dependent in dependents:
+                flow.add_edge(step.name, dependent)
+        else:
+            flow.add_edge(step.name, END)
+
+    flow.set_entry_point(
+        next(step.name for step in steps if not step.depends_on))
+    return flow.compile()
+
+
+async def run_graph(
+    graph,
+    steps: List[FlowStep],
+    execute: StepExecutor,
+    budget: FlowBudget
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Stream one run of a compiled graph.
+
+    Returns (results by step name, last step run). Raises
+    BudgetExceededError if the approval rounds ran out before the
+    approver agreed.
+    """
+    names = {step.name for step in steps}
+    results: Dict[str, Any] = {}
+    current, review, iterations = "start", None, 0
+    initial = {"execute": execute, "results": {}, "approved": False,
+               "review": None, "iterations": 0,
+               "max_iterations": budget.max_iterations}
+    # Backstop only: the approval router ends the loop well before this
+    limit = len(steps) * (budget.max_iterations + 1)
+    async for chunk in graph.astream(initial, {"recursion_limit": limit}):
+        for node, update in chunk.items():
+            if node not in names or not update:
+                continue
+            current = node
+            results.update(update.get("results", {}))
+            if "approved" in update:
+                review = update["review"]
+                iterations += update["iterations"]
+
+    if review is not None:
+        raise BudgetExceededError(
+            "iteration", budget.max_iterations, iterations)
+    return results, current
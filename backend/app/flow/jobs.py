@@ -0,0 +1,183 @@
+"""
+Background workflow jobs for FluxoX.
+
+`run_workflow_job` runs a persisted workflow and records its status
+transitions (pending → running → completed/error) and step progress.
+A failed attempt that will be retried puts the workflow back to pending
+instead of recording the error.
+`JobWorkerPool` drains an in-process queue of such jobs so POST /flows
+can answer 202 Accepted immediately.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.config import config
+from app.database import db
+from app.database.results import result_store
+from app.flow.pool import engine_pool
+from app.flow.templates import steps_from_template
+
+logger = logging.getLogger(__name__)
+
+
+async def run_workflow_job(
+    workflow_id: str,
+    input_data: Dict[str, Any],
+    template_id: Optional[str] = None,
+    final_attempt: bool = True
+) -> Dict[str, Any]:
+    """Run a workflow whose row already exists, updating it as it goes.
+
+    With ``final_attempt`` False (the job queue will retry), a retryable
+    failure leaves the workflow pending rather than in error.
+    """
+    try:
+        total_steps = len(steps_from_template(template_id))
+    except ValueError:
+        total_steps = 0
+    finished_steps = 0
+
+    async def report_progress(entry: Dict[str, Any]) -> None:
+        nonlocal finished_steps
+        finished_steps += 1
+        progress = finished_steps / total_steps if total_steps else 0
+        await db.execute(
+            """
+            UPDATE workflows
+            SET current_step = ?, progress = MAX(COALESCE(progress, 0), ?),
+                updated_at = datetime('now')
+            WHERE id = ?
+            """,
+            (entry["step"], min(progress, 1.0), workflow_id),
+            wait=False  # Best-effort; the final status write below is awaited
+        )
+
+    try:
+        await db.execute(
+            """
+            UPDATE workflows
+            SET status = 'running', updated_at = datetime('now')
+            WHERE id = ?
+            """,
+            (workflow_id,)
+        )
+        async with engine_pool.lease() as engine:
+            result = await engine.execute_workflow(
+                workflow_id, input_data, template_id, on_step=report_progress)
+    except Exception as e:
+        logger.error(f"Error running workflow {workflow_id}: {str(e)}")
+        result = {"workflow_id": workflow_id, "status": "error",
+                  "error": str(e), "history": [], "retryable": True}
+
+    if (result["status"] != "completed" and not final_attempt
+            and result.get("retryable", True)):
+        await db.execute(
+            """
+            UPDATE workflows
+            SET status = 'pending', updated_at = datetime('now')
+            WHERE id = ?
+            """,
+            (workflow_id,)
+        )
+        return result
+
+    await result_store.save(workflow_id, result.get("result"))
+    await db.execute(
+        """
+        UPDATE workflows
+        SET status = ?, error = ?,
+            progress = CASE WHEN ? = 'completed' THEN 1 ELSE progress END,
+            updated_at = datetime('now')
+        WHERE id = ?
+        """,
+        (result["status"], result.get("error"), result["status"], workflow_id)
+    )
+    return result
+
+
+@dataclass
+class WorkflowJob:
+    """A queued workflow run."""
+
+    workflow_id: str
+    input_data: Dict[str, Any]
+    template_id: Optional[str] = None
+
+
+class JobWorkerPool:
+    """In-process workers draining a bounded queue of workflow jobs."""
+
+    def __init__(
+        self, workers: Optional[int] = None, max_queue: Optional[int] = None
+    ):
+        workflow = config.workflow
+        self.workers = workers if workers is not None else workflow.job_workers
+        self.max_queue = (
+            max_queue if max_queue is not None else workflow.job_queue_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        """Whether the workers are running."""
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting to be picked up."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the worker tasks on the running loop."""
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.create_task(self._worker(i))
+            for i in range(max(1, self.workers))
+        ]
+        logger.info(
+            f"Job worker pool started with {len(self._tasks)} worker(s)")
+
+    async def close(self) -> None:
+        """Stop the workers; queued jobs that never started stay pending."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.depth:
+            logger.warning(
+                f"Job worker pool closed with {self.depth} queued job(s)")
+        self._tasks = []
+        self._queue = None
+
+    async def submit(self, job: WorkflowJob) -> None:
+        """Queue a job; raises asyncio.QueueFull when the queue is full."""
+        if not self.started:
+            await self.start()
+        self._queue.put_nowait(job)
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await run_workflow_job(
+                    job.workflow_id, job.input_data, job.template_id)
+            except Exception as e:
+                logger.error(
+                    f"Worker {number} failed job {job.workflow_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+
+# Shared pool used by the API; started and closed by the app lifespan.
+job_pool = JobWorkerPool()
@@ -0,0 +1,82 @@
+"""
+Engine pool for FluxoX.
+
+Keeps a fixed set of long-lived FlowEngine instances so agents and the
+compiled graph are built once at startup. Engines are safe for
+concurrent runs, so leases share them round-robin; how many runs may be
+in flight at once is bounded separately by `max_runs`.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+from app.config import config
+from app.flow.engine import FlowEngine
+
+logger = logging.getLogger(__name__)
+
+
+class EnginePool:
+    """Fixed-size pool of pre-built FlowEngines shared by workflow runs."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        use_mock: Optional[bool] = None,
+        engine_factory: Callable[..., FlowEngine] = FlowEngine,
+        max_runs: Optional[int] = None
+    ):
+        workflow = config.workflow
+        self.size = size if size is not None else workflow.engine_pool_size
+        self.use_mock = use_mock if use_mock is not None else workflow.use_mock
+        self.engine_factory = engine_factory
+        self.max_runs = (
+            max_runs if max_runs is not None
+            else workflow.max_concurrent_runs
+        )
+        self._engines: List[FlowEngine] = []
+        self._next: Optional[Iterator[FlowEngine]] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the engines have been built."""
+        return self._next is not None
+
+    def start(self) -> None:
+        """Build every engine up front (agents and compiled graph)."""
+        if self.started:
+            return
+        self._engines = [
+            self.engine_factory(use_mock=self.use_mock)
+            for _ in range(max(1, self.size))
+        ]
+        self._next = itertools.cycle(self._engines)
+        self._slots = asyncio.Semaphore(max(1, self.max_runs))
+        logger.info(f"Engine pool started with {len(self._engines)} engine(s)")
+
+    async def close(self) -> None:
+        """Drop all engines; the pool can be started again afterwards."""
+        self._engines = []
+        self._next = None
+        self._slots = None
+        logger.info("Engine pool closed")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[FlowEngine]:
+        """Lease the next engine for one run; waits while max_runs are
+        already in flight."""
+        if not self.started:
+            # Outside the app lifespan (scripts, tests) build lazily.
+            self.start()
+        async with self._slots:
+            yield next(self._next)
+
+
+# Shared pool used by the API; started and closed by the app lifespan.
+engine_pool = EnginePool()
@@ -0,0 +1,156 @@
+"""
+Step execution policy for FluxoX flows.
+
+Per-step timeouts, retries with jittered exponential backoff and optional
+hedged attempts for straggling steps, all bounded by the workflow deadline.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import config
+from app.flow.budget import BudgetExceededError
+
+
+class WorkflowTimeoutError(TimeoutError):
+    """Raised when a workflow runs past its deadline."""
+
+
+class StepTimeoutError(TimeoutError):
+    """Raised when every attempt of a step timed out."""
+
+
+@dataclass
+class StepPolicy:
+    """How a single step is attempted."""
+
+    timeout: Optional[float] = None  # Per-attempt timeout in seconds
+    max_retries: int = 0
+    backoff_base: float = 0.1
+    backoff_max: float = 2.0
+    # Launch a duplicate attempt after this long
+    hedge_after: Optional[float] = None
+
+    @classmethod
+    def from_config(cls) -> "StepPolicy":
+        """Build the policy from WorkflowConfig."""
+        workflow = config.workflow
+        return cls(
+            timeout=workflow.step_timeout_seconds,
+            max_retries=workflow.max_retries,
+            backoff_base=workflow.retry_backoff_seconds,
+            backoff_max=workflow.retry_backoff_max_seconds,
+            hedge_after=workflow.hedge_after_seconds
+        )
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter exponential backoff before the given retry (0-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** retry))
+        return random.uniform(0, ceiling)
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _attempt_timeout(
+    policy: StepPolicy,
+    deadline: Optional[float]
+) -> Optional[float]:
+    remaining = _remaining(deadline)
+    if remaining is not None and remaining <= 0:
+        raise WorkflowTimeoutError("Workflow deadline exceeded")
+    if policy.timeout is None:
+        return remaining
+    if remaining is None:
+        return policy.timeout
+    return min(policy.timeout, remaining)
+
+
+async def _hedged(
+    call: Callable[[], Awaitable[Any]],
+    hedge_after: float,
+    report: Dict[str, Any]
+) -> Any:
+    """Run call; if it is still pending after hedge_after, race a duplicate."""
+    primary = asyncio.ensure_future(call())
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        report["hedged"] = True
+        hedge = asyncio.ensure_future(call())
+        pending.add(hedge)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    report["hedge_won"] = task is hedge
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def run_with_policy(
+    call: Callable[[], Awaitable[Any]],
+    policy: StepPolicy,
+    deadline: Optional[float] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """Run call under the policy.
+
+    Args:
+        call: Zero-argument coroutine factory, invoked once per attempt
+        policy: Timeout, retry and hedging settings
+        deadline: Absolute time.monotonic() deadline of the workflow
+
+    Returns:
+        The call's result and a report with attempts, retries, timeouts
+        and hedging. On failure the last error is raised with the report
+        attached as ``error.report``.
+    """
+    report: Dict[str, Any] = {
+        "attempts": 0, "retries": 0, "timeouts": 0, "hedged": False}
+    for attempt in range(policy.max_retries + 1):
+        if attempt:
+            report["retries"] = attempt
+            delay = policy.backoff(attempt - 1)
+            remaining = _remaining(deadline)
+            if remaining is not None and delay >= remaining:
+                error = WorkflowTimeoutError("Workflow deadline exceeded")
+                error.report = report
+                raise error
+            await asyncio.sleep(delay)
+
+        report["attempts"] = attempt + 1
+        try:
+            timeout = _attempt_timeout(policy, deadline)
+            if policy.hedge_after is not None:
+                coro = _hedged(call, policy.hedge_after, report)
+            else:
+                coro = call()
+            return await asyncio.wait_for(coro, timeout), report
+        except (WorkflowTimeoutError, BudgetExceededError) as e:
+            e.report = report
+            raise
+        except asyncio.TimeoutError:
+            report["timeouts"] += 1
+            last_error = StepTimeoutError(
+                f"Step attempt timed out after {timeout:.3f}s")
+        except Exception as e:
+            last_error = e
+        report["last_error"] = str(last_error) or type(last_error).__name__
+
+    last_error.report = report
+    raise last_error
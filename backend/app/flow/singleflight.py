@@ -0,0 +1,77 @@
+"""
+Single-flight execution for FluxoX.
+
+Concurrent requests with the same key share one in-progress call: the
+first caller starts it, later callers await the same task, and the key
+is released as soon as the call finishes, so nothing is cached beyond
+the flight itself. The call runs as its own task, so a caller that
+disconnects does not cancel the run for everyone else.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.flow.templates import DEFAULT_TEMPLATE_ID
+
+
+def execution_key(
+    input_data: Dict[str, Any],
+    template_id: Optional[str]
+) -> Optional[str]:
+    """Key of a workflow run: normalized input plus template, or None if
+    the input is not JSON."""
+    try:
+        canonical = json.dumps(
+            {"template": template_id or DEFAULT_TEMPLATE_ID,
+             "input": input_data},
+            sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        # key -> (owner of the flight, running task)
+        self._flights: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(
+        self,
+        key: str,
+        owner: str,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Run `call` once per in-flight key.
+
+        Returns (result, leader): leader is None for the caller that ran
+        the call, otherwise the owner of the flight it joined.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            leader, task = flight
+            return await asyncio.shield(task), leader
+
+        task = asyncio.ensure_future(call())
+        self._flights[key] = (owner, task)
+        task.add_done_callback(lambda done: self._land(key, done))
+        return await asyncio.shield(task), None
+
+    def _land(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key, (None, None))[1] is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved even if every caller went away
+
+
+# Shared by the execute endpoints
+execution_flights = SingleFlight()
@@ -0,0 +1,168 @@
+"""
+Flow templates for FluxoX.
+
+Each template declares its steps as a graph: a step runs once every step
+listed in its ``depends_on`` has completed, so independent branches (e.g.
+parallel research) execute concurrently.
+"""
+
+# Author: theyashdhiman04
+
+from typing import Any, Dict, List, Optional
+
+from app.flow.scheduler import FlowStep
+
+DEFAULT_TEMPLATE_ID = "data-analysis"
+
+# Key in a step's `completed` results carrying the approver's feedback
+# when the LangGraph backend sends work back for revision
+REVIEW_KEY = "_review"
+
+# Key under which each agent's result is stored in FlowState.data
+AGENT_OUTPUT_KEYS = {
+    "researcher": "research_results",
+    "processor": "processed_data",
+    "approver": "approval",
+    "optimizer": "optimization"
+}
+
+
+def _pipeline(
+    research: str, process: str, approve: str, optimize: str
+) -> List[Dict[str, Any]]:
+    """The linear research → process → approve → optimize pipeline."""
+    return [
+        {"id": "research", "name": "Research", "agent": "Researcher",
+            "description": research, "depends_on": []},
+        {"id": "process", "name": "Process", "agent": "Processor",
+            "description": process, "depends_on": ["research"]},
+        {"id": "approve", "name": "Approve", "agent": "Approver",
+            "description": approve, "depends_on": ["process"]},
+        {"id": "optimize", "name": "Optimize", "agent": "Optimizer",
+            "description": optimize, "depends_on": ["approve"]}
+    ]
+
+
+FLOW_TEMPLATES: List[Dict[str, Any]] = [
+    {
+        "id": "data-analysis",
+        "name": "Data Analysis Flow",
+        "description": "Analyze data sets and generate insights",
+        "steps": _pipeline(
+            "Gather relevant data",
+            "Process and analyze data",
+            "Validate analysis results",
+            "Suggest improvements")
+    },
+    {
+        "id": "content-generation",
+        "name": "Content Generation Flow",
+        "description": "Generate and optimize content based on requirements",
+        "steps": _pipeline(
+            "Research topic and gather information",
+            "Generate initial content draft",
+            "Review and approve content",
+            "Optimize content for engagement")
+    },
+    {
+        "id": "customer-support",
+        "name": "Customer Support Flow",
+        "description": "Handle customer inquiries and support tickets",
+        "steps": _pipeline(
+            "Research customer history and issue",
+            "Generate response or solution",
+            "Review and approve response",
+            "Suggest improvements to process")
+    },
+    {
+        "id": "market-research",
+        "name": "Market Research Flow",
+        "description": (
+            "Research market and competitors in parallel, then synthesize"),
+        "steps": [
+            {"id": "market", "name": "Market Research",
+                "agent": "Researcher",
+                "description": "Research market size and trends",
+                "depends_on": [], "output_key": "market_research",
+                "inputs": {"context": "market trends"}},
+            {"id": "competitors", "name": "Competitor Research",
+                "agent": "Researcher",
+                "description": "Research competitor offerings",
+                "depends_on": [], "output_key": "competitor_research",
+                "inputs": {"context": "competitors"}},
+            {"id": "process", "name": "Process", "agent": "Processor",
+                "description": "Synthesize research into a report",
+                "depends_on": ["market", "competitors"]},
+            {"id": "approve", "name": "Approve", "agent": "Approver",
+                "description": "Validate the report",
+                "depends_on": ["process"]},
+            {"id": "optimize", "name": "Optimize", "agent": "Optimizer",
+                "description": "Suggest improvements",
+                "depends_on": ["approve"]}
+        ]
+    }
+]
+
+
+def get_template(template_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a flow template by id."""
+    for template in FLOW_TEMPLATES:
+        if template["id"] == template_id:
+            return template
+    return None
+
+
+def steps_from_template(template_id: Optional[str] = None) -> List[FlowStep]:
+    """Build the step graph for a template (the default pipeline if
+    omitted)."""
+    template = get_template(template_id or DEFAULT_TEMPLATE_ID)
+    if template is None:
+        raise ValueError(f"Unknown flow template: {template_id}")
+
+    steps = []
+    for step in template["steps"]:
+        agent = step["agent"].lower()
+        steps.append(FlowStep(
+            name=step["id"],
+            agent=agent,
+            depends_on=list(step.get("depends_on", [])),
+            output_key=step.get("output_key", AGENT_OUTPUT_KEYS[agent]),
+            inputs=dict(step.get("inputs", {}))
+        ))
+    return steps
+
+
+def step_input(
+    step: FlowStep,
+    input_data: Dict[str, Any],
+    completed: Dict[str, Any],
+    elapsed: float
+) -> Dict[str, Any]:
+    """Build an agent's input from the run input and upstream results."""
+    upstream = (
+        completed[step.depends_on[0]] if len(step.depends_on) == 1
+        else {dep: completed[dep] for dep in step.depends_on}
+    )
+    if step.agent == "researcher":
+        payload = dict(input_data)
+    elif step.agent == "processor":
+        payload = {
+            "task": "Process research findings",
+            "research_findings": upstream,
+            "parameters": input_data.get("constraints", {})
+        }
+        if REVIEW_KEY in completed:
+            payload["review"] = completed[REVIEW_KEY]
+    elif step.agent == "approver":
+        payload = {
+            "result": upstream,
+            "criteria": {"quality_threshold": 0.8}
+        }
+    else:
+        payload = {
+            "workflow_results": dict(completed),
+            "performance_metrics": {
+                "execution_time": elapsed, "success_rate": 1.0}
+        }
+    payload.update(step.inputs)
+    return payload
@@ -1,14 +1,12 @@
+import asyncio
 import logging
 import uuid
 import os
-import psutil
-import json
-import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -18,8 +16,16 @@ from app.config import config
 
 # Then import other modules that might depend on config
 from app.database import init_db, get_db, db
-from app.flow.engine import FlowEngine
+from app.database.counters import execution_totals
+from app.database.executions import execution_recorder
+from app.database.queue import job_queue
+from app.flow.jobs import WorkflowJob, job_pool, run_workflow_job
+from app.flow.pool import engine_pool
+from app.monitoring.http import MetricsMiddleware
+from app.monitoring.system import system_sampler
+from app.ratelimit import RateLimitMiddleware
 from app.api import flows, agents, execute, metrics
+from app.api.idempotency import idempotent, request_fingerprint
 from app.auth import api as auth_api
 
 # Configure logging
@@ -44,6 +50,15 @@ async def lifespan(app: FastAPI):
     # Initialize the database
     logger.info("Initializing database...")
     await init_db()
+    await db.connect()
+    await execution_recorder.start()
+    await system_sampler.start()
+
+    # Build flow engines (agents and compiled graphs) once for reuse
+    engine_pool.start()
+
+    # Start background workers for ?async=true flow submissions
+    await job_pool.start()
 
     # Create healthcheck file to indicate the API is running
     healthcheck_file = os.path.join(
@@ -55,6 +70,12 @@ async def lifespan(app: FastAPI):
 
     # Cleanup on shutdown
     logger.info("Shutting down FluxoX API")
+    await system_sampler.close()
+    await job_pool.close()
+    await job_queue.close()
+    await engine_pool.close()
+    await execution_recorder.close()
+    await db.close()
 
     # Remove healthcheck file
     if os.path.exists(healthcheck_file):
@@ -77,75 +98,28 @@ app.add_middleware(
     allow_credentials=config.cors.allow_credentials,
     allow_methods=config.cors.allow_methods,
     allow_headers=config.cors.allow_headers,
+    expose_headers=["X-Next-Cursor", "Location"],
     max_age=config.cors.max_age,
 )
 
+# Per-route latency histograms for /metrics/prometheus
+app.add_middleware(MetricsMiddleware)
+
 # Log CORS configuration
 logger.info(
     f"CORS configuration: allowed origins = {config.cors.allowed_origins}")
 
 # Rate limiting middleware (security: limit request rate per IP)
 if config.rate_limit.enabled:
-    class RateLimitMiddleware:
-        def __init__(
-            self,
-            app,
-            calls_per_minute: int = 60,
-            window_size: int = 60
-        ):
-            self.app = app
-            self.calls_per_minute = calls_per_minute
-            self.window_size = window_size  # Window size in seconds
-            self.request_counts = {}
-            logger.info(
-                f"Rate limiting enabled: {calls_per_minute} requests per minute")
-
-        async def __call__(self, request: Request, call_next):
-            # Get client IP
-            client_ip = request.client.host
-            current_time = time.time()
-
-            # Clean up old entries
-            self._cleanup_old_requests(current_time)
-
-            # Check if rate limit exceeded
-            if self._is_rate_limited(client_ip, current_time):
-                logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "detail": "Rate limit exceeded. Please try again later."}
-                )
-
-            # Process the request
-            return await call_next(request)
-
-        def _cleanup_old_requests(self, current_time: float):
-            """Remove requests older than the window size."""
-            cutoff_time = current_time - self.window_size
-            for ip in list(self.request_counts.keys()):
-                self.request_counts[ip] = [
-                    timestamp for timestamp in self.request_counts[ip]
-                    if timestamp > cutoff_time
-                ]
-                if not self.request_counts[ip]:
-                    del self.request_counts[ip]
-
-        def _is_rate_limited(self, client_ip: str, current_time: float) -> bool:
-            """Check if the client IP has exceeded the rate limit."""
-            if client_ip not in self.request_counts:
-                self.request_counts[client_ip] = []
-
-            self.request_counts[client_ip].append(current_time)
-
-            # Check if rate limit exceeded
-            return len(self.request_counts[client_ip]) > self.calls_per_minute
-
-    # Add rate limiting middleware
     app.add_middleware(
         RateLimitMiddleware,
         calls_per_minute=config.rate_limit.per_minute,
-        window_size=config.rate_limit.window_size
+        window_size=config.rate_limit.window_size,
+        max_clients=config.rate_limit.max_clients,
+        user_calls_per_minute=config.rate_limit.user_per_minute,
+        route_limits=config.rate_limit.route_limits,
+        backend=config.rate_limit.backend,
+        path=config.rate_limit.path
     )
 
 
@@ -155,6 +129,7 @@ class WorkflowRequest(BaseModel):
     name: str
     description: str
     input_data: Dict[str, Any]
+    template_id: Optional[str] = None
 
 
 class WorkflowResponse(BaseModel):
@@ -189,16 +164,42 @@ async def root():
 
 
 @app.get("/flows")
-async def list_flows():
-    """List all flows."""
+async def list_flows(
+    response: Response,
+    limit: int = Query(flows.DEFAULT_PAGE_SIZE, ge=1, le=flows.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor from the previous page"),
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+):
+    """List flows, newest first; follow X-Next-Cursor for the next page."""
     async with get_db() as db:
-        rows = await db.fetch_all("SELECT * FROM workflows")
-        return rows
+        rows, next_cursor = await flows.fetch_flow_page(
+            db, limit, cursor, status, created_after, created_before)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
 
 
 @app.post("/flows", response_model=WorkflowResponse, status_code=201)
-async def create_flow(request: WorkflowRequest):
-    """Create and run a new flow."""
+async def create_flow(
+    request: WorkflowRequest,
+    run_async: bool = Query(
+        False, alias="async",
+        description="Queue the run and return 202 Accepted immediately"),
+    idempotency_key: Optional[str] = Header(
+        None, description="Replays the stored response for a repeated request")
+):
+    """Create and run a new flow (queued in the background if ?async=true)."""
+    return await idempotent(
+        "POST /flows", idempotency_key,
+        request_fingerprint(request, run_async),
+        lambda: _create_flow(request, run_async), status_code=201)
+
+
+async def _create_flow(request: WorkflowRequest, run_async: bool):
+    """Insert the workflow row and run or queue it (body of POST /flows)."""
     workflow_id = str(uuid.uuid4())
     logger.info(f"Creating flow {workflow_id}: {request.name}")
 
@@ -212,19 +213,45 @@ async def create_flow(request: WorkflowRequest):
             (workflow_id, request.name, request.description, "pending")
         )
 
-        engine = FlowEngine(use_mock=config.workflow.use_mock)
-        result = await engine.execute_workflow(workflow_id, request.input_data)
-
-        # Update workflow status in database
-        await db.execute(
-            """
-            UPDATE workflows 
-            SET status = ?, result = ?, updated_at = datetime('now')
-            WHERE id = ?
-            """,
-            (result["status"], json.dumps(
-                result.get("result", {})), workflow_id)
-        )
+        if run_async:
+            try:
+                if config.queue.backend == "durable":
+                    # Picked up by `python -m app.worker` processes
+                    await job_queue.enqueue(
+                        workflow_id, request.input_data, request.template_id)
+                else:
+                    await job_pool.submit(WorkflowJob(
+                        workflow_id, request.input_data, request.template_id))
+            except asyncio.QueueFull:
+                await db.execute(
+                    """
+                    UPDATE workflows
+                    SET status = 'error', error = ?,
+                        updated_at = datetime('now')
+                    WHERE id = ?
+                    """,
+                    ("Job queue is full", workflow_id)
+                )
+                raise HTTPException(
+                    status_code=503, detail="Job queue is full, retry later")
+
+            return JSONResponse(
+                status_code=202,
+                headers={"Location": f"/flows/{workflow_id}"},
+                content={
+                    "workflow_id": workflow_id,
+                    "name": request.name,
+                    "description": request.description,
+                    "status": "pending",
+                    "result": None,
+                    "error": None,
+                    "history": []
+                }
+            )
+
+        # Run inline; status moves pending -> running -> completed/error
+        result = await run_workflow_job(
+            workflow_id, request.input_data, request.template_id)
 
         # Return the workflow response
         return {
@@ -237,6 +264,8 @@ async def create_flow(request: WorkflowRequest):
             "history": result.get("history", [])
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating workflow: {str(e)}")
 
@@ -273,13 +302,7 @@ async def get_flow(workflow_id: str):
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
-    # Parse the result JSON if it exists
-    result = None
-    if workflow.get("result"):
-        try:
-            result = json.loads(workflow["result"])
-        except json.JSONDecodeError:
-            result = {"data": workflow["result"]}
+    result, _ = await flows.load_flow_result(workflow)
 
     return {
         "workflow_id": workflow["id"],
@@ -287,7 +310,7 @@ async def get_flow(workflow_id: str):
         "description": workflow["description"],
         "status": workflow["status"],
         "result": result,
-        "error": workflow.get("error"),
+        "error": workflow["error"],
         "history": []  # We don't store history in the database yet
     }
 
@@ -295,26 +318,21 @@ async def get_flow(workflow_id: str):
 @app.get("/metrics")
 async def get_metrics():
     """Get overall system metrics."""
-    # Get workflow execution metrics
-    total_executions = await db.fetch_val(
-        "SELECT COUNT(*) FROM workflow_executions"
-    ) or 0
-
-    # Get average execution time
-    avg_execution_time = await db.fetch_val(
-        "SELECT AVG(execution_time) FROM workflow_executions"
-    ) or 0
+    # Run count and average time from the trigger-maintained totals
+    totals = await execution_totals(db)
+    total_executions = totals["runs"]
+    avg_execution_time = totals["avg_execution_time"]
 
-    # Get system metrics
-    memory = psutil.virtual_memory()
+    # Cached snapshot from the background sampler (never blocks)
+    system = system_sampler.latest()
 
     return {
         "total_executions": total_executions,
         "avg_execution_time": round(float(avg_execution_time), 2),
         "system_stats": {
-            "memory_usage": memory.percent,
-            "cpu_usage": psutil.cpu_percent(interval=0.1),
-            "timestamp": datetime.now().isoformat()
+            "memory_usage": system["memory_percent"],
+            "cpu_usage": system["cpu_percent"],
+            "timestamp": system["timestamp"]
         }
     }
 
@@ -326,7 +344,7 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "environment": config.environment,
-        "database": "connected"  # Would add an actual check in production
+        "database": "connected" if await db.ping() else "unavailable"
     }
 
 # Add this section to run the app with uvicorn if the file is executed directly
@@ -0,0 +1 @@
+"""Runtime monitoring for FluxoX."""
@@ -0,0 +1,46 @@
+"""
+HTTP latency instrumentation for FluxoX.
+
+A plain ASGI middleware (no per-request task or body buffering) that
+times each HTTP request and records it under its route template, e.g.
+`/flows/{flow_id}`, so label cardinality stays bounded.
+"""
+
+# Author: theyashdhiman04
+
+import time
+
+from app.monitoring.metrics import HTTP_LATENCY
+
+
+class MetricsMiddleware:
+    """Record request latency per method, route template and status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # FastAPI stores the matched route on the scope during routing
+            route = scope.get("route")
+            HTTP_LATENCY.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                str(status)
+            )
@@ -0,0 +1,202 @@
+"""
+In-process metrics for FluxoX, rendered in Prometheus text format.
+
+A deliberately small registry: counters, gauges and fixed-bucket
+histograms keyed by a tuple of label values. Recording is a dict lookup
+plus a bisect, cheap enough for the per-step and per-query hot paths.
+Metrics are per process; scrape every worker process separately.
+"""
+
+# Author: theyashdhiman04
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; spans sub-millisecond DB queries to multi-second workflows
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def _escape(value: str) -> str:
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _labels(
+    names: Sequence[str], values: Sequence[str], extra: str = ""
+) -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """Base class: a named family of series keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for labels, value in list(self._values.items()):
+            labelset = _labels(self.labelnames, labels)
+            yield f"{self.name}{labelset} {_number(value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down; set() replaces it."""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class _Series:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], _Series] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _Series(len(self.bounds) + 1)
+        # Last slot is the +Inf bucket
+        series.buckets[bisect_left(self.bounds, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    def snapshot(self, *labels: str) -> Dict[str, float]:
+        """Count, sum, mean and bucket-estimated p50/p95 for one label set."""
+        series = self._series.get(labels)
+        if series is None or not series.count:
+            return {
+                "count": 0, "sum": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0}
+        return {
+            "count": series.count,
+            "sum": series.sum,
+            "mean": series.sum / series.count,
+            "p50": self._quantile(series, 0.5),
+            "p95": self._quantile(series, 0.95)
+        }
+
+    def _quantile(self, series: _Series, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation."""
+        target, seen = q * series.count, 0
+        for bound, count in zip(self.bounds, series.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def label_sets(self) -> List[Tuple[str, ...]]:
+        return list(self._series)
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for labels, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.bounds, series.buckets):
+                cumulative += count
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            inf = _labels(self.labelnames, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf} {series.count}"
+            plain = _labels(self.labelnames, labels)
+            yield f"{self.name}_sum{plain} {_number(series.sum)}"
+            yield f"{self.name}_count{plain} {series.count}"
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+WORKFLOWS_TOTAL = REGISTRY.register(Counter(
+    "fluxox_workflows_total", "Workflow runs by final status.",
+    ("template", "status")))
+WORKFLOW_DURATION = REGISTRY.register(Histogram(
+    "fluxox_workflow_duration_seconds", "Workflow run wall time.",
+    ("template", "status")))
+AGENT_LATENCY = REGISTRY.register(Histogram(
+    "fluxox_agent_process_seconds", "Agent process() call latency.",
+    ("agent", "outcome")))
+EXECUTIONS_DEDUPLICATED = REGISTRY.register(Counter(
+    "fluxox_executions_deduplicated_total",
+    "Executions that joined an identical run already in flight."))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "fluxox_queue_depth", "Jobs waiting to be picked up.", ("queue",)))
+DB_LATENCY = REGISTRY.register(Histogram(
+    "fluxox_db_query_seconds",
+    "Database call latency, including group-commit waits.",
+    ("operation",)))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "fluxox_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status")))
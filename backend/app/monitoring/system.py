@@ -0,0 +1,119 @@
+"""
+Background system metrics sampler for FluxoX.
+
+Collects CPU, memory, disk and process stats every `sample_interval`
+seconds on a worker thread and keeps them in a ring buffer, so metrics
+endpoints serve the cached snapshot instead of blocking the event loop
+on `psutil.cpu_percent(interval=...)`.
+"""
+
+# Author: theyashdhiman04
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+import psutil
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SystemSampler:
+    """Periodic psutil sampler with a bounded history of snapshots."""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        history_size: Optional[int] = None,
+        disk_path: str = "/"
+    ):
+        monitoring = config.monitoring
+        self.interval = (
+            interval if interval is not None
+            else monitoring.sample_interval_seconds
+        )
+        size = (
+            history_size if history_size is not None
+            else monitoring.sample_history_size
+        )
+        self.disk_path = disk_path
+        self._samples: Deque[Dict[str, Any]] = deque(maxlen=max(1, size))
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+        # cpu_percent(None) measures since the previous call; prime it
+        psutil.cpu_percent(None)
+        self._process.cpu_percent(None)
+
+    @property
+    def started(self) -> bool:
+        """Whether the sampling task is running."""
+        return self._task is not None
+
+    def sample(self) -> Dict[str, Any]:
+        """Take one snapshot (non-blocking psutil calls) and store it."""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        with self._process.oneshot():
+            rss = self._process.memory_info().rss
+            process_cpu = self._process.cpu_percent(None)
+            threads = self._process.num_threads()
+        snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "monotonic": time.monotonic(),
+            "cpu_percent": psutil.cpu_percent(None),
+            "memory_percent": memory.percent,
+            "memory_used_bytes": memory.used,
+            "disk_percent": disk.percent,
+            "process_rss_bytes": rss,
+            "process_cpu_percent": process_cpu,
+            "process_threads": threads
+        }
+        self._samples.append(snapshot)
+        return snapshot
+
+    def latest(self) -> Dict[str, Any]:
+        """Most recent snapshot, sampling once if none exists yet."""
+        return self._samples[-1] if self._samples else self.sample()
+
+    def history(
+        self,
+        window_seconds: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Buffered snapshots, oldest first, optionally only the last
+        window."""
+        if window_seconds is None:
+            return list(self._samples)
+        since = time.monotonic() - window_seconds
+        return [s for s in self._samples if s["monotonic"] >= since]
+
+    async def start(self) -> None:
+        """Start sampling in the background."""
+        if not self.started:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"System sampler started (every {self.interval}s)")
+
+    async def close(self) -> None:
+        """Stop sampling; buffered snapshots are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # psutil reads /proc; keep even that off the event loop
+                await loop.run_in_executor(None, self.sample)
+            except Exception as e:
+                logger.warning(f"System sample failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+
+# Shared sampler; started and closed by the app lifespan.
+system_sampler = SystemSampler()
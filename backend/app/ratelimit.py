@@ -0,0 +1,265 @@
+"""
+Request rate limiting for FluxoX.
+
+A token bucket per client: each bucket holds up to `capacity` tokens and
+refills continuously at `capacity / window` tokens per second, so a
+client may burst up to its allowance and then sustain the average rate.
+A check is O(1): one dict lookup, a little arithmetic and an LRU touch.
+Buckets live in an OrderedDict ordered by last use; buckets idle for a
+whole window are full again and are dropped from the cold end, and the
+table never holds more than `max_keys` clients.
+
+With several uvicorn workers, per-process buckets would multiply the
+limit by the worker count; the "sqlite" backend keeps the buckets in a
+small local SQLite file instead, updated by one atomic UPSERT per check.
+Checks run on the event loop, so they wait for SQLite's write lock only
+briefly; a check that can't get it fails open (the request is allowed).
+
+Clients are identified by the JWT `sub` when a valid bearer token is
+sent (the user tier) and by IP otherwise; route prefixes can carry
+their own, usually tighter, limits on top.
+"""
+
+# Author: theyashdhiman04
+
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.auth.jwt import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets with LRU eviction of idle keys."""
+
+    def __init__(
+        self, capacity: int, window: float = 60.0, max_keys: int = 100_000
+    ):
+        self.capacity = float(capacity)
+        self.window = float(window)
+        self.rate = self.capacity / self.window  # tokens per second
+        self.max_keys = max_keys
+        # key -> [tokens, last_refill]; least recently used first
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def check(
+        self, key: str, now: Optional[float] = None
+    ) -> Tuple[bool, float]:
+        """
+        Take one token for `key`.
+
+        Returns (allowed, retry_after): retry_after is the number of
+        seconds until a token is available when the request is refused.
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.capacity, now]
+            self._evict(now)
+        else:
+            self._buckets.move_to_end(key)
+            refilled = bucket[0] + (now - bucket[1]) * self.rate
+            bucket[0] = min(self.capacity, refilled)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, 0.0
+        return False, (1 - bucket[0]) / self.rate
+
+    def _evict(self, now: float) -> None:
+        """Drop buckets idle for a full window, then any over the size cap."""
+        buckets = self._buckets
+        cutoff = now - self.window
+        # Amortised O(1): each key is evicted at most once per insertion
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if oldest[1] > cutoff:
+                break
+            buckets.popitem(last=False)
+        while len(buckets) > self.max_keys:
+            buckets.popitem(last=False)
+
+
+class SQLiteTokenBucket:
+    """Token buckets in a SQLite file shared by every worker process."""
+
+    # Refill, take a token if one is available and report the outcome in
+    # a single statement, so concurrent processes cannot double-spend
+    CHECK_SQL = """
+        INSERT INTO rate_buckets (tier, key, tokens, updated, granted)
+        VALUES (:tier, :key, :capacity - 1, :now, 1)
+        ON CONFLICT (tier, key) DO UPDATE SET
+            granted = MIN(:capacity, tokens + (:now - updated) * :rate) >= 1,
+            tokens = MIN(:capacity, tokens + (:now - updated) * :rate)
+                     - (MIN(:capacity, tokens + (:now - updated) * :rate)
+                        >= 1),
+            updated = :now
+        RETURNING tokens, granted
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int,
+        window: float = 60.0,
+        tier: str = "default",
+        sweep_every: int = 10_000,
+        busy_timeout: float = 0.05
+    ):
+        self.capacity = float(capacity)
+        self.window = float(window)
+        self.rate = self.capacity / self.window
+        self.tier = tier
+        self.sweep_every = sweep_every
+        self._checks = 0
+        # Autocommit: every check is its own short write transaction
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        # Setup above may wait; checks on the event loop must not
+        self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+        # Bucket state is disposable; skip fsyncs on the hot path
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                tier TEXT NOT NULL,
+                key TEXT NOT NULL,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL,
+                granted INTEGER NOT NULL,
+                PRIMARY KEY (tier, key)
+            ) WITHOUT ROWID
+        """)
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM rate_buckets WHERE tier = ?",
+            (self.tier,)).fetchone()[0]
+
+    def check(
+        self, key: str, now: Optional[float] = None
+    ) -> Tuple[bool, float]:
+        """Take one token for `key` (see TokenBucketLimiter.check)."""
+        # Wall-clock time, comparable across processes
+        now = time.time() if now is None else now
+        try:
+            tokens, granted = self._conn.execute(self.CHECK_SQL, {
+                "tier": self.tier, "key": key, "capacity": self.capacity,
+                "rate": self.rate, "now": now
+            }).fetchone()
+
+            self._checks += 1
+            if self._checks % self.sweep_every == 0:
+                self._conn.execute(
+                    "DELETE FROM rate_buckets WHERE tier = ? AND updated < ?",
+                    (self.tier, now - self.window))
+        except sqlite3.OperationalError as e:
+            # Lock contention (or a broken file) must not fail the request
+            logger.warning(f"Rate limit check skipped for {self.tier}: {e}")
+            return True, 0.0
+
+        if granted:
+            return True, 0.0
+        return False, (1 - tokens) / self.rate
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware returning 429 once a client exhausts its bucket."""
+
+    def __init__(
+        self,
+        app,
+        calls_per_minute: int = 60,
+        window_size: int = 60,
+        max_clients: int = 100_000,
+        user_calls_per_minute: Optional[int] = None,
+        route_limits: Optional[Dict[str, int]] = None,
+        backend: str = "memory",
+        path: str = "ratelimit.db"
+    ):
+        self.app = app
+
+        def make(tier: str, calls: int):
+            if backend == "sqlite":
+                return SQLiteTokenBucket(path, calls, window_size, tier)
+            return TokenBucketLimiter(calls, window_size, max_clients)
+
+        self.anonymous = make("ip", calls_per_minute)
+        self.users = make("user", user_calls_per_minute or calls_per_minute)
+        # Longest prefix first so "/flows/templates" wins over "/flows"
+        self.routes: List[Tuple[str, object]] = [
+            (prefix, make(f"route:{prefix}", calls))
+            for prefix, calls in sorted((route_limits or {}).items(),
+                                        key=lambda item: -len(item[0]))
+        ]
+        logger.info(
+            f"Rate limiting enabled ({backend}): {calls_per_minute} "
+            f"requests per {window_size}s per IP, "
+            f"{user_calls_per_minute or calls_per_minute} per user, "
+            f"route limits {route_limits or {}}")
+
+    @staticmethod
+    def _identity(scope) -> str:
+        """`user:<sub>` for a valid bearer token, else `ip:<address>`."""
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                try:
+                    token = value[7:].decode("latin-1")
+                    return f"user:{verify_token(token).username}"
+                except HTTPException:
+                    break  # Invalid tokens are limited like anonymous clients
+        return f"ip:{(scope.get('client') or ('unknown', 0))[0]}"
+
+    def check(self, scope) -> Tuple[bool, float, str]:
+        identity = self._identity(scope)
+        path = scope.get("path", "")
+        for prefix, limiter in self.routes:
+            if path.startswith(prefix):
+                allowed, retry_after = limiter.check(identity)
+                if not allowed:
+                    return False, retry_after, identity
+                break
+        limiter = (self.users if identity.startswith("user:")
+                   else self.anonymous)
+        allowed, retry_after = limiter.check(identity)
+        return allowed, retry_after, identity
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after, identity = self.check(scope)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        logger.warning(f"Rate limit exceeded for {identity}")
+        body = json.dumps(
+            {"detail": "Rate limit exceeded. Please try again later."}
+        ).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -17,6 +17,7 @@ class WorkflowCreate(BaseModel):
     name: str
     description: str
     input_data: Dict[str, Any]
+    template_id: Optional[str] = None
 
 
 class WorkflowUpdate(BaseModel):
@@ -70,11 +71,13 @@ class WorkflowExecution(WorkflowExecutionInDB):
 
 
 class WorkflowList(BaseModel):
-    """Model for listing workflows."""
+    """Model for listing workflows (summary columns only)."""
     id: str
     name: str
-    description: str
+    description: Optional[str] = None
     status: str
+    current_step: Optional[str] = None
+    progress: Optional[float] = None
     created_at: str
     updated_at: str
 
@@ -96,10 +99,14 @@ class WorkflowDetail(BaseModel):
     """Detailed workflow model."""
     id: str
     name: str
-    description: str
+    description: Optional[str] = None
     status: str
     result: Optional[Dict[str, Any]] = None
+    # Set instead of result for large, streamed results
+    result_url: Optional[str] = None
     error: Optional[str] = None
+    current_step: Optional[str] = None
+    progress: Optional[float] = None  # Fraction of steps finished, 0..1
     created_at: str
     updated_at: str
 
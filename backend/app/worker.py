@@ -0,0 +1,164 @@
+"""
+FluxoX queue worker.
+
+Claims jobs from the durable ``jobs`` queue and runs them through the
+FlowEngine, heartbeating each lease while the job runs. Start as many
+processes (or hosts sharing the database) as needed:
+
+    python -m app.worker --concurrency 4
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import signal
+import socket
+import uuid
+from typing import Optional
+
+from app.config import config
+from app.database import db, init_db
+from app.database.executions import execution_recorder
+from app.database.queue import JobQueue, LeasedJob
+from app.flow.jobs import run_workflow_job
+from app.flow.pool import engine_pool
+
+logging.basicConfig(
+    level=getattr(logging, config.logging.level),
+    format=config.logging.format
+)
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Runs up to ``concurrency`` leased jobs at a time."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: int = 1,
+        exit_when_idle: bool = False
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.exit_when_idle = exit_when_idle
+        self.owner = (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}")
+        self.processed = 0
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask the worker to finish: no new claims, in-flight jobs released."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Run the claim loops until stopped (or idle, in burst mode)."""
+        logger.info(
+            f"Worker {self.owner} started (concurrency={self.concurrency})")
+        await asyncio.gather(*(self._loop() for _ in range(self.concurrency)))
+        logger.info(
+            f"Worker {self.owner} stopped after {self.processed} job(s)")
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            job = await self.queue.claim(self.owner)
+            if job is None:
+                if self.exit_when_idle:
+                    return
+                # Jitter keeps idle workers from polling in lockstep
+                interval = config.queue.poll_interval_seconds
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(),
+                        interval * random.uniform(0.5, 1.5))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_job(job)
+
+    async def _run_job(self, job: LeasedJob) -> None:
+        """Run one job while heartbeating its lease."""
+        run = asyncio.create_task(run_workflow_job(
+            job.workflow_id, job.input_data, job.template_id,
+            final_attempt=job.final_attempt))
+        stopping = asyncio.create_task(self._stopping.wait())
+        try:
+            while not run.done():
+                await asyncio.wait(
+                    {run, stopping},
+                    timeout=config.queue.heartbeat_seconds,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if run.done():
+                    break
+                if self._stopping.is_set():
+                    run.cancel()
+                    await asyncio.gather(run, return_exceptions=True)
+                    await self.queue.release(job.id, self.owner)
+                    logger.info(f"Released job {job.id} on shutdown")
+                    return
+                if not await self.queue.heartbeat(job.id, self.owner):
+                    # Another worker owns the job now; stop duplicating it
+                    run.cancel()
+                    await asyncio.gather(run, return_exceptions=True)
+                    logger.warning(f"Lost lease on job {job.id}")
+                    return
+        finally:
+            stopping.cancel()
+
+        error: Optional[str] = None
+        retry = True
+        try:
+            result = run.result()
+            if result.get("status") != "completed":
+                error = result.get("error") or "Workflow failed"
+                retry = result.get("retryable", True)
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            await self.queue.complete(job.id, self.owner)
+        else:
+            delay = random.uniform(0, min(30.0, 2 ** job.attempts))
+            await self.queue.fail(
+                job.id, self.owner, error, retry_delay=delay, retry=retry)
+            logger.warning(
+                f"Job {job.id} attempt {job.attempts} failed: {error}")
+        self.processed += 1
+
+
+async def main(concurrency: int, exit_when_idle: bool) -> None:
+    """Entry point for ``python -m app.worker``."""
+    await init_db()
+    await db.connect()
+    await execution_recorder.start()
+    engine_pool.start()
+    queue = JobQueue()
+    worker = Worker(queue, concurrency, exit_when_idle)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await queue.close()
+        await engine_pool.close()
+        await execution_recorder.close()
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a FluxoX queue worker.")
+    parser.add_argument("--concurrency", type=int,
+                        default=config.workflow.job_workers,
+                        help="Jobs run concurrently by this process")
+    parser.add_argument("--exit-when-idle", action="store_true",
+                        help="Exit once the queue is empty (burst mode)")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.exit_when_idle))
@@ -0,0 +1 @@
+"""Standalone performance benchmarks for FluxoX (not collected by pytest)."""
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark: connection-per-query vs. the pooled Database.
+
+Runs the same mix of point reads and status updates against a scratch
+SQLite database, once with Database opening a connection per call (the
+old behaviour, still used when the pool is not started) and once with
+the connection pool, and reports queries/s.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_pool --queries 5000 --concurrency 32
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from app.database import Database, init_db
+
+ROWS = 100
+
+
+async def _load(database: Database, queries: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            workflow_id = f"wf-{i % ROWS}"
+            if i % 4 == 0:
+                await database.execute(
+                    "UPDATE workflows SET progress = ? WHERE id = ?",
+                    (i / queries, workflow_id))
+            else:
+                await database.fetch_one(
+                    "SELECT * FROM workflows WHERE id = ?", (workflow_id,))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(queries)))
+    return queries / (time.perf_counter() - started)
+
+
+async def main(queries: int, concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        with patch("app.database.DATABASE_URL", path):
+            await init_db()
+            database = Database()
+            for i in range(ROWS):
+                await database.execute(
+                    "INSERT INTO workflows (id, name, status) "
+                    "VALUES (?, 'bench', 'pending')",
+                    (f"wf-{i}",))
+
+            per_call = await _load(database, queries, concurrency)
+            await database.connect()
+            pooled = await _load(database, queries, concurrency)
+            await database.close()
+
+    print(f"{queries} queries (25% updates), concurrency {concurrency}")
+    print(f"  {'connection per query':<24} {per_call:>9.1f} q/s")
+    print(f"  {'connection pool':<24} {pooled:>9.1f} q/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.queries, args.concurrency))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-request engine construction vs. a leased EnginePool.
+
+Runs the same number of mock workflows under concurrent load, once
+building a fresh FlowEngine per request (the old POST /flows behaviour)
+and once leasing pre-built engines from an EnginePool.
+
+Usage (from backend/):
+    python -m benchmarks.bench_engine_pool --requests 500 --concurrency 50
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from app.flow.engine import FlowEngine
+from app.flow.pool import EnginePool
+
+INPUT_DATA = {
+    "query": "Analyze customer feedback trends",
+    "context": "E-commerce customer reviews dataset",
+    "constraints": {"time_period": "last_month", "min_confidence": 0.8}
+}
+
+
+async def _fresh_engine(i: int) -> float:
+    started = time.perf_counter()
+    engine = FlowEngine(use_mock=True)
+    await engine.execute_workflow(f"bench-{i}", INPUT_DATA)
+    return time.perf_counter() - started
+
+
+def _pooled(pool: EnginePool):
+    async def run(i: int) -> float:
+        started = time.perf_counter()
+        async with pool.lease() as engine:
+            await engine.execute_workflow(f"bench-{i}", INPUT_DATA)
+        return time.perf_counter() - started
+    return run
+
+
+async def _load(run, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i: int) -> float:
+        async with semaphore:
+            return await run(i)
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(bounded(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latencies)
+    return {
+        "throughput": requests / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000
+    }
+
+
+async def main(requests: int, concurrency: int, pool_size: int) -> None:
+    pool = EnginePool(size=pool_size, use_mock=True, engine_factory=FlowEngine)
+    pool.start()
+
+    results = {
+        "fresh engine per request": await _load(
+            _fresh_engine, requests, concurrency),
+        f"engine pool (size={pool_size})": await _load(
+            _pooled(pool), requests, concurrency)
+    }
+    await pool.close()
+
+    print(f"{requests} requests, concurrency {concurrency}")
+    for label, r in results.items():
+        print(
+            f"  {label:<28} {r['throughput']:>9.1f} req/s"
+            f"  mean {r['mean_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    # Engine construction logs at WARNING in mock mode; keep output readable.
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.requests, args.concurrency, args.pool_size))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Benchmark: unbounded `SELECT * FROM workflows` vs. keyset pages.
+
+Grows a scratch workflows table (each row carrying a result blob) and,
+at each size, times the old full listing against fetching the first
+page and a page deep into the table with GET /flows' keyset query.
+
+Usage (from backend/):
+    python -m benchmarks.bench_flow_listing --sizes 10000 100000 1000000
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from unittest.mock import patch
+
+from app.api.flows import fetch_flow_page
+from app.database import Database, init_db
+
+RESULT_BLOB = '{"research_results": "' + "x" * 2000 + '"}'
+
+
+def _grow(path: str, start: int, stop: int) -> None:
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO workflows (id, name, status, result, created_at)
+            VALUES (?, 'bench', ?, ?, datetime('2026-01-01', ? || ' seconds'))
+            """,
+            ((f"wf-{i:08d}", "completed" if i % 3 else "error", RESULT_BLOB, i)
+             for i in range(start, stop))
+        )
+
+
+async def _timed(call) -> float:
+    started = time.perf_counter()
+    await call()
+    return (time.perf_counter() - started) * 1000
+
+
+async def main(sizes) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        with patch("app.database.DATABASE_URL", path):
+            await init_db()
+            database = Database()
+            await database.connect()
+            print(f"{'rows':>9}  {'SELECT *':>10}  {'first page':>10}  "
+                  f"{'deep page':>10}")
+            grown = 0
+            for size in sorted(sizes):
+                _grow(path, grown, size)
+                grown = size
+                full = await _timed(
+                    lambda: database.fetch_all("SELECT * FROM workflows"))
+                first = await _timed(lambda: fetch_flow_page(database, 50))
+                _, cursor = await fetch_flow_page(
+                    database, 50, status="completed")
+                for _ in range(20):
+                    _, cursor = await fetch_flow_page(
+                        database, 50, cursor, "completed")
+                deep = await _timed(lambda: fetch_flow_page(
+                    database, 50, cursor, "completed"))
+                print(f"{size:>9}  {full:>8.1f}ms  {first:>8.2f}ms  "
+                      f"{deep:>8.2f}ms")
+            await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10000, 100000, 300000])
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.sizes))
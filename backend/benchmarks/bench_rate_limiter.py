@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-IP timestamp lists vs. the token-bucket limiters.
+
+Replays requests from N distinct clients against the previous limiter
+(a timestamp list per IP, swept on every request), the in-process
+`TokenBucketLimiter` and the cross-process `SQLiteTokenBucket`,
+reporting per-request cost and tracked keys. The old limiter's sweep is
+O(requests in window), so it is only timed over a sample of requests
+once the window is full.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rate_limiter --clients 100000
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.ratelimit import SQLiteTokenBucket, TokenBucketLimiter
+
+
+class TimestampListLimiter:
+    """The limiter this module replaced, kept here as the baseline."""
+
+    def __init__(self, calls: int, window: float):
+        self.calls = calls
+        self.window = window
+        self.request_counts = {}
+
+    def check(self, key: str, now: float) -> bool:
+        cutoff = now - self.window
+        for ip in list(self.request_counts.keys()):
+            self.request_counts[ip] = [
+                t for t in self.request_counts[ip] if t > cutoff]
+            if not self.request_counts[ip]:
+                del self.request_counts[ip]
+        self.request_counts.setdefault(key, []).append(now)
+        return len(self.request_counts[key]) <= self.calls
+
+
+def _run(limiter, keys, sample: int) -> float:
+    """Fill the window with one request per key, then time `sample` more."""
+    # Spread the fill over the first half of the window
+    step = 30.0 / len(keys)
+    for i, key in enumerate(keys):
+        limiter.check(key, now=i * step)
+    picks = [random.choice(keys) for _ in range(sample)]
+    started = time.perf_counter()
+    for key in picks:
+        limiter.check(key, now=31.0)
+    return (time.perf_counter() - started) / sample * 1e6
+
+
+def main(clients: int, max_keys: int) -> None:
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+            for i in range(clients)]
+    print(f"{clients} distinct clients, 60 req/min each")
+
+    old = TimestampListLimiter(60, 60)
+    # The baseline's fill is itself quadratic; time it on a slice
+    old_keys = keys[:min(clients, 5000)]
+    old_us = _run(old, old_keys, sample=200)
+    print(f"timestamp lists ({len(old_keys)} clients): "
+          f"{old_us:10.1f} us/request"
+          f"  keys={len(old.request_counts)}")
+
+    new = TokenBucketLimiter(60, 60, max_keys=max_keys)
+    new_us = _run(new, keys, sample=200_000)
+    print(f"token bucket    ({clients} clients): {new_us:10.2f} us/request"
+          f"  keys={len(new)} (cap {max_keys})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = SQLiteTokenBucket(
+            os.path.join(tmp, "ratelimit.db"), 60, 60, tier="ip")
+        shared_us = _run(shared, keys, sample=50_000)
+        print(f"sqlite (shared) ({clients} clients): "
+              f"{shared_us:10.2f} us/request"
+              f"  keys={len(shared)}")
+        shared.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.clients, args.max_keys)
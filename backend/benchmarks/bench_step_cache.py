@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark: workflow throughput with and without the step-result cache.
+
+Mock agents answer instantly, so --step-latency adds a sleep to the
+researcher and processor (the agents that would call an LLM). Runs
+--runs workflows drawn from --distinct queries with the cache off and
+on, and reports wall time and hit rate.
+
+Usage (from backend/):
+    python -m benchmarks.bench_step_cache --distinct 20 --step-latency 0.05
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import asyncio
+import logging
+import time
+
+from app.agents.processor import ProcessorAgent
+from app.agents.researcher import ResearcherAgent
+from app.flow.cache import step_cache
+from app.flow.engine import FlowEngine
+
+
+def _slow_down(step_latency: float) -> None:
+    for agent in (ResearcherAgent, ProcessorAgent):
+        original = agent.process
+
+        async def process(self, input_data, context=None, _original=original):
+            await asyncio.sleep(step_latency)
+            return await _original(self, input_data, context)
+
+        agent.process = process
+
+
+async def _run(runs: int, distinct: int, enabled: bool) -> float:
+    step_cache.clear()
+    step_cache.enabled = enabled
+    step_cache.hits = step_cache.misses = 0
+    engine = FlowEngine(use_mock=True)
+    started = time.perf_counter()
+    # Sequential, so every repeat of a query can hit
+    for i in range(runs):
+        await engine.execute_workflow(
+            f"wf-{i}", {"query": f"topic {i % distinct}"})
+    return time.perf_counter() - started
+
+
+async def main(runs: int, distinct: int, step_latency: float) -> None:
+    logging.disable(logging.WARNING)
+    _slow_down(step_latency)
+    off = await _run(runs, distinct, enabled=False)
+    print(f"cache off: {off:7.2f}s  ({runs / off:7.1f} runs/s)")
+    on = await _run(runs, distinct, enabled=True)
+    lookups = step_cache.hits + step_cache.misses
+    print(f"cache on:  {on:7.2f}s  ({runs / on:7.1f} runs/s)  "
+          f"hit rate {step_cache.hits / lookups:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--step-latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.distinct, args.step_latency))
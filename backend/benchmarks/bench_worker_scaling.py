@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Benchmark: durable queue throughput vs. number of worker processes.
+
+Fills a scratch SQLite database with queued mock workflows, then drains
+it with 1, 2, ... N burst-mode workers (app.worker's main with
+--exit-when-idle) and reports jobs/s for each worker count. Mock agents
+answer instantly, so --step-latency adds a sleep to every agent call to
+stand in for the LLM round trip that dominates real runs.
+
+Usage (from backend/):
+    python -m benchmarks.bench_worker_scaling --jobs 800 --max-workers 4
+"""
+
+# Author: theyashdhiman04
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from unittest.mock import patch
+
+import aiosqlite
+
+from app.agents.approver import ApproverAgent
+from app.agents.optimizer import OptimizerAgent
+from app.agents.processor import ProcessorAgent
+from app.agents.researcher import ResearcherAgent
+from app.database import init_db
+from app.database.queue import JobQueue
+from app import worker
+
+INPUT_DATA = {"query": "Analyze customer feedback trends"}
+
+
+async def _fill(path: str, jobs: int) -> None:
+    with patch("app.database.DATABASE_URL", path):
+        await init_db()
+    queue = JobQueue(path)
+    async with aiosqlite.connect(path) as db:
+        await db.execute("PRAGMA journal_mode=WAL")
+        ids = [str(uuid.uuid4()) for _ in range(jobs)]
+        await db.executemany(
+            """
+            INSERT INTO workflows (id, name, status, created_at, updated_at)
+            VALUES (?, 'bench', 'pending', datetime('now'), datetime('now'))
+            """,
+            [(i,) for i in ids]
+        )
+        await db.commit()
+    for workflow_id in ids:
+        await queue.enqueue(workflow_id, INPUT_DATA)
+    await queue.close()
+
+
+def _run_worker(concurrency: int, step_latency: float) -> None:
+    """Worker process body: slow every agent down, then drain the queue."""
+    agents = (ResearcherAgent, ProcessorAgent, ApproverAgent, OptimizerAgent)
+    for agent in agents:
+        original = agent.process
+
+        async def process(self, input_data, context=None, _original=original):
+            await asyncio.sleep(step_latency)
+            return await _original(self, input_data, context)
+
+        agent.process = process
+    asyncio.run(worker.main(concurrency, exit_when_idle=True))
+
+
+def _drain(
+    path: str,
+    workers: int,
+    concurrency: int,
+    step_latency: float
+) -> float:
+    env = dict(os.environ, DATABASE_URL=path, USE_MOCK_WORKFLOW="true",
+               LOG_LEVEL="WARNING")
+    started = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.bench_worker_scaling",
+             "--worker", "--concurrency", str(concurrency),
+             "--step-latency", str(step_latency)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.wait()
+    return time.perf_counter() - started
+
+
+def main(
+    jobs: int,
+    max_workers: int,
+    concurrency: int,
+    step_latency: float
+) -> None:
+    print(f"{jobs} jobs, concurrency {concurrency} per worker, "
+          f"{step_latency * 1000:.0f} ms per agent call")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in range(1, max_workers + 1):
+            path = os.path.join(tmp, f"bench-{workers}.db")
+            asyncio.run(_fill(path, jobs))
+            elapsed = _drain(path, workers, concurrency, step_latency)
+            print(f"  {workers} worker(s)  {jobs / elapsed:>9.1f} jobs/s  "
+                  f"({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=800)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--step-latency", type=float, default=0.05)
+    parser.add_argument("--worker", action="store_true",
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.worker:
+        _run_worker(args.concurrency, args.step_latency)
+    else:
+        main(args.jobs, args.max_workers, args.concurrency, args.step_latency)
@@ -0,0 +1,79 @@
+"""Tests for bounded agent history."""
+
+import gc
+import logging
+import os
+
+import psutil
+import pytest
+
+from app.agents.history import AgentHistory
+from app.agents.researcher import ResearcherAgent
+from app.flow.engine import FlowEngine
+
+
+def test_agent_history_is_bounded():
+    """Only the most recent entries are retained; stats cover everything."""
+    history = AgentHistory(maxlen=3, track_stats=True)
+    for i in range(10):
+        history.record({"query": f"q{i}"}, latency=0.01 * i)
+
+    assert len(history) == 3
+    assert [entry["query"] for entry in history] == ["q7", "q8", "q9"]
+    assert history[-1] == {"query": "q9"}
+
+    stats = history.stats()
+    assert stats["count"] == 10
+    assert stats["retained"] == 3
+    assert stats["total_bytes"] > 0
+    assert stats["max_latency"] == pytest.approx(0.09)
+
+
+def test_agent_history_without_stats():
+    """Stats tracking can be disabled to keep record() minimal."""
+    history = AgentHistory(maxlen=0, track_stats=False)
+    history.record({"query": "q"}, latency=1.0)
+
+    assert len(history) == 0
+    assert history.stats() == {"count": 1, "retained": 0, "capacity": 0}
+
+
+@pytest.mark.asyncio
+async def test_agent_config_exposes_history_stats():
+    """Agent.config reports aggregated history statistics."""
+    agent = ResearcherAgent()
+    await agent.process({"query": "Test query"})
+
+    stats = agent.config["history"]
+    assert stats["count"] == 1
+    assert agent.get_research_history() is agent.history
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    not os.getenv("FLUXOX_SOAK"),
+    reason="soak test; set FLUXOX_SOAK=1 to run (~1 minute)"
+)
+async def test_history_rss_flat_over_100k_executions():
+    """RSS stays flat across 100k mock executions on one engine."""
+    logging.disable(logging.WARNING)
+    try:
+        engine = FlowEngine(use_mock=True)
+        process = psutil.Process()
+
+        async def run(start: int, count: int) -> None:
+            for i in range(start, start + count):
+                await engine.execute_workflow(
+                    f"soak-{i}", {"query": "q", "n": i})
+
+        await run(0, 10_000)
+        gc.collect()
+        baseline = process.memory_info().rss
+
+        await run(10_000, 90_000)
+        gc.collect()
+        growth = process.memory_info().rss - baseline
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert growth < 5 * 1024 * 1024
@@ -1,4 +1,8 @@
+import asyncio
+
 import pytest
+from app.agents.base import RunContext
+from app.agents.history import AgentHistory
 from app.agents.processor import ProcessorAgent
 
 
@@ -11,7 +15,7 @@ async def test_processor_agent_initialization():
     assert "Executes core workflow" in agent.description
     assert hasattr(agent, "process")
     assert hasattr(agent, "processing_history")
-    assert isinstance(agent.processing_history, list)
+    assert isinstance(agent.processing_history, AgentHistory)
 
 
 @pytest.mark.asyncio
@@ -53,3 +57,24 @@ async def test_processor_agent_config():
     assert "description" in config
     assert "current_state" in config
     assert config["name"] == "Processor"
+
+
+@pytest.mark.asyncio
+async def test_processor_agent_run_context_isolation():
+    """Concurrent runs on one agent keep their state in their own context."""
+    agent = ProcessorAgent()
+    contexts = [RunContext(workflow_id=f"wf-{i}") for i in range(3)]
+
+    await asyncio.gather(*(
+        agent.process({"task": f"task-{i}"}, context)
+        for i, context in enumerate(contexts)
+    ))
+
+    for i, context in enumerate(contexts):
+        state = agent.get_state(context)
+        assert state.current_step == "complete"
+        assert state.metadata["task"] == f"task-{i}"
+        assert state.messages[0].content == f"task-{i}"
+
+    # The agent's shared state is untouched by context-bound runs
+    assert agent.get_state().current_step == "start"
@@ -1,4 +1,5 @@
 import pytest
+from app.agents.history import AgentHistory
 from app.agents.researcher import ResearcherAgent
 
 
@@ -11,7 +12,7 @@ async def test_researcher_agent_initialization():
     assert "Gathers and analyzes information" in agent.description
     assert hasattr(agent, "process")
     assert hasattr(agent, "research_history")
-    assert isinstance(agent.research_history, list)
+    assert isinstance(agent.research_history, AgentHistory)
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,135 @@
+"""Tests for the token-bucket rate limiter."""
+
+import multiprocessing
+import sqlite3
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth.jwt import create_access_token
+from app.ratelimit import (
+    RateLimitMiddleware, SQLiteTokenBucket, TokenBucketLimiter
+)
+
+
+def _spend(path, attempts, results):
+    limiter = SQLiteTokenBucket(path, capacity=60, window=60, tier="ip")
+    results.put(sum(limiter.check("ip:1.2.3.4")[0] for _ in range(attempts)))
+
+
+def test_bucket_bursts_then_refills():
+    """A client gets `capacity` requests at once, then one per refill."""
+    limiter = TokenBucketLimiter(capacity=3, window=3)
+    allowed = [limiter.check("a", now=0)[0] for _ in range(4)]
+    assert allowed == [True, True, True, False]
+    assert limiter.check("a", now=0)[1] == 1.0
+
+    assert limiter.check("a", now=1.0) == (True, 0.0)
+    assert not limiter.check("a", now=1.0)[0]
+    # Other clients have their own buckets
+    assert limiter.check("b", now=1.0)[0]
+
+
+def test_idle_and_excess_keys_are_evicted():
+    """Keys idle for a whole window go first; the table stays <= max_keys."""
+    limiter = TokenBucketLimiter(capacity=1, window=10, max_keys=3)
+    limiter.check("idle", now=0)
+    limiter.check("a", now=5)
+    limiter.check("b", now=11)
+    assert len(limiter) == 2
+
+    limiter.check("c", now=12)
+    limiter.check("a", now=12)  # touched, so "b" is now the least recent
+    limiter.check("d", now=12)
+    assert len(limiter) == 3
+    # evicted, so it starts with a full bucket
+    assert limiter.check("b", now=12)[0]
+
+
+def test_sqlite_buckets_are_shared_across_processes(tmp_path):
+    """Worker processes draw from one bucket instead of one each."""
+    path = str(tmp_path / "ratelimit.db")
+    SQLiteTokenBucket(path, capacity=60).close()  # Create the table up front
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_spend, args=(path, 50, results))
+               for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert sum(results.get() for _ in workers) == 60
+
+    limiter = SQLiteTokenBucket(path, capacity=2, window=10, tier="t")
+    allowed = [limiter.check("k", now=0)[0] for _ in range(3)]
+    assert allowed == [True, True, False]
+    assert limiter.check("k", now=0)[1] == 5.0
+    assert limiter.check("k", now=5.0) == (True, 0.0)
+
+
+def test_sqlite_check_fails_open_under_lock_contention(tmp_path):
+    """A held write lock delays a check only briefly, then lets it through."""
+    path = str(tmp_path / "ratelimit.db")
+    limiter = SQLiteTokenBucket(path, capacity=1, window=60, busy_timeout=0.05)
+    limiter.check("k")  # Bucket now empty
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        assert limiter.check("k") == (True, 0.0)
+        assert time.perf_counter() - started < 1
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    assert not limiter.check("k")[0]
+
+
+def _client(**limits) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, window_size=60, **limits)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/execute")
+    async def execute():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_middleware_returns_429_with_retry_after():
+    """Requests over the limit get a 429 and a Retry-After hint."""
+    client = _client(calls_per_minute=2)
+    assert [client.get("/ping").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/ping")
+    assert response.status_code == 429
+    assert response.json()["detail"].startswith("Rate limit exceeded")
+    assert int(response.headers["retry-after"]) == 30
+
+
+def test_user_and_route_tiers():
+    """Authenticated users get their own allowance; routes add tighter
+    limits."""
+    client = _client(calls_per_minute=1, user_calls_per_minute=3,
+                     route_limits={"/execute": 1})
+    admin = {"Authorization":
+             f"Bearer {create_access_token({'sub': 'admin'})}"}
+    other = {"Authorization":
+             f"Bearer {create_access_token({'sub': 'testuser'})}"}
+
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping").status_code == 429
+    # Same IP, but limited per user rather than per address
+    statuses = [client.get("/ping", headers=admin).status_code
+                for _ in range(3)]
+    assert statuses == [200] * 3
+    assert client.get("/ping", headers=admin).status_code == 429
+    assert client.get("/ping", headers=other).status_code == 200
+
+    assert client.post("/execute", headers=other).status_code == 200
+    assert client.post("/execute", headers=other).status_code == 429
+    # A bad token falls back to the (exhausted) IP bucket
+    junk = {"Authorization": "Bearer junk"}
+    assert client.get("/ping", headers=junk).status_code == 429
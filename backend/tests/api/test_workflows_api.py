@@ -3,6 +3,9 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, MagicMock
 from contextlib import asynccontextmanager
 import asyncio
+import json
+import time
+import uuid
 
 # Create a mock orchestrator before importing app
 mock_orchestrator = AsyncMock()
@@ -12,7 +15,7 @@ mock_orchestrator.execute_workflow = AsyncMock(
 # Patch the flow engine
 with patch('app.flow.engine.FlowEngine', return_value=mock_orchestrator):
     from app.main import app
-    from app.database import init_db
+    from app.database import Database, init_db
 
 # Initialize the database before running tests
 
@@ -145,3 +148,162 @@ def test_get_metrics():
     assert "system_stats" in metrics
     assert "memory_usage" in metrics["system_stats"]
     assert "cpu_usage" in metrics["system_stats"]
+
+
+def test_execute_batch_streams_ndjson():
+    """POST /execute/batch streams one NDJSON status line per item."""
+    items = [
+        {"workflow_id": f"batch-{i}", "input_data": {"query": f"q{i}"}}
+        for i in range(5)
+    ]
+
+    response = client.post("/execute/batch?concurrency=2", json=items)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == list(range(5))
+    for line in lines:
+        assert line["workflow_id"] == f"batch-{line['index']}"
+        assert line["status"] == "completed"
+
+
+def test_create_flow_async_returns_202():
+    """POST /flows?async=true queues the run and GET /flows/{id} tracks it."""
+    workflow_data = {
+        "name": "Async Flow",
+        "description": "A queued test flow",
+        "input_data": {"query": "Analyze customer feedback trends"}
+    }
+
+    # Use the lifespan so the background job workers are running
+    with TestClient(app) as lifespan_client:
+        response = lifespan_client.post(
+            "/flows?async=true", json=workflow_data)
+        assert response.status_code == 202
+        accepted = response.json()
+        assert accepted["status"] == "pending"
+        location = f"/flows/{accepted['workflow_id']}"
+        assert response.headers["location"] == location
+
+        for _ in range(100):
+            detail = lifespan_client.get(location).json()
+            if detail["status"] == "completed":
+                break
+            time.sleep(0.01)
+
+    assert detail["status"] == "completed"
+    assert detail["progress"] == 1
+    assert detail["result"] == {"key": "value"}
+
+
+@pytest.fixture
+def flows_db(db_path):
+    async def fill():
+        database = Database()
+        for i in range(7):
+            await database.execute(
+                """
+                INSERT INTO workflows (id, name, status, result, created_at)
+                VALUES (?, ?, ?, '{"big": "blob"}', ?)
+                """,
+                (f"wf-{i}", f"flow {i}", "completed" if i % 2 else "error",
+                 f"2026-01-0{i + 1} 12:00:00")
+            )
+    asyncio.run(fill())
+    return db_path
+
+
+@pytest.mark.parametrize("path", ["/flows", "/flows/"])
+def test_list_flows_pages_with_cursor(flows_db, path):
+    """Pages are newest first, disjoint, and end without a cursor."""
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert all("result" not in flow for flow in page)
+        seen.extend(flow["id"] for flow in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == [f"wf-{i}" for i in range(6, -1, -1)]
+
+
+def test_list_flows_filters_status_and_dates(flows_db):
+    """Status and created_at range filters combine with pagination."""
+    response = client.get("/flows", params={
+        "status": "completed",
+        "created_after": "2026-01-02T00:00:00",
+        "created_before": "2026-01-06T00:00:00"
+    })
+    assert [flow["id"] for flow in response.json()] == ["wf-3", "wf-1"]
+    response = client.get("/flows", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_flows_uses_keyset_index(flows_db):
+    """The page query is an index range scan, not a table scan and sort."""
+    async def plan():
+        database = Database()
+        return await database.fetch_all(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT id FROM workflows
+            WHERE status = ? AND (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC LIMIT 51
+            """,
+            ("completed", "2026-01-05 12:00:00", "wf-4")
+        )
+    detail = " ".join(row[3] for row in asyncio.run(plan()))
+    assert "idx_workflows_status_created" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_get_system_metrics_history():
+    """GET /metrics/system serves the cached snapshot and its history."""
+    response = client.get("/metrics/system", params={"window": 600})
+    assert response.status_code == 200
+    data = response.json()
+    assert "cpu_percent" in data["latest"]
+    assert isinstance(data["history"], list)
+
+
+def test_prometheus_metrics_exposition():
+    """GET /metrics/prometheus exposes route latency in text format."""
+    client.get("/flows/templates")
+    response = client.get("/metrics/prometheus")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert ("# TYPE fluxox_http_request_duration_seconds histogram"
+            in response.text)
+    assert 'route="/flows/templates"' in response.text
+    assert 'fluxox_queue_depth{queue="memory"}' in response.text
+
+
+def test_idempotency_key_replays_stored_responses():
+    """Repeating a keyed POST replays the first response, not the run."""
+    workflow_data = {
+        "name": "Keyed Flow", "description": "d", "input_data": {"query": "q"}}
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/flows", json=workflow_data, headers=headers)
+    runs = mock_orchestrator.execute_workflow.await_count
+    replay = client.post("/flows", json=workflow_data, headers=headers)
+    assert first.status_code == replay.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == first.json()
+    assert mock_orchestrator.execute_workflow.await_count == runs
+
+    reused = client.post(
+        "/flows", json={**workflow_data, "name": "Other"}, headers=headers)
+    assert reused.status_code == 422
+
+    execute_headers = {"Idempotency-Key": str(uuid.uuid4())}
+    body = {"workflow_id": "keyed-run", "input_data": {"query": "q"}}
+    first = client.post("/execute", json=body, headers=execute_headers)
+    replay = client.post("/execute", json=body, headers=execute_headers)
+    assert replay.json() == first.json()
+    assert mock_orchestrator.execute_workflow.await_count == runs + 1
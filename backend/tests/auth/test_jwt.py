@@ -12,7 +12,8 @@ from app.auth.jwt import (
     SECRET_KEY, ALGORITHM,
     verify_password, get_password_hash,
     authenticate_user, create_access_token,
-    verify_token, get_current_user, fake_users_db
+    verify_token, get_current_user, get_current_active_user, fake_users_db,
+    set_user_disabled, token_cache
 )
 
 
@@ -133,3 +134,73 @@ def test_get_current_user(mock_verify_token):
 
     # Verify that verify_token was called with the correct token
     mock_verify_token.assert_called_once_with("dummy_token")
+
+
+def test_get_current_user_caches_verified_tokens():
+    """A second request with the same token skips decode and user lookup."""
+    token_cache.clear()
+    token = create_access_token({"sub": "testuser"})
+    first = get_current_user(token)
+
+    with patch("jose.jwt.decode") as mock_decode, \
+            patch("app.auth.jwt.get_user") as mock_get_user:
+        assert get_current_user(token) is first
+        assert verify_token(token).username == "testuser"
+    mock_decode.assert_not_called()
+    mock_get_user.assert_not_called()
+
+
+def test_disabling_a_user_invalidates_cached_tokens():
+    """Cached tokens do not keep a disabled account active."""
+    token_cache.clear()
+    token = create_access_token({"sub": "testuser"})
+    user = get_current_active_user(get_current_user(token))
+    assert user.username == "testuser"
+
+    set_user_disabled("testuser")
+    try:
+        assert len(token_cache) == 0
+        with pytest.raises(HTTPException) as excinfo:
+            get_current_active_user(get_current_user(token))
+        assert excinfo.value.status_code == 400
+    finally:
+        set_user_disabled("testuser", False)
+
+
+def test_verify_token_fills_the_cache():
+    """Callers of verify_token alone (e.g. the rate limiter) decode once."""
+    token = create_access_token({"sub": "testuser"})
+    verify_token(token)
+    with patch("jose.jwt.decode") as mock_decode:
+        for _ in range(5):
+            assert verify_token(token).username == "testuser"
+    mock_decode.assert_not_called()
+    assert len(token_cache) == 1
+
+
+def test_tokens_without_exp_are_never_cached():
+    """Neither verify_token nor get_current_user caches a token sans exp."""
+    token = jwt.encode({"sub": "testuser"}, SECRET_KEY, algorithm=ALGORITHM)
+    verify_token(token)
+    get_current_user(token)
+    assert len(token_cache) == 0
+
+
+def test_cached_tokens_are_rechecked_after_max_age():
+    """Entries are capped so other workers see a disabled user promptly."""
+    token = create_access_token({"sub": "testuser"})
+    get_current_user(token)
+    later = time.time() + token_cache.max_age
+    with patch("app.auth.cache.time.time", return_value=later):
+        assert token_cache.get(token) is None
+
+
+def test_cached_token_expires_with_its_exp():
+    """Entries are only served until the token's own expiry."""
+    token_cache.clear()
+    token = create_access_token(
+        {"sub": "testuser"}, expires_delta=timedelta(seconds=30))
+    get_current_user(token)
+    with patch("app.auth.cache.time.time", return_value=time.time() + 60):
+        assert token_cache.get(token) is None
+    assert len(token_cache) == 0
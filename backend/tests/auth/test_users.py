@@ -0,0 +1,50 @@
+"""Tests for the persistent user store and off-loop password checks."""
+
+import threading
+
+import pytest
+from fastapi import HTTPException
+from unittest.mock import patch
+
+from app.auth.jwt import (
+    authenticate_user, get_password_hash, run_password_check
+)
+from app.auth.users import UserStore
+from app.config import config
+
+
+def test_store_seeds_defaults_and_persists_changes(tmp_path):
+    """Built-in accounts are seeded once; updates survive a reopen."""
+    path = str(tmp_path / "users.db")
+    store = UserStore(path)
+    assert set(store) == {"admin", "testuser"}
+    store.add("alice", get_password_hash("pw"), email="alice@fluxox.app")
+    store.set_disabled("testuser")
+    store.close()
+
+    reopened = UserStore(path)
+    assert len(reopened) == 3
+    assert reopened["testuser"]["disabled"] is True
+    assert "nobody" not in reopened
+    alice = authenticate_user(reopened, "alice", "pw")
+    assert alice.email == "alice@fluxox.app"
+    with pytest.raises(KeyError):
+        reopened.set_disabled("nobody")
+
+
+@pytest.mark.asyncio
+async def test_password_checks_run_off_the_event_loop():
+    """bcrypt runs on the password pool, not the loop's thread."""
+    thread = await run_password_check(lambda: threading.current_thread().name)
+    assert thread.startswith("bcrypt")
+
+
+@pytest.mark.asyncio
+async def test_login_storms_are_refused_beyond_the_limit():
+    """Over max_concurrent_logins, new logins fail fast with a 503."""
+    in_flight = config.auth.max_concurrent_logins
+    with patch("app.auth.jwt._logins_in_flight", in_flight):
+        with pytest.raises(HTTPException) as excinfo:
+            await run_password_check(authenticate_user, {}, "admin", "x")
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers["Retry-After"] == "1"
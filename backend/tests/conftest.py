@@ -0,0 +1,30 @@
+"""Shared test fixtures."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.auth.jwt import token_cache
+from app.database import init_db
+from app.flow.cache import step_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test without memoized step results or verified tokens
+    from earlier tests."""
+    step_cache.clear()
+    token_cache.clear()
+    yield
+    step_cache.clear()
+    token_cache.clear()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A freshly initialized database file that app.database points at."""
+    path = str(tmp_path / "fluxox.db")
+    with patch("app.database.DATABASE_URL", path):
+        asyncio.run(init_db())
+        yield path
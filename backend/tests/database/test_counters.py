@@ -0,0 +1,51 @@
+"""Tests for the trigger-maintained metrics counters."""
+
+import sqlite3
+
+import pytest
+
+from app.database import db, init_db
+from app.database.counters import (
+    TRIGGER_NAMES, execution_totals, workflow_counts
+)
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_inserts_updates_and_deletes(db_path):
+    """Status transitions and deletes move the per-status counts."""
+    for i in range(3):
+        await db.execute(
+            "INSERT INTO workflows (id, name, status) "
+            "VALUES (?, 'w', 'pending')", (f"wf-{i}",))
+    await db.execute(
+        "UPDATE workflows SET status = 'completed' "
+        "WHERE id IN ('wf-0', 'wf-1')")
+    await db.execute("UPDATE workflows SET status = 'error' WHERE id = 'wf-2'")
+    await db.execute("UPDATE workflows SET progress = 1 WHERE id = 'wf-2'")
+    await db.execute("DELETE FROM workflows WHERE id = 'wf-0'")
+
+    assert await workflow_counts(db) == {"completed": 1, "error": 1}
+
+    await db.execute_many(
+        "INSERT INTO workflow_executions "
+        "(workflow_id, status, execution_time) VALUES (?, ?, ?)",
+        [("wf-1", "completed", 1.0), ("wf-2", "error", 3.0)])
+    assert await execution_totals(db) == {"runs": 2, "avg_execution_time": 2.0}
+
+
+@pytest.mark.asyncio
+async def test_counters_are_rebuilt_once_for_existing_rows(db_path):
+    """Databases created before the triggers get their counts backfilled."""
+    with sqlite3.connect(db_path) as conn:
+        for name in TRIGGER_NAMES:
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.executemany(
+            "INSERT INTO workflows (id, name, status) VALUES (?, 'w', ?)",
+            [("a", "completed"), ("b", "completed"), ("c", "error")])
+
+    await init_db()
+    assert await workflow_counts(db) == {"completed": 2, "error": 1}
+
+    # A restart keeps (and does not double) the counts
+    await init_db()
+    assert await workflow_counts(db) == {"completed": 2, "error": 1}
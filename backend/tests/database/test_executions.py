@@ -0,0 +1,55 @@
+"""Tests for run and step execution recording."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.database import db
+from app.database.executions import ExecutionRecorder
+from app.flow.engine import FlowEngine
+
+
+@pytest.mark.asyncio
+async def test_engine_runs_are_recorded_in_batches(db_path):
+    """Each run writes one workflow row and one row per step."""
+    recorder = ExecutionRecorder(flush_interval=60)
+    engine = FlowEngine(use_mock=True)
+    with patch("app.flow.engine.execution_recorder", recorder):
+        for i in range(3):
+            result = await engine.execute_workflow(f"wf-{i}", {"query": "q"})
+    assert result["history"][0]["output_bytes"] > 0
+
+    # Nothing touches the database until the recorder flushes
+    assert await db.fetch_val("SELECT COUNT(*) FROM workflow_executions") == 0
+    await recorder.close()
+
+    runs = await db.fetch_all(
+        "SELECT status, execution_time, step_count, input_bytes, output_bytes "
+        "FROM workflow_executions")
+    assert len(runs) == 3
+    assert all(
+        r["status"] == "completed" and r["execution_time"] > 0 for r in runs)
+    assert all(r["step_count"] == 4 and r["input_bytes"] > 0 for r in runs)
+
+    steps = await db.fetch_all(
+        "SELECT agent_type, COUNT(*) AS n, AVG(execution_time) AS avg_time "
+        "FROM agent_executions GROUP BY agent_type")
+    assert {s["agent_type"]: s["n"] for s in steps} == {
+        "researcher": 3, "processor": 3, "approver": 3, "optimizer": 3}
+    assert all(s["avg_time"] > 0 for s in steps)
+
+
+@pytest.mark.asyncio
+async def test_recorder_flushes_periodically_and_sheds_when_full(db_path):
+    """The flush task writes buffered runs; a full buffer drops new ones."""
+    recorder = ExecutionRecorder(flush_interval=0.01, max_buffer=2)
+    for i in range(3):
+        recorder.record(f"wf-{i}", None, "error", 0.1, [], error="boom")
+    assert recorder.dropped == 1
+
+    await recorder.start()
+    await asyncio.sleep(0.05)
+    assert await db.fetch_val("SELECT COUNT(*) FROM workflow_executions") == 2
+    await recorder.close()
+    assert not recorder.started
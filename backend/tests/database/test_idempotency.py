@@ -0,0 +1,159 @@
+"""Tests for Idempotency-Key claims, waits and replays."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from unittest.mock import patch
+
+from app.api.idempotency import idempotent
+from app.database import db
+from app.database.idempotency import IdempotencyStore, idempotency_store
+
+
+@pytest.mark.asyncio
+async def test_in_flight_duplicates_wait_for_the_original(db_path):
+    """A duplicate arriving mid-run waits and receives the same response."""
+    calls = 0
+
+    async def run():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"run": calls}
+
+    first, second = await asyncio.gather(
+        idempotent("scope", "k", "fp", run),
+        idempotent("scope", "k", "fp", run))
+    assert calls == 1
+    assert json.loads(first.body) == {"run": 1}
+    assert json.loads(second.body) == {"run": 1}
+    replayed = [r.headers.get("idempotent-replayed") for r in (first, second)]
+    assert sorted(replayed, key=str) == [None, "true"]
+
+
+@pytest.mark.asyncio
+async def test_failures_release_the_key_and_rows_expire(db_path):
+    """A failed run can be retried; expired responses are not replayed."""
+    async def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await idempotent("scope", "k", "fp", boom)
+    assert await db.fetch_val("SELECT COUNT(*) FROM idempotency_keys") == 0
+
+    async def ok():
+        return {"ok": True}
+
+    await idempotent("scope", "k", "fp", ok)
+    with patch("app.database.idempotency.time.time", return_value=10**12):
+        claimed, _ = await idempotency_store.claim("scope", "k", "fp")
+    assert claimed
+
+
+@pytest.mark.asyncio
+async def test_claims_outliving_the_lock_are_renewed_and_owned(db_path):
+    """A run outliving the lock keeps its key; stale owners can't touch it."""
+    store = IdempotencyStore(lock_seconds=0.15, poll_interval=0.01)
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.4)
+        return {"run": calls}
+
+    with patch("app.api.idempotency.idempotency_store", store):
+        responses = await asyncio.gather(*(
+            idempotent("scope", "slow", "fp", slow) for _ in range(3)))
+    assert calls == 1
+    assert {json.loads(r.body)["run"] for r in responses} == {1}
+
+    first, _ = await store.claim("scope", "owned", "fp")
+    await db.execute(
+        "UPDATE idempotency_keys SET expires_at = 0 WHERE key = 'owned'")
+    second, _ = await store.claim("scope", "owned", "fp")
+    await store.release("scope", "owned", first)  # Stale owner
+    await store.complete("scope", "owned", first, 200, {}, "{}")
+    assert (await store.claim("scope", "owned", "fp"))[0] is None
+    row = await db.fetch_one(
+        "SELECT owner, state FROM idempotency_keys WHERE key = 'owned'")
+    assert (row["owner"], row["state"]) == (second, "in_progress")
+    assert not store._events
+
+
+@pytest.mark.asyncio
+async def test_a_claim_whose_row_vanishes_is_retried(db_path):
+    """A row released between insert and read is claimed afresh."""
+    store = IdempotencyStore(poll_interval=0.01)
+    read = store._read
+    reads = 0
+
+    async def racing_read(scope, key):
+        nonlocal reads
+        reads += 1
+        if reads == 2:
+            # The row's owner releases it right after our insert
+            await db.execute("DELETE FROM idempotency_keys")
+        return await read(scope, key)
+
+    async def run():
+        return {"ok": True}
+
+    with patch.object(store, "_read", racing_read):
+        assert await store.claim("scope", "k", "fp") == (None, None)
+        with patch("app.api.idempotency.idempotency_store", store):
+            await idempotent("scope", "k", "fp", run)
+    row = await db.fetch_one(
+        "SELECT state FROM idempotency_keys WHERE key = 'k'")
+    assert row["state"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_waiting_duplicates_poll_without_writing(db_path):
+    """A duplicate of an in-flight key only reads until the key is free."""
+    store = IdempotencyStore(poll_interval=0.01)
+
+    async def slow():
+        await asyncio.sleep(0.3)
+        return {"ok": True}
+
+    async def duplicate():
+        await asyncio.sleep(0.05)
+        return await idempotent("scope", "k", "fp", slow)
+
+    with patch("app.api.idempotency.idempotency_store", store), \
+            patch.object(db, "execute", wraps=db.execute) as execute:
+        await asyncio.gather(idempotent("scope", "k", "fp", slow), duplicate())
+    # The first claim's delete and insert, then its completion
+    assert execute.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_error_results_release_the_key(db_path):
+    """A flow that ends in error is not replayed; a retry runs again."""
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        return {"status": "error", "error": "agent down"}
+
+    for _ in range(2):
+        response = await idempotent("scope", "k", "fp", failing)
+        assert "idempotent-replayed" not in response.headers
+    assert calls == 2
+    assert await db.fetch_val("SELECT COUNT(*) FROM idempotency_keys") == 0
+
+
+@pytest.mark.asyncio
+async def test_keys_are_validated(db_path):
+    """Empty or oversized keys are rejected before anything runs."""
+    async def run():
+        return {}
+
+    for key in ("", "x" * 256):
+        with pytest.raises(HTTPException) as excinfo:
+            await idempotent("scope", key, "fp", run)
+        assert excinfo.value.status_code == 400
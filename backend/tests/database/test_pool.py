@@ -0,0 +1,65 @@
+"""Tests for the pooled Database connections."""
+
+import pytest
+from unittest.mock import patch
+
+from app.database import Database
+from app.database.pool import ConnectionPool
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections_with_pragmas(db_path):
+    """Queries share the pool's connections, configured once."""
+    pool = ConnectionPool(db_path, size=2, pragmas={"busy_timeout": 1234})
+    await pool.start()
+
+    seen = set()
+    for _ in range(10):
+        async with pool.acquire() as conn:
+            seen.add(id(conn))
+            async with conn.execute("PRAGMA busy_timeout") as cursor:
+                assert (await cursor.fetchone())[0] == 1234
+
+    assert len(seen) == 2
+    await pool.close()
+    assert not pool.started
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_broken_connections(db_path):
+    """A connection closed behind the pool's back is reopened."""
+    pool = ConnectionPool(db_path, size=1, health_check_after=0)
+    await pool.start()
+    async with pool.acquire() as conn:
+        await conn.close()
+
+    async with pool.acquire() as conn:
+        async with conn.execute("SELECT 1") as cursor:
+            assert (await cursor.fetchone())[0] == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_database_uses_pool_and_falls_back(db_path):
+    """Database works with and without a started pool."""
+    with patch("app.database.DATABASE_URL", db_path):
+        database = Database()
+        await database.execute(
+            "INSERT INTO workflows (id, name, status) VALUES (?, ?, ?)",
+            ("wf-1", "one", "pending"))
+
+        await database.connect()
+        await database.execute(
+            "INSERT INTO workflows (id, name, status) VALUES (?, ?, ?)",
+            ("wf-2", "two", "pending"))
+        with pytest.raises(Exception):
+            await database.execute(
+                "INSERT INTO workflows (id, name, status) VALUES (?, ?, ?)",
+                ("wf-2", "duplicate", "pending"))
+
+        row = await database.fetch_one(
+            "SELECT name FROM workflows WHERE id = ?", ("wf-1",))
+        assert row["name"] == "one"
+        assert await database.fetch_val("SELECT COUNT(*) FROM workflows") == 2
+        assert await database.ping() is True
+        await database.close()
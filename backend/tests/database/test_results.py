@@ -0,0 +1,62 @@
+"""Tests for compressed workflow result storage."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.database.results import ResultStore
+
+
+@pytest.fixture
+def store(db_path, tmp_path):
+    return ResultStore(directory=str(tmp_path / "results"), spill_bytes=1000)
+
+
+@pytest.mark.asyncio
+async def test_small_result_is_compressed_inline(store):
+    """Small results round-trip through a compressed BLOB."""
+    result = {"research_results": {"summary": "ok" * 100}}
+    await store.save("wf", result)
+
+    info = await store.info("wf")
+    assert info["path"] is None
+    assert info["stored_size"] < info["size"]
+    assert await store.load("wf") == result
+
+
+@pytest.mark.asyncio
+async def test_large_result_spills_to_a_streamed_file(store):
+    """Large results go to a content-addressed file and are streamed back."""
+    result = {"rows": [{"id": i, "text": f"row {i}"} for i in range(2000)]}
+    await store.save("wf-1", result)
+    await store.save("wf-2", result)
+
+    info = await store.info("wf-1")
+    assert info["path"] and os.path.exists(info["path"])
+    assert (await store.info("wf-2"))["path"] == info["path"]
+    assert await store.load("wf-1") is None
+
+    chunks = list(await store.stream("wf-1"))
+    assert len(chunks) >= 1
+    assert json.loads(b"".join(chunks)) == result
+
+    await store.delete("wf-1")
+    assert os.path.exists(info["path"])
+    await store.delete("wf-2")
+    assert not os.path.exists(info["path"])
+    assert await store.stream("wf-2") is None
+
+
+@pytest.mark.asyncio
+async def test_saving_shared_content_races_safely_with_delete(store):
+    """A file being unreferenced is never removed under a concurrent save."""
+    result = {"rows": [{"id": i, "text": f"row {i}"} for i in range(2000)]}
+    for _ in range(5):
+        await store.save("old", result)
+        await asyncio.gather(store.delete("old"), store.save("new", result))
+        info = await store.info("new")
+        assert os.path.exists(info["path"])
+        assert json.loads(b"".join(await store.stream("new"))) == result
+        await store.delete("new")
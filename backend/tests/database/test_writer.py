@@ -0,0 +1,70 @@
+"""Tests for the group-commit writer."""
+
+import asyncio
+import sqlite3
+
+import pytest
+from unittest.mock import patch
+
+from app.database import Database
+from app.database.writer import GroupCommitWriter
+
+INSERT = "INSERT INTO workflows (id, name, status) VALUES (?, 'w', 'pending')"
+
+
+def _count(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM workflows").fetchone()[0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_commits(db_path):
+    """Queued writes are committed together and awaited individually."""
+    writer = GroupCommitWriter(db_path)
+    await writer.start()
+    await asyncio.gather(
+        *(writer.submit(INSERT, (f"wf-{i}",)) for i in range(200)))
+
+    assert _count(db_path) == 200
+    assert writer.statements == 200
+    assert writer.commits < 200
+    # Committed writes are fsynced (2 = FULL), whatever readers use
+    synchronous = await asyncio.get_running_loop().run_in_executor(
+        writer._executor,
+        lambda: writer._conn.execute("PRAGMA synchronous").fetchone()[0])
+    assert synchronous == 2
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_failing_write_only_fails_its_caller(db_path):
+    """A constraint error is raised to its caller; the batch still commits."""
+    writer = GroupCommitWriter(db_path)
+    await writer.start()
+    results = await asyncio.gather(
+        writer.submit(INSERT, ("dup",)),
+        writer.submit(INSERT, ("dup",)),
+        writer.submit(INSERT, ("other",)),
+        return_exceptions=True
+    )
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert _count(db_path) == 2
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_database_unawaited_writes_are_flushed_on_close(db_path):
+    """wait=False writes are committed by the time the database closes."""
+    with patch("app.database.DATABASE_URL", db_path):
+        database = Database()
+        await database.connect()
+        assert database.writer is not None
+        for i in range(50):
+            await database.execute(INSERT, (f"wf-{i}",), wait=False)
+        await database.close()
+
+    assert _count(db_path) == 50
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -0,0 +1,41 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from app.flow.engine import FlowEngine
+from app.monitoring.metrics import (
+    AGENT_LATENCY, WORKFLOWS_TOTAL, Counter, Histogram, Registry
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Histograms render cumulative buckets, +Inf, sum and count."""
+    registry = Registry()
+    latency = registry.register(
+        Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1)))
+    calls = registry.register(Counter("t_total", "Test.", ("route",)))
+    for value in (0.05, 0.5, 5):
+        latency.observe(value, '/a"b')
+    calls.inc("/a", amount=2)
+
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{route="/a\\"b",le="0.1"} 1' in text
+    assert 't_seconds_bucket{route="/a\\"b",le="1"} 2' in text
+    assert 't_seconds_bucket{route="/a\\"b",le="+Inf"} 3' in text
+    assert 't_seconds_count{route="/a\\"b"} 3' in text
+    assert 't_total{route="/a"} 2' in text
+    assert latency.snapshot('/a"b')["p50"] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_records_workflow_and_agent_metrics():
+    """A run updates the workflow counter and per-agent histograms."""
+    before = WORKFLOWS_TOTAL.value("data-analysis", "completed")
+    researcher_calls = AGENT_LATENCY.snapshot("researcher", "ok")["count"]
+
+    await FlowEngine(use_mock=True).execute_workflow("wf", {"query": "q"})
+
+    assert WORKFLOWS_TOTAL.value("data-analysis", "completed") == before + 1
+    researcher = AGENT_LATENCY.snapshot("researcher", "ok")
+    assert researcher["count"] == researcher_calls + 1
@@ -0,0 +1,35 @@
+"""Tests for the background system metrics sampler."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.monitoring.system import SystemSampler
+
+
+@pytest.mark.asyncio
+async def test_sampler_fills_a_bounded_ring_buffer():
+    """Samples accumulate in the background up to the history size."""
+    sampler = SystemSampler(interval=0.01, history_size=3)
+    await sampler.start()
+    await asyncio.sleep(0.1)
+    await sampler.close()
+
+    history = sampler.history()
+    assert len(history) == 3
+    assert history[0]["monotonic"] < history[-1]["monotonic"]
+    assert sampler.latest() is history[-1]
+    assert {"cpu_percent", "memory_percent", "disk_percent",
+            "process_rss_bytes"} <= set(sampler.latest())
+
+
+def test_latest_does_not_block():
+    """Reading a snapshot never waits on a CPU measurement interval."""
+    sampler = SystemSampler(interval=60)
+    started = time.perf_counter()
+    for _ in range(100):
+        sampler.latest()
+    assert time.perf_counter() - started < 0.1
+    assert sampler.history(window_seconds=60) == sampler.history()
+    assert sampler.history(window_seconds=1e-9) == []
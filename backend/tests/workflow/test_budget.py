@@ -0,0 +1,58 @@
+"""Tests for per-run iteration and agent-call budgets."""
+
+import pytest
+from unittest.mock import patch
+
+from app.agents.approver import ApproverAgent
+from app.flow.budget import FlowBudget
+from app.flow.engine import FlowEngine
+from app.flow.retry import StepPolicy
+
+
+@pytest.mark.asyncio
+async def test_persistent_rejection_fails_once_iterations_run_out():
+    """A never-satisfied approver ends the run after max_iterations rounds."""
+    async def reject(self, data, context=None):
+        return {"approved": False, "feedback": "Try again"}
+
+    engine = FlowEngine(use_mock=False)
+    with patch.object(ApproverAgent, "process", reject):
+        state = await engine.execute_workflow(
+            "wf-reject", {"query": "never good enough"},
+            budget=FlowBudget(max_iterations=2))
+
+    assert state["status"] == "error"
+    assert "iteration budget" in state["error"]
+    steps = [(e["step"], e.get("iteration")) for e in state["history"]]
+    assert steps == [("research", 1), ("process", 1), ("approve", 1),
+                     ("process", 2), ("approve", 2), ("workflow", None)]
+    last = state["history"][-1]
+    assert (last["status"], last["budget"], last["limit"], last["used"]) == (
+        "budget_exceeded", "iteration", 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_agent_call_budget_stops_the_run_without_retrying():
+    """The call that would exceed the budget fails the run at once."""
+    engine = FlowEngine(use_mock=True)
+    engine.policy = StepPolicy(max_retries=3, backoff_base=0.001)
+    state = await engine.execute_workflow(
+        "wf-calls", {"query": "call budget"},
+        budget=FlowBudget(max_agent_calls=2))
+
+    assert state["status"] == "error"
+    approve = next(e for e in state["history"] if e["step"] == "approve")
+    assert approve["status"] == "error" and approve["attempts"] == 1
+    assert state["history"][-1]["budget"] == "agent call"
+    assert "optimize" not in {e["step"] for e in state["history"]}
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_do_not_count_against_the_call_budget():
+    """A repeated run served from the step cache fits a smaller budget."""
+    engine = FlowEngine(use_mock=True)
+    await engine.execute_workflow("wf-warm", {"query": "cached calls"})
+    state = await engine.execute_workflow(
+        "wf-cached", {"query": "cached calls"},
+        budget=FlowBudget(max_agent_calls=2))
+    assert state["status"] == "completed"
@@ -0,0 +1,60 @@
+"""Tests for the FlowEngine pool."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.flow.engine import FlowEngine
+from app.flow.pool import EnginePool
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_builds_engines_once():
+    """Engines are built at start and reused across leases."""
+    pool = EnginePool(size=2, use_mock=True, engine_factory=FlowEngine)
+    with patch('app.flow.engine.FlowEngine._build_graph') as mock_build:
+        pool.start()
+        pool.start()
+        assert mock_build.call_count == 2
+
+        seen = set()
+        for _ in range(5):
+            async with pool.lease() as engine:
+                seen.add(id(engine))
+        assert mock_build.call_count == 2
+        assert len(seen) <= 2
+    await pool.close()
+    assert not pool.started
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_shares_engines_and_bounds_runs():
+    """Leases share engines round-robin; max_runs caps runs in flight."""
+    pool = EnginePool(
+        size=2, use_mock=True, engine_factory=FlowEngine, max_runs=3)
+    engines = []
+    in_flight = peak = 0
+
+    async def run():
+        nonlocal in_flight, peak
+        async with pool.lease() as engine:
+            engines.append(id(engine))
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(run() for _ in range(8)))
+    assert peak == 3
+    assert len(set(engines)) == 2 and engines[0] == engines[2]
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_executes_workflow():
+    """A leased engine runs a mock workflow end to end."""
+    pool = EnginePool(size=1, use_mock=True, engine_factory=FlowEngine)
+    async with pool.lease() as engine:
+        result = await engine.execute_workflow("pool-test", {"query": "test"})
+    assert result["status"] == "completed"
+    assert "research_results" in result["result"]
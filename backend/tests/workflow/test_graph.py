@@ -0,0 +1,67 @@
+"""Tests for the LangGraph flow backend."""
+
+import pytest
+from unittest.mock import patch
+
+from app.agents.approver import ApproverAgent
+from app.agents.processor import ProcessorAgent
+from app.flow.engine import FlowEngine
+from app.flow.graph import build_graph
+from app.flow.templates import steps_from_template
+
+
+@pytest.mark.asyncio
+async def test_default_template_runs_on_langgraph():
+    """Linear templates run through the compiled graph's async stream."""
+    engine = FlowEngine(use_mock=False)
+    assert engine.native_graph
+
+    with patch.object(engine, "_run_mock") as scheduler:
+        state = await engine.execute_workflow("wf-graph", {"query": "graph"})
+    scheduler.assert_not_called()
+
+    assert state["status"] == "completed"
+    assert [e["step"] for e in state["history"]] == [
+        "research", "process", "approve", "optimize"]
+    assert set(state["result"]) == {
+        "research_results", "processed_data", "approval", "optimization"}
+
+
+@pytest.mark.asyncio
+async def test_rejection_routes_back_to_the_reviewed_step():
+    """A rejected step reruns with the feedback, then the flow continues."""
+    decisions = iter([
+        {"approved": False, "feedback": "Needs sources"},
+        {"approved": True, "feedback": "Fine"}])
+    seen = []
+    process = ProcessorAgent.process
+
+    async def approve(self, data, context=None):
+        return next(decisions)
+
+    async def record(self, data, context=None):
+        seen.append(data.get("review"))
+        return await process(self, data, context)
+
+    engine = FlowEngine(use_mock=False)
+    with patch.object(ApproverAgent, "process", approve), \
+            patch.object(ProcessorAgent, "process", record):
+        state = await engine.execute_workflow("wf-revise", {"query": "revise"})
+
+    assert [e["step"] for e in state["history"]] == [
+        "research", "process", "approve", "process", "approve", "optimize"]
+    assert seen == [None, "Needs sources"]
+    assert state["result"]["approval"]["approved"] is True
+
+
+@pytest.mark.asyncio
+async def test_fan_in_templates_stay_on_the_scheduler():
+    """Steps with several dependencies have no graph; the scheduler runs
+    them."""
+    assert build_graph(steps_from_template("market-research")) is None
+
+    engine = FlowEngine(use_mock=False)
+    state = await engine.execute_workflow(
+        "wf-fan-in", {"query": "markets"}, template_id="market-research")
+    assert state["status"] == "completed"
+    assert {"market_research", "competitor_research"} <= set(state["result"])
@@ -0,0 +1,160 @@
+"""Tests for the durable SQLite job queue and its worker."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.database import db
+from app.database.counters import workflow_counts
+from app.database.queue import LEASE_EXPIRED, JobQueue
+from app.flow.engine import FlowEngine
+from app.flow.jobs import run_workflow_job
+from app.flow.pool import EnginePool
+from app.worker import Worker
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_each_job_once(db_path):
+    """Concurrent claimers never get the same job."""
+    queue = JobQueue(db_path)
+    for i in range(5):
+        await queue.enqueue(f"wf-{i}", {"query": "q"})
+
+    workers = [JobQueue(db_path) for _ in range(3)]
+    claims = await asyncio.gather(*(
+        w.claim(f"worker-{n % 3}") for n, w in enumerate(workers * 3)))
+    claimed = [job.workflow_id for job in claims if job is not None]
+
+    assert sorted(claimed) == [f"wf-{i}" for i in range(5)]
+    assert await queue.depth() == 0
+    for w in workers + [queue]:
+        await w.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_claimed_again(db_path):
+    """A job whose worker stopped heartbeating goes to another worker."""
+    queue = JobQueue(db_path)
+    await queue.enqueue("wf", {"query": "q"}, template_id="content-generation")
+
+    first = await queue.claim("crashed", lease_seconds=0.01)
+    await asyncio.sleep(0.02)
+    second = await queue.claim("alive")
+
+    assert second.id == first.id
+    assert second.template_id == "content-generation"
+    assert second.attempts == 2
+    assert await queue.heartbeat(first.id, "crashed") is False
+    assert await queue.heartbeat(second.id, "alive") is True
+    assert await queue.complete(second.id, "alive") is True
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_final_attempt_fails_the_workflow(db_path):
+    """A worker crashing on the last attempt leaves no workflow running."""
+    await db.execute(
+        "INSERT INTO workflows (id, name, status) "
+        "VALUES ('wf', 'w', 'running')")
+    queue = JobQueue(db_path)
+    await queue.enqueue("wf", {"query": "q"}, max_attempts=1)
+
+    await queue.claim("crashed", lease_seconds=0.01)
+    await asyncio.sleep(0.02)
+    assert await queue.claim("alive") is None
+
+    row = await db.fetch_one("SELECT status, error FROM workflows")
+    assert (row["status"], row["error"]) == ("error", LEASE_EXPIRED)
+    assert await workflow_counts(db) == {"error": 1}
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_fail_requeues_until_max_attempts(db_path):
+    """Failed jobs are retried, then marked failed after max_attempts."""
+    queue = JobQueue(db_path)
+    await queue.enqueue("wf", {"query": "q"}, max_attempts=2)
+
+    job = await queue.claim("w")
+    await queue.fail(job.id, "w", "boom")
+    job = await queue.claim("w")
+    assert job.attempts == 2
+    await queue.fail(job.id, "w", "boom again")
+
+    assert await queue.claim("w") is None
+    assert await queue.depth() == 0
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_drains_queue(db_path):
+    """A burst-mode worker runs every queued job and settles it."""
+    queue = JobQueue(db_path)
+    for i in range(3):
+        await queue.enqueue(f"wf-{i}", {"query": "q"})
+
+    async def fake_job(
+        workflow_id, input_data, template_id=None, final_attempt=True
+    ):
+        return {"workflow_id": workflow_id, "status": "completed"}
+
+    worker = Worker(queue, concurrency=2, exit_when_idle=True)
+    with patch("app.worker.run_workflow_job", fake_job):
+        await worker.run()
+
+    assert worker.processed == 3
+    assert await queue.depth() == 0
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_only_the_last_attempt_records_an_error(db_path):
+    """Retryable failures leave the workflow pending; permanent ones fail
+    it."""
+    for workflow_id in ("wf-retry", "wf-bad-template"):
+        await db.execute(
+            "INSERT INTO workflows (id, name, status) "
+            "VALUES (?, ?, 'pending')",
+            (workflow_id, workflow_id))
+
+    async def flaky(self, workflow_id, *args, **kwargs):
+        return {"workflow_id": workflow_id, "status": "error",
+                "error": "agent down", "history": [], "retryable": True}
+
+    with patch("app.flow.jobs.engine_pool", EnginePool(1, True, FlowEngine)):
+        with patch("app.flow.engine.FlowEngine.execute_workflow", flaky):
+            await run_workflow_job(
+                "wf-retry", {"query": "q"}, final_attempt=False)
+        result = await run_workflow_job(
+            "wf-bad-template", {"query": "q"}, "no-such-template",
+            final_attempt=False)
+
+    assert result["retryable"] is False
+    rows = await db.fetch_all(
+        "SELECT id, status FROM workflows WHERE id LIKE 'wf-%'")
+    assert {row["id"]: row["status"] for row in rows} == {
+        "wf-retry": "pending", "wf-bad-template": "error"}
+
+
+@pytest.mark.asyncio
+async def test_permanent_failures_are_not_retried(db_path):
+    """A non-retryable result fails the job on its first attempt."""
+    queue = JobQueue(db_path)
+    await queue.enqueue("wf", {"query": "q"}, max_attempts=3)
+    attempts = 0
+
+    async def bad_job(
+        workflow_id, input_data, template_id=None, final_attempt=True
+    ):
+        nonlocal attempts
+        attempts += 1
+        return {"status": "error", "error": "Unknown flow template",
+                "retryable": False}
+
+    with patch("app.worker.run_workflow_job", bad_job):
+        await Worker(queue, exit_when_idle=True).run()
+
+    assert attempts == 1
+    assert await queue.depth() == 0
+    await queue.close()
@@ -0,0 +1,108 @@
+"""Tests for step timeouts, retries and hedging."""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.agents.processor import ProcessorAgent
+from app.flow.engine import FlowEngine
+from app.flow.retry import StepPolicy, StepTimeoutError, run_with_policy
+
+
+@pytest.mark.asyncio
+async def test_run_with_policy_retries_transient_errors():
+    """A failing attempt is retried with backoff and reported."""
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise RuntimeError("transient")
+        return "ok"
+
+    policy = StepPolicy(max_retries=3, backoff_base=0.001, backoff_max=0.01)
+    result, report = await run_with_policy(flaky, policy)
+
+    assert result == "ok"
+    assert report["attempts"] == 3
+    assert report["retries"] == 2
+    assert report["last_error"] == "transient"
+
+
+@pytest.mark.asyncio
+async def test_run_with_policy_times_out_each_attempt():
+    """Exhausted timeouts raise StepTimeoutError carrying the report."""
+    async def slow():
+        await asyncio.sleep(1)
+
+    policy = StepPolicy(timeout=0.01, max_retries=1, backoff_base=0.001)
+    with pytest.raises(StepTimeoutError) as excinfo:
+        await run_with_policy(slow, policy)
+
+    assert excinfo.value.report["attempts"] == 2
+    assert excinfo.value.report["timeouts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_with_policy_hedges_stragglers():
+    """A duplicate attempt is raced once the first one straggles."""
+    delays = [1.0, 0.01]
+
+    async def straggler():
+        await asyncio.sleep(delays.pop(0))
+        return "done"
+
+    policy = StepPolicy(timeout=0.5, hedge_after=0.02)
+    started = time.perf_counter()
+    result, report = await run_with_policy(straggler, policy)
+
+    assert result == "done"
+    assert time.perf_counter() - started < 0.5
+    assert report["hedged"] is True
+    assert report["hedge_won"] is True
+
+
+@pytest.mark.asyncio
+async def test_engine_reports_retries_in_history():
+    """Step retries show up in the workflow history."""
+    original = ProcessorAgent.process
+    calls = 0
+
+    async def flaky_process(self, input_data, context=None):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("transient")
+        return await original(self, input_data, context)
+
+    engine = FlowEngine(use_mock=True)
+    engine.policy = StepPolicy(max_retries=2, backoff_base=0.001)
+    with patch.object(ProcessorAgent, "process", flaky_process):
+        result = await engine.execute_workflow("wf", {"query": "q"})
+
+    assert result["status"] == "completed"
+    process_entry = next(
+        e for e in result["history"] if e["step"] == "process")
+    assert process_entry["attempts"] == 2
+    assert process_entry["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_enforces_workflow_deadline():
+    """A workflow past timeout_seconds fails with a timeout in history."""
+    async def stuck(self, input_data, context=None):
+        await asyncio.sleep(5)
+
+    engine = FlowEngine(use_mock=True)
+    engine.policy = StepPolicy(max_retries=0)
+    with patch.object(ProcessorAgent, "process", stuck), \
+            patch("app.flow.engine.config.workflow.timeout_seconds", 0.05):
+        result = await engine.execute_workflow("wf", {"query": "q"})
+
+    assert result["status"] == "error"
+    assert "deadline" in result["error"]
+    assert result["history"][-1]["status"] == "timeout"
+    assert any(e["step"] == "research" for e in result["history"])
@@ -0,0 +1,105 @@
+"""Tests for the DAG step scheduler."""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.agents.researcher import ResearcherAgent
+from app.flow.engine import FlowEngine
+from app.flow.scheduler import DagScheduler, FlowStep, validate_steps
+from app.flow.templates import steps_from_template
+
+
+def test_validate_steps_rejects_cycles_and_unknown_dependencies():
+    """Invalid step graphs are rejected before anything runs."""
+    with pytest.raises(ValueError, match="cycle"):
+        validate_steps([
+            FlowStep(name="a", agent="processor", depends_on=["b"]),
+            FlowStep(name="b", agent="processor", depends_on=["a"])
+        ])
+    with pytest.raises(ValueError, match="unknown"):
+        validate_steps(
+            [FlowStep(name="a", agent="processor", depends_on=["x"])])
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_independent_steps_concurrently():
+    """Latency follows the critical path, not the sum of all steps."""
+    order = []
+
+    async def run_step(step, completed):
+        order.append(step.name)
+        await asyncio.sleep(0.05)
+        return {"deps": sorted(completed)}
+
+    steps = [
+        FlowStep(name="a", agent="researcher"),
+        FlowStep(name="b", agent="researcher"),
+        FlowStep(name="c", agent="researcher"),
+        FlowStep(name="join", agent="processor", depends_on=["a", "b", "c"])
+    ]
+    started = time.perf_counter()
+    results, history = await DagScheduler(run_step).run(steps)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.15  # two levels of 50 ms, not four
+    assert order[-1] == "join"
+    assert results["join"] == {"deps": ["a", "b", "c"]}
+    assert [entry["step"] for entry in history][-1] == "join"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_failure_cancels_running_steps():
+    """The first failing step propagates and cancels its siblings."""
+    cancelled = asyncio.Event()
+
+    async def run_step(step, completed):
+        if step.name == "bad":
+            raise RuntimeError("step failed")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    steps = [FlowStep(name="bad", agent="processor"),
+             FlowStep(name="slow", agent="processor")]
+    with pytest.raises(RuntimeError, match="step failed"):
+        await DagScheduler(run_step).run(steps)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_engine_runs_parallel_research_template():
+    """The market-research template runs its research branches concurrently."""
+    original = ResearcherAgent.process
+
+    async def slow_research(self, input_data, context=None):
+        await asyncio.sleep(0.1)
+        return await original(self, input_data, context)
+
+    engine = FlowEngine(use_mock=True)
+    with patch.object(ResearcherAgent, "process", slow_research):
+        started = time.perf_counter()
+        result = await engine.execute_workflow(
+            "wf", {"query": "q"}, "market-research")
+        elapsed = time.perf_counter() - started
+
+    assert result["status"] == "completed"
+    assert elapsed < 0.2
+    assert {"market_research", "competitor_research", "processed_data"} <= (
+        set(result["result"]))
+    steps = steps_from_template("market-research")
+    assert len(result["history"]) == len(steps)
+
+
+@pytest.mark.asyncio
+async def test_engine_unknown_template_returns_error():
+    """An unknown template yields a well-formed error result."""
+    engine = FlowEngine(use_mock=True)
+    result = await engine.execute_workflow(
+        "wf", {"query": "q"}, "no-such-template")
+    assert result["status"] == "error"
+    assert "Unknown flow template" in result["error"]
@@ -0,0 +1,69 @@
+"""Tests for single-flight deduplication of identical executions."""
+
+import asyncio
+
+import pytest
+
+from app.api.execute import ExecuteRequest, _run_shared
+from app.flow.singleflight import SingleFlight, execution_key
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_run():
+    """Identical in-flight requests run once; each keeps its workflow_id."""
+    calls = 0
+
+    async def run():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"workflow_id": "wf-1", "status": "completed",
+                "result": {"n": [1]}}
+
+    requests = [
+        ExecuteRequest(workflow_id=f"wf-{i}", input_data={"query": "q"})
+        for i in (1, 2, 3)
+    ]
+    results = await asyncio.gather(*(_run_shared(r, run) for r in requests))
+
+    assert calls == 1
+    assert [r["workflow_id"] for r in results] == ["wf-1", "wf-2", "wf-3"]
+    assert "deduplicated_from" not in results[0]
+    assert results[1]["deduplicated_from"] == "wf-1"
+    results[1]["result"]["n"].append(2)  # Joiners get copies
+    assert results[0]["result"]["n"] == [1]
+
+    # Finished flights are not reused
+    await _run_shared(requests[0], run)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_distinct_inputs_and_templates_run_separately():
+    """Keys normalize key order but separate inputs and templates."""
+    assert execution_key({"a": 1, "b": 2}, None) == execution_key(
+        {"b": 2, "a": 1}, "data-analysis")
+    assert execution_key({"a": 1}, None) != execution_key({"a": 2}, None)
+    assert execution_key({"a": 1}, None) != execution_key({"a": 1}, "other")
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_leader_cancellation_is_isolated():
+    """A failure reaches every joiner; a cancelled caller doesn't stop it."""
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    first = asyncio.create_task(flights.do("k", "a", failing))
+    second = asyncio.create_task(flights.do("k", "b", failing))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await second
+    assert first.cancelled()
+    assert len(flights) == 0
@@ -0,0 +1,86 @@
+"""Tests for step-result memoization."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.agents.approver import ApproverAgent
+from app.agents.processor import ProcessorAgent
+from app.agents.researcher import ResearcherAgent
+from app.database import init_db
+from app.flow.cache import StepCache, step_key
+from app.flow.engine import FlowEngine
+
+
+@pytest.mark.asyncio
+async def test_identical_steps_are_served_from_the_cache():
+    """A repeated run reuses researcher/processor results and says so in
+    history."""
+    engine = FlowEngine(use_mock=True)
+    first = await engine.execute_workflow("wf-1", {"query": "cache me"})
+
+    with patch.object(ResearcherAgent, "process") as research:
+        second = await engine.execute_workflow("wf-2", {"query": "cache me"})
+    research.assert_not_called()
+
+    cache = {e["step"]: e.get("cache") for e in second["history"]}
+    assert cache == {
+        "research": "hit", "process": "hit", "approve": None, "optimize": None}
+    assert first["history"][0]["cache"] == "miss"
+    assert (second["result"]["research_results"]
+            == first["result"]["research_results"])
+
+
+@pytest.mark.asyncio
+async def test_keys_cover_agent_identity_and_input():
+    """Different inputs or agent settings never share an entry."""
+    researcher = ResearcherAgent()
+    assert step_key(researcher, {"a": 1, "b": 2}) == step_key(
+        ResearcherAgent(), {"b": 2, "a": 1})
+    assert step_key(researcher, {"a": 1}) != step_key(researcher, {"a": 2})
+    assert step_key(researcher, {"a": 1}) != step_key(
+        ProcessorAgent(), {"a": 1})
+    assert step_key(researcher, {"a": object()}) is None
+
+    cache = StepCache(max_entries=10, ttl=60, persist=False, enabled=True)
+    approver = ApproverAgent()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"approved": True}
+
+    for _ in range(2):
+        result = await cache.call(approver, {"x": 1}, compute)
+        assert result == ({"approved": True}, None)
+    assert len(calls) == 2 and len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_are_bounded():
+    """Entries past their TTL miss; the LRU keeps at most max_entries."""
+    cache = StepCache(max_entries=2, ttl=60, persist=False, enabled=True)
+    for key in ("a", "b", "c"):
+        await cache.put(key, {"key": key})
+    assert len(cache) == 2 and await cache.get("a") is None
+
+    hit = await cache.get("b")
+    hit["key"] = "mutated"  # Hits are copies
+    assert await cache.get("b") == {"key": "b"}
+
+    with patch("app.flow.cache.time.time", return_value=10**12):
+        assert await cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_survives_a_new_process(tmp_path):
+    """With persistence on, a fresh cache finds entries in the database."""
+    with patch("app.database.DATABASE_URL", str(tmp_path / "cache.db")):
+        await init_db()
+        await StepCache(ttl=60, persist=True, enabled=True).put("k", {"v": 1})
+        await asyncio.sleep(0)
+
+        fresh = StepCache(ttl=60, persist=True, enabled=True)
+        assert await fresh.get("k") == {"v": 1}
+        assert len(fresh) == 1  # Promoted into memory